@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Стоимость сборки MachineInfo на станок в форматтерах: строгая проверка и доверенный режим.
+
+Станки и требования из CSV пакета загружаются в SQLite в памяти, затем каждый форматтер MachineInfo
+форматирует в обоих режимах станки из двух источников: ORM-объекты из сессии и строки каталога в памяти.
+Выводится медиана времени на станок, кэш представлений не используется.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_formatters --repeat 20
+"""
+import argparse
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from machine_tools.app.db.catalog import MachineCatalog
+from machine_tools.app.db.csv_sync import sync_from_csv
+from machine_tools.app.formatters import DictMachineInfoFormatter, IndexedMachineInfoFormatter, ListMachineInfoFormatter
+from machine_tools.app.models import Base, Machine
+
+FORMATTERS: Dict[str, Callable[..., Any]] = {
+    "ListMachineInfoFormatter": ListMachineInfoFormatter,
+    "DictMachineInfoFormatter": DictMachineInfoFormatter,
+    "IndexedMachineInfoFormatter": IndexedMachineInfoFormatter,
+}
+
+
+def measure(format_rows: Callable[[List[Any]], Any], rows: List[Any], repeat: int) -> List[float]:
+    """Время форматирования на станок, мкс"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        format_rows(rows)
+        timings.append((time.perf_counter() - start) / len(rows) * 1_000_000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Замер форматтеров MachineInfo: строгий и доверенный режимы")
+    parser.add_argument("--repeat", type=int, default=10, help="Количество запусков каждого сценария")
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        sync_from_csv(connection, workers=1)
+
+    with Session(engine) as session:
+        sources = {
+            "ORM": session.scalars(select(Machine).order_by(Machine.id)).all(),
+            "каталог": MachineCatalog.from_session(session).rows,
+        }
+        print(f"Станков: {len(sources['ORM'])}")
+        print(f"{'форматтер':<30}{'источник':<10}{'строгий, мкс':>14}{'доверенный, мкс':>17}{'ускорение':>12}")
+        for name, formatter_class in FORMATTERS.items():
+            for source, rows in sources.items():
+                strict = statistics.median(measure(formatter_class().format, rows, args.repeat))
+                trusted = statistics.median(measure(formatter_class(trusted=True).format, rows, args.repeat))
+                print(f"{name:<30}{source:<10}{strict:>14.2f}{trusted:>17.2f}{strict / trusted:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Замер времени импорта пакета в свежем интерпретаторе.
+
+Каждый сценарий запускается в отдельном процессе несколько раз, выводятся медиана и минимум.
+Время запуска пустого интерпретатора вычитается, чтобы остался только импорт.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_import --repeat 20
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+SCENARIOS: Dict[str, str] = {
+    "интерпретатор": "pass",
+    "import machine_tools": "import machine_tools",
+    "from machine_tools import Finder": "from machine_tools import Finder",
+    "from machine_tools import info_by_name": "from machine_tools import info_by_name",
+}
+
+# Проверка, что импорт пакета не тянет тяжелые зависимости и не создает движок БД
+CHECK = (
+    "import sys, machine_tools; "
+    "heavy = [m for m in ('sqlalchemy', 'pydantic', 'dependency_injector', 'machine_tools.app.config') "
+    "if m in sys.modules]; "
+    "print(', '.join(heavy) or 'нет')"
+)
+
+
+def measure(code: str, repeat: int) -> List[float]:
+    """Время выполнения кода в новом процессе, мс"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Замер времени импорта machine_tools")
+    parser.add_argument("--repeat", type=int, default=10, help="Количество запусков каждого сценария")
+    args = parser.parse_args()
+
+    baseline = None
+    for name, code in SCENARIOS.items():
+        timings = measure(code, args.repeat)
+        median = statistics.median(timings)
+        if baseline is None:
+            baseline = median
+            print(f"{name:<40} медиана {median:8.1f} мс")
+            continue
+        print(f"{name:<40} медиана {median - baseline:8.1f} мс, минимум {min(timings) - baseline:8.1f} мс")
+
+    heavy = subprocess.run([sys.executable, "-c", CHECK], check=True, capture_output=True, text=True).stdout.strip()
+    print(f"Тяжелые модули после import machine_tools: {heavy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,81 +1,119 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 # ---------------------------------------------------------------------------------------------------------------------
-from machine_tools.app.descriptions import ACCURACY_DESCRIPTIONS, GROUP_DESCRIPTIONS, TYPE_DESCRIPTIONS
-from machine_tools.app.enumerations import Accuracy, Automation, SoftwareControl, Specialization, WeightClass
-from machine_tools.app.fields import AccuracyField, AutomationField, SpecializationField, WeightClassField
-from machine_tools.app.finders import MachineFinder as Finder
-from machine_tools.app.formatters import (
-    DictMachineInfoFormatter,
-    DictNameFormatter,
-    IndexedMachineInfoFormatter,
-    IndexedNameFormatter,
-    ListMachineInfoFormatter,
-    ListNameFormatter,
-    MachineFormatter,
-)
-from machine_tools.app.models import Machine, TechnicalRequirement
-from machine_tools.app.schemas import Dimensions, Location, MachineInfo
-from machine_tools.app.services import FinderContainer as Container
-from machine_tools.app.services import (
-    find_names,
-    get_finder_with_dict_info,
-    get_finder_with_dict_names,
-    get_finder_with_indexed_info,
-    get_finder_with_indexed_names,
-    get_finder_with_list_info,
-    get_finder_with_list_names,
-)
-from machine_tools.app.services import get_machine_info_by_name as info_by_name
-from machine_tools.app.services import (
-    update,
-)
+# Публичные имена загружаются при первом обращении (PEP 562): `import machine_tools` не импортирует
+# SQLAlchemy, pydantic и dependency-injector, не читает настройки и не создает движок БД.
+from importlib import import_module
+
 from machine_tools.version import __version__
 
-__all__ = [
+# Без импорта typing: он заметно увеличивает время импорта пакета
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    from machine_tools.app.db import MachineCatalog, MachineInfoCache, QueryCache, machine_info_cache, query_cache
+    from machine_tools.app.descriptions import ACCURACY_DESCRIPTIONS, GROUP_DESCRIPTIONS, TYPE_DESCRIPTIONS
+    from machine_tools.app.enumerations import Accuracy, Automation, SoftwareControl, Specialization, WeightClass
+    from machine_tools.app.fields import AccuracyField, AutomationField, SpecializationField, WeightClassField
+    from machine_tools.app.finders import AsyncMachineFinder as AsyncFinder
+    from machine_tools.app.finders import MachineFinder as Finder
+    from machine_tools.app.formatters import (
+        DictMachineInfoFormatter,
+        DictNameFormatter,
+        IndexedMachineInfoFormatter,
+        IndexedNameFormatter,
+        ListMachineInfoFormatter,
+        ListNameFormatter,
+        MachineFormatter,
+    )
+    from machine_tools.app.models import Machine, TechnicalRequirement
+    from machine_tools.app.schemas import Dimensions, Location, MachineInfo
+    from machine_tools.app.services import FinderContainer as Container
+    from machine_tools.app.services import (
+        find_names,
+        get_finder_with_dict_info,
+        get_finder_with_dict_names,
+        get_finder_with_indexed_info,
+        get_finder_with_indexed_names,
+        get_finder_with_list_info,
+        get_finder_with_list_names,
+    )
+    from machine_tools.app.services import get_machine_info_by_name as info_by_name
+    from machine_tools.app.services import get_machines_info_by_names as info_by_names
+    from machine_tools.app.services import (
+        update,
+    )
+
+# Публичное имя -> (модуль, имя в модуле)
+_LAZY_EXPORTS: "dict[str, tuple[str, str]]" = {
     # описания полей
-    "ACCURACY_DESCRIPTIONS",
-    "GROUP_DESCRIPTIONS",
-    "TYPE_DESCRIPTIONS",
+    "ACCURACY_DESCRIPTIONS": ("machine_tools.app.descriptions", "ACCURACY_DESCRIPTIONS"),
+    "GROUP_DESCRIPTIONS": ("machine_tools.app.descriptions", "GROUP_DESCRIPTIONS"),
+    "TYPE_DESCRIPTIONS": ("machine_tools.app.descriptions", "TYPE_DESCRIPTIONS"),
     # перечисления
-    "Accuracy",
-    "Automation",
-    "Specialization",
-    "WeightClass",
-    "SoftwareControl",
+    "Accuracy": ("machine_tools.app.enumerations", "Accuracy"),
+    "Automation": ("machine_tools.app.enumerations", "Automation"),
+    "Specialization": ("machine_tools.app.enumerations", "Specialization"),
+    "WeightClass": ("machine_tools.app.enumerations", "WeightClass"),
+    "SoftwareControl": ("machine_tools.app.enumerations", "SoftwareControl"),
     # поля
-    "AccuracyField",
-    "AutomationField",
-    "SpecializationField",
-    "WeightClassField",
+    "AccuracyField": ("machine_tools.app.fields", "AccuracyField"),
+    "AutomationField": ("machine_tools.app.fields", "AutomationField"),
+    "SpecializationField": ("machine_tools.app.fields", "SpecializationField"),
+    "WeightClassField": ("machine_tools.app.fields", "WeightClassField"),
     # поисковики
-    "Finder",
+    "Finder": ("machine_tools.app.finders", "MachineFinder"),
+    "AsyncFinder": ("machine_tools.app.finders", "AsyncMachineFinder"),
+    "MachineCatalog": ("machine_tools.app.db", "MachineCatalog"),
+    # кэш запросов
+    "QueryCache": ("machine_tools.app.db", "QueryCache"),
+    "query_cache": ("machine_tools.app.db", "query_cache"),
+    # кэш представлений MachineInfo
+    "MachineInfoCache": ("machine_tools.app.db", "MachineInfoCache"),
+    "machine_info_cache": ("machine_tools.app.db", "machine_info_cache"),
     # форматировщики
-    "DictMachineInfoFormatter",
-    "DictNameFormatter",
-    "IndexedMachineInfoFormatter",
-    "IndexedNameFormatter",
-    "ListMachineInfoFormatter",
-    "ListNameFormatter",
-    "MachineFormatter",
+    "DictMachineInfoFormatter": ("machine_tools.app.formatters", "DictMachineInfoFormatter"),
+    "DictNameFormatter": ("machine_tools.app.formatters", "DictNameFormatter"),
+    "IndexedMachineInfoFormatter": ("machine_tools.app.formatters", "IndexedMachineInfoFormatter"),
+    "IndexedNameFormatter": ("machine_tools.app.formatters", "IndexedNameFormatter"),
+    "ListMachineInfoFormatter": ("machine_tools.app.formatters", "ListMachineInfoFormatter"),
+    "ListNameFormatter": ("machine_tools.app.formatters", "ListNameFormatter"),
+    "MachineFormatter": ("machine_tools.app.formatters", "MachineFormatter"),
     # модели
-    "Machine",
-    "TechnicalRequirement",
+    "Machine": ("machine_tools.app.models", "Machine"),
+    "TechnicalRequirement": ("machine_tools.app.models", "TechnicalRequirement"),
     # схемы
-    "Dimensions",
-    "Location",
-    "MachineInfo",
+    "Dimensions": ("machine_tools.app.schemas", "Dimensions"),
+    "Location": ("machine_tools.app.schemas", "Location"),
+    "MachineInfo": ("machine_tools.app.schemas", "MachineInfo"),
     # контейнеры
-    "Container",
+    "Container": ("machine_tools.app.services", "FinderContainer"),
     # функции
-    "find_names",
-    "get_finder_with_list_names",
-    "get_finder_with_list_info",
-    "get_finder_with_dict_names",
-    "get_finder_with_dict_info",
-    "get_finder_with_indexed_names",
-    "get_finder_with_indexed_info",
-    "update",
-    "info_by_name",
-    "__version__",
-]
+    "find_names": ("machine_tools.app.services", "find_names"),
+    "get_finder_with_list_names": ("machine_tools.app.services", "get_finder_with_list_names"),
+    "get_finder_with_list_info": ("machine_tools.app.services", "get_finder_with_list_info"),
+    "get_finder_with_dict_names": ("machine_tools.app.services", "get_finder_with_dict_names"),
+    "get_finder_with_dict_info": ("machine_tools.app.services", "get_finder_with_dict_info"),
+    "get_finder_with_indexed_names": ("machine_tools.app.services", "get_finder_with_indexed_names"),
+    "get_finder_with_indexed_info": ("machine_tools.app.services", "get_finder_with_indexed_info"),
+    "update": ("machine_tools.app.services", "update"),
+    "info_by_name": ("machine_tools.app.services", "get_machine_info_by_name"),
+    "info_by_names": ("machine_tools.app.services", "get_machines_info_by_names"),
+}
+
+__all__ = list(_LAZY_EXPORTS) + ["__version__"]
+
+
+def __getattr__(name: str) -> object:
+    """Импортирует публичное имя при первом обращении и сохраняет его в модуле"""
+    try:
+        module_name, attribute = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module_name), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> "list[str]":
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
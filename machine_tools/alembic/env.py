@@ -9,7 +9,8 @@ config = context.config
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-if config.config_file_name is not None:
+# Вызов из приложения (get_alembic_config) не перенастраивает логирование процесса
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
     fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
@@ -57,6 +58,14 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # Соединение, переданное вызывающим кодом (например, init_db при отметке схемы), используется как есть
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
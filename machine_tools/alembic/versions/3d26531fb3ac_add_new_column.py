@@ -1,7 +1,7 @@
 """add new_column
 
 Revision ID: 3d26531fb3ac
-Revises: create_all_tables
+Revises: 5b0e2d7c4a18
 Create Date: 2025-05-23 10:30:40.373177
 
 """
@@ -13,7 +13,7 @@ from alembic import op
 
 # revision identifiers, used by Alembic.
 revision: str = '3d26531fb3ac'
-down_revision: Union[str, None] = 'create_all_tables'
+down_revision: Union[str, None] = '5b0e2d7c4a18'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
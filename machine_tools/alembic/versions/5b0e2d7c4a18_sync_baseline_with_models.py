@@ -0,0 +1,59 @@
+"""sync baseline with models
+
+Revision ID: 5b0e2d7c4a18
+Revises: create_all_tables
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '5b0e2d7c4a18'
+down_revision: Union[str, None] = 'create_all_tables'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Начальная ревизия создает machine_tools_old с дробными group/type и без software_control,
+    # а следующие ревизии и модели работают с machine_tools. Каждый шаг проверяет текущую схему,
+    # поэтому ревизия безопасна и для БД, созданных через Base.metadata.create_all
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table('machine_tools'):
+        op.rename_table('machine_tools_old', 'machine_tools')
+        if bind.dialect.name == 'postgresql':
+            op.execute('ALTER SEQUENCE IF EXISTS machine_tools_old_id_seq RENAME TO machine_tools_id_seq')
+            op.execute('ALTER INDEX IF EXISTS machine_tools_old_pkey RENAME TO machine_tools_pkey')
+
+    inspector = sa.inspect(bind)
+    columns = {column['name']: column['type'] for column in inspector.get_columns('machine_tools')}
+    indexes = {index['name'] for index in inspector.get_indexes('machine_tools')}
+    with op.batch_alter_table('machine_tools') as batch_op:
+        if 'software_control' not in columns:
+            batch_op.add_column(sa.Column('software_control', sa.String(), nullable=True))
+        for name in ('group', 'type'):
+            if not isinstance(columns[name], sa.Integer):
+                batch_op.alter_column(
+                    name, type_=sa.Integer(), existing_nullable=True, postgresql_using=f'"{name}"::integer'
+                )
+        if 'ix_machine_tools_id' not in indexes:
+            batch_op.create_index('ix_machine_tools_id', ['id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    with op.batch_alter_table('machine_tools') as batch_op:
+        batch_op.drop_index('ix_machine_tools_id')
+        for name in ('group', 'type'):
+            batch_op.alter_column(name, type_=sa.Float(), existing_nullable=True)
+        batch_op.drop_column('software_control')
+    op.rename_table('machine_tools', 'machine_tools_old')
+    if bind.dialect.name == 'postgresql':
+        op.execute('ALTER SEQUENCE IF EXISTS machine_tools_id_seq RENAME TO machine_tools_old_id_seq')
+        op.execute('ALTER INDEX IF EXISTS machine_tools_pkey RENAME TO machine_tools_old_pkey')
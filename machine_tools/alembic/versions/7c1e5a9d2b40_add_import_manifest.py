@@ -0,0 +1,39 @@
+"""add import_manifest
+
+Revision ID: 7c1e5a9d2b40
+Revises: 3d26531fb3ac
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e5a9d2b40'
+down_revision: Union[str, None] = '3d26531fb3ac'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Манифест инкрементального импорта CSV: хеш и состояние каждого загруженного файла
+    op.create_table(
+        'import_manifest',
+        sa.Column('filename', sa.String(), nullable=False),
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('mtime_ns', sa.BigInteger(), nullable=False),
+        sa.Column('machine_name', sa.String(), nullable=True),
+        sa.Column('rows', sa.Integer(), nullable=False),
+        sa.Column('imported_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('filename'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('import_manifest')
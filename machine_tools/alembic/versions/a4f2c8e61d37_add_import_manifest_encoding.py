@@ -0,0 +1,29 @@
+"""add import_manifest.encoding
+
+Revision ID: a4f2c8e61d37
+Revises: 7c1e5a9d2b40
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4f2c8e61d37'
+down_revision: Union[str, None] = '7c1e5a9d2b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Кодировка файла, определенная при импорте: подсказка для повторного разбора без chardet
+    op.add_column('import_manifest', sa.Column('encoding', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('import_manifest', 'encoding')
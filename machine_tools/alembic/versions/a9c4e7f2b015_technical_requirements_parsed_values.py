@@ -0,0 +1,122 @@
+"""technical_requirements: parsed value columns
+
+Revision ID: a9c4e7f2b015
+Revises: f3b9d1c6e2a7
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import pandas as pd
+import sqlalchemy as sa
+from alembic import op
+
+from machine_tools.app.parsers import PARSED_COLUMNS, parse_requirements
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c4e7f2b015'
+down_revision: Union[str, None] = 'f3b9d1c6e2a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = 'ix_technical_requirements_requirement_min_max'
+VIEW = 'technical_requirements_compat'
+CREATE_VIEW = (
+    f'CREATE VIEW {VIEW} AS '
+    'SELECT t.id, t.machine_id, m.name AS machine_name, t.requirement, t.value '
+    'FROM technical_requirements AS t JOIN machine_tools AS m ON m.id = t.machine_id'
+)
+
+# Количество требований, разбираемых и записываемых одной транзакцией
+BATCH_SIZE = 5000
+
+COLUMNS = (
+    sa.Column('unit', sa.String(), nullable=True),
+    sa.Column('value_number', sa.Float(), nullable=True),
+    sa.Column('value_min', sa.Float(), nullable=True),
+    sa.Column('value_max', sa.Float(), nullable=True),
+    sa.Column('value_list', sa.String(), nullable=True),
+    sa.Column('parse_status', sa.String(), nullable=True),
+)
+
+# Таблица в том виде, в котором ее видит эта ревизия, независимо от текущих моделей
+requirements = sa.table(
+    'technical_requirements',
+    sa.column('id', sa.Integer()),
+    sa.column('requirement', sa.String()),
+    sa.column('value', sa.String()),
+    *(sa.column(column.name, column.type) for column in COLUMNS),
+)
+
+UPDATE = (
+    sa.update(requirements)
+    .where(requirements.c.id == sa.bindparam('row_id'))
+    .values({column: sa.bindparam(column) for column in PARSED_COLUMNS})
+)
+
+
+def backfill(bind: sa.engine.Connection) -> None:
+    """Разбирает значения строк без результата разбора порциями по возрастанию id"""
+    last_id = -1
+    while True:
+        rows = bind.execute(
+            sa.select(requirements.c.id, requirements.c.requirement, requirements.c.value)
+            .where(requirements.c.parse_status.is_(None), requirements.c.id > last_id)
+            .order_by(requirements.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        frame = pd.DataFrame(rows, columns=['id', 'requirement', 'value'])
+        parsed = parse_requirements(frame['requirement'], frame['value']).astype(object)
+        parsed = parsed.where(parsed.notna(), None)
+        bind.execute(
+            UPDATE,
+            [dict(row_id=row_id, **values) for row_id, values in zip(frame['id'], parsed.to_dict('records'))],
+        )
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    existing = {column['name'] for column in sa.inspect(bind).get_columns('technical_requirements')}
+    # Колонки без значения по умолчанию добавляются без перезаписи таблицы
+    for column in COLUMNS:
+        if column.name not in existing:
+            op.add_column('technical_requirements', column.copy())
+
+    if bind.dialect.name != 'postgresql':
+        backfill(bind)
+        op.create_index(INDEX, 'technical_requirements', ['requirement', 'value_min', 'value_max'], if_not_exists=True)
+        return
+
+    with op.get_context().autocommit_block():
+        # Порции фиксируются по отдельности: блокировки строк держатся недолго, прерванный разбор продолжается
+        backfill(bind)
+
+        # Прерванный CREATE INDEX CONCURRENTLY оставляет невалидный индекс, который IF NOT EXISTS пропустил бы
+        invalid = bind.execute(
+            sa.text('SELECT 1 FROM pg_index WHERE indexrelid = to_regclass(:name) AND NOT indisvalid'), {'name': INDEX}
+        ).scalar()
+        if invalid:
+            op.drop_index(INDEX, table_name='technical_requirements', postgresql_concurrently=True)
+        op.create_index(
+            INDEX,
+            'technical_requirements',
+            ['requirement', 'value_min', 'value_max'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(INDEX, table_name='technical_requirements')
+    # SQLite пересоздает таблицу при удалении колонок и не допускает этого, пока от нее зависит представление
+    op.execute(f'DROP VIEW IF EXISTS {VIEW}')
+    with op.batch_alter_table('technical_requirements') as batch_op:
+        for column in reversed(COLUMNS):
+            batch_op.drop_column(column.name)
+    op.execute(CREATE_VIEW)
@@ -0,0 +1,59 @@
+"""machine_tools.info stored MachineInfo payload
+
+Revision ID: b4e9a2d71c58
+Revises: d8f4a1c37b59
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e9a2d71c58'
+down_revision: Union[str, None] = 'd8f4a1c37b59'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VIEW = 'technical_requirements_compat'
+CREATE_VIEW = (
+    f'CREATE VIEW {VIEW} AS '
+    'SELECT t.id, t.machine_id, m.name AS machine_name, t.requirement, t.value '
+    'FROM technical_requirements AS t JOIN machine_tools AS m ON m.id = t.machine_id'
+)
+
+# Сколько ревизия ждет блокировку таблицы, прежде чем отказаться, а не копить очередь запросов за собой
+LOCK_TIMEOUT = '5s'
+
+COLUMNS = {'info': sa.Text, 'info_updated_at': sa.DateTime}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Колонки сохраненного представления MachineInfo. Заполнение не требуется: пустое представление собирается
+    # форматтером, а сохраняет его команда refresh-infos. Шаги идемпотентны
+    bind = op.get_bind()
+    columns = [column['name'] for column in sa.inspect(bind).get_columns('machine_tools')]
+    missing = [name for name in COLUMNS if name not in columns]
+    if missing and bind.dialect.name == 'postgresql':
+        # Колонки без значения по умолчанию добавляются без перезаписи таблицы, но под кратковременной блокировкой
+        op.execute(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'")
+    for name in missing:
+        op.add_column('machine_tools', sa.Column(name, COLUMNS[name](), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        for name in COLUMNS:
+            op.drop_column('machine_tools', name)
+        return
+
+    # SQLite пересоздает таблицу при удалении колонки и не допускает этого, пока от нее зависит представление
+    op.execute(f'DROP VIEW IF EXISTS {VIEW}')
+    with op.batch_alter_table('machine_tools') as batch_op:
+        for name in COLUMNS:
+            batch_op.drop_column(name)
+    op.execute(CREATE_VIEW)
@@ -0,0 +1,69 @@
+"""add finder indexes
+
+Revision ID: b81d3f5a9c62
+Revises: a4f2c8e61d37
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81d3f5a9c62'
+down_revision: Union[str, None] = 'a4f2c8e61d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# B-tree индексы колонок, по которым фильтрует QueryBuilder: (имя, таблица, колонки)
+INDEXES = [
+    ('ix_machine_tools_group_type', 'machine_tools', ['group', 'type']),
+    ('ix_machine_tools_type', 'machine_tools', ['type']),
+    ('ix_machine_tools_power', 'machine_tools', ['power']),
+    ('ix_machine_tools_efficiency', 'machine_tools', ['efficiency']),
+    ('ix_machine_tools_accuracy', 'machine_tools', ['accuracy']),
+    ('ix_machine_tools_automation', 'machine_tools', ['automation']),
+    ('ix_machine_tools_specialization', 'machine_tools', ['specialization']),
+    ('ix_machine_tools_software_control', 'machine_tools', ['software_control']),
+    ('ix_technical_requirements_machine_name', 'technical_requirements', ['machine_name']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns)
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # CONCURRENTLY не блокирует запись в таблицы, но не работает внутри транзакции
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+        # Триграммный индекс для поиска по части имени (ILIKE '%...%')
+        op.create_index(
+            'ix_machine_tools_name_trgm',
+            'machine_tools',
+            ['name'],
+            postgresql_using='gin',
+            postgresql_ops={'name': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table)
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_machine_tools_name_trgm', table_name='machine_tools', postgresql_concurrently=True, if_exists=True
+        )
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
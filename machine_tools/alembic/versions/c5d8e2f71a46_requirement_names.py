@@ -0,0 +1,173 @@
+"""requirement_names dictionary and technical_requirements.requirement_id
+
+Revision ID: c5d8e2f71a46
+Revises: a9c4e7f2b015
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from machine_tools.app.parsers import requirement_key
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d8e2f71a46'
+down_revision: Union[str, None] = 'a9c4e7f2b015'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FOREIGN_KEY = 'fk_technical_requirements_requirement_id'
+CHECK = 'ck_technical_requirements_requirement_id_not_null'
+INDEX = 'ix_technical_requirements_requirement_id_min_max'
+OLD_INDEX = 'ix_technical_requirements_requirement_min_max'
+VIEW = 'technical_requirements_compat'
+CREATE_VIEW = (
+    f'CREATE VIEW {VIEW} AS '
+    'SELECT t.id, t.machine_id, m.name AS machine_name, t.requirement, t.value '
+    'FROM technical_requirements AS t JOIN machine_tools AS m ON m.id = t.machine_id'
+)
+
+# Сколько ревизия ждет блокировку таблицы, прежде чем отказаться, а не копить очередь запросов за собой
+LOCK_TIMEOUT = '5s'
+
+# В SQLite только INTEGER PRIMARY KEY получает значения автоматически
+ID_TYPE = sa.SmallInteger().with_variant(sa.Integer(), 'sqlite')
+
+# Таблицы в том виде, в котором их видит эта ревизия, независимо от текущих моделей
+names = sa.table(
+    'requirement_names', sa.column('id', ID_TYPE), sa.column('key', sa.String()), sa.column('name', sa.String())
+)
+requirements = sa.table(
+    'technical_requirements',
+    sa.column('id', sa.Integer()),
+    sa.column('requirement', sa.String()),
+    sa.column('requirement_id', sa.SmallInteger()),
+)
+
+UPDATE = (
+    sa.update(requirements)
+    .where(requirements.c.requirement == sa.bindparam('name'), requirements.c.requirement_id.is_(None))
+    .values(requirement_id=sa.bindparam('new_id'))
+)
+
+
+def backfill(bind: sa.engine.Connection) -> None:
+    """Сводит наименования строк без requirement_id в словарь и заполняет requirement_id"""
+    # Основным написанием ключа становится наименование, раньше других попавшее в таблицу
+    rows = bind.execute(
+        sa.select(requirements.c.requirement)
+        .where(requirements.c.requirement_id.is_(None))
+        .group_by(requirements.c.requirement)
+        .order_by(sa.func.min(requirements.c.id))
+    ).scalars()
+    keys = {name: requirement_key(name) for name in rows}
+    if not keys:
+        return
+
+    ids = dict(bind.execute(sa.select(names.c.key, names.c.id)).all())
+    missing = {}
+    for name, key in keys.items():
+        if key not in ids:
+            missing.setdefault(key, name)
+    if missing:
+        bind.execute(sa.insert(names), [{'key': key, 'name': name} for key, name in missing.items()])
+        ids = dict(bind.execute(sa.select(names.c.key, names.c.id)).all())
+    # Строки каждого наименования находятся по индексу OLD_INDEX, который начинается с requirement
+    bind.execute(UPDATE, [{'name': name, 'new_id': ids[key]} for name, key in keys.items()])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Словарь наименований параметров и целочисленная ссылка на него. Все шаги идемпотентны
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if 'requirement_names' not in inspector.get_table_names():
+        op.create_table(
+            'requirement_names',
+            sa.Column('id', ID_TYPE, primary_key=True),
+            sa.Column('key', sa.String(), nullable=False),
+            sa.Column('name', sa.String(), nullable=False),
+            sa.UniqueConstraint('key'),
+        )
+    columns = {column['name']: column for column in inspector.get_columns('technical_requirements')}
+    if 'requirement_id' not in columns:
+        # Колонка без значения по умолчанию добавляется без перезаписи таблицы
+        op.add_column('technical_requirements', sa.Column('requirement_id', sa.SmallInteger(), nullable=True))
+
+    if bind.dialect.name != 'postgresql':
+        backfill(bind)
+        # SQLite пересоздает таблицу при изменении колонок и не допускает этого, пока от нее зависит представление
+        op.execute(f'DROP VIEW IF EXISTS {VIEW}')
+        with op.batch_alter_table('technical_requirements') as batch_op:
+            batch_op.alter_column('requirement_id', existing_type=sa.SmallInteger(), nullable=False)
+            batch_op.create_foreign_key(FOREIGN_KEY, 'requirement_names', ['requirement_id'], ['id'])
+            batch_op.drop_index(OLD_INDEX)
+            batch_op.create_index(INDEX, ['requirement_id', 'value_min', 'value_max'])
+        op.execute(CREATE_VIEW)
+        return
+
+    nullable = 'requirement_id' not in columns or columns['requirement_id']['nullable']
+    with op.get_context().autocommit_block():
+        # Ограничения NOT VALID добавляются до заполнения: строки, которые прежняя версия пакета вставит
+        # во время заполнения, будут отклонены, а не оставят VALIDATE непроверяемые NULL
+        constraints = dict(
+            bind.execute(
+                sa.text('SELECT conname, convalidated FROM pg_constraint WHERE conname IN (:foreign_key, :check)'),
+                {'foreign_key': FOREIGN_KEY, 'check': CHECK},
+            ).all()
+        )
+        if FOREIGN_KEY not in constraints:
+            op.execute(
+                f'ALTER TABLE technical_requirements ADD CONSTRAINT {FOREIGN_KEY} '
+                'FOREIGN KEY (requirement_id) REFERENCES requirement_names (id) NOT VALID'
+            )
+        if nullable and CHECK not in constraints:
+            op.execute(
+                f'ALTER TABLE technical_requirements ADD CONSTRAINT {CHECK} '
+                'CHECK (requirement_id IS NOT NULL) NOT VALID'
+            )
+
+        # Вне транзакции ревизии UPDATE каждого наименования фиксируется отдельно: блокировки строк держатся недолго
+        backfill(bind)
+
+        # VALIDATE проверяет строки под SHARE UPDATE EXCLUSIVE, не мешая чтению и записи
+        if not constraints.get(FOREIGN_KEY):
+            op.execute(f'ALTER TABLE technical_requirements VALIDATE CONSTRAINT {FOREIGN_KEY}')
+        if nullable and not constraints.get(CHECK):
+            op.execute(f'ALTER TABLE technical_requirements VALIDATE CONSTRAINT {CHECK}')
+
+        # Прерванный CREATE INDEX CONCURRENTLY оставляет невалидный индекс, который IF NOT EXISTS пропустил бы
+        invalid = bind.execute(
+            sa.text('SELECT 1 FROM pg_index WHERE indexrelid = to_regclass(:name) AND NOT indisvalid'), {'name': INDEX}
+        ).scalar()
+        if invalid:
+            op.drop_index(INDEX, table_name='technical_requirements', postgresql_concurrently=True)
+        op.create_index(
+            INDEX,
+            'technical_requirements',
+            ['requirement_id', 'value_min', 'value_max'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(OLD_INDEX, table_name='technical_requirements', postgresql_concurrently=True, if_exists=True)
+
+    # SET NOT NULL пропускает проверку строк благодаря проверенному ограничению CHECK
+    op.execute(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'")
+    if nullable:
+        op.execute('ALTER TABLE technical_requirements ALTER COLUMN requirement_id SET NOT NULL')
+    op.execute(f'ALTER TABLE technical_requirements DROP CONSTRAINT IF EXISTS {CHECK}')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(f'DROP VIEW IF EXISTS {VIEW}')
+    with op.batch_alter_table('technical_requirements') as batch_op:
+        batch_op.drop_index(INDEX)
+        batch_op.drop_constraint(FOREIGN_KEY, type_='foreignkey')
+        batch_op.drop_column('requirement_id')
+        batch_op.create_index(OLD_INDEX, ['requirement', 'value_min', 'value_max'])
+    op.execute(CREATE_VIEW)
+    op.drop_table('requirement_names')
@@ -0,0 +1,47 @@
+"""machine_tools: smallint group/type, drop new_column
+
+Revision ID: d2a7e4b9c813
+Revises: b81d3f5a9c62
+Create Date: 2026-10-18 12:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a7e4b9c813'
+down_revision: Union[str, None] = 'b81d3f5a9c62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Сколько ревизия ждет блокировку таблицы, прежде чем отказаться, а не копить очередь запросов за собой
+LOCK_TIMEOUT = '5s'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    columns = {column['name']: column['type'] for column in sa.inspect(bind).get_columns('machine_tools')}
+    if bind.dialect.name == 'postgresql':
+        # Смена типа переписывает таблицу под ACCESS EXCLUSIVE. Таблица станков мала, и перезапись занимает
+        # миллисекунды, но ожидание блокировки за долгой транзакцией остановило бы все чтения
+        op.execute(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'")
+
+    with op.batch_alter_table('machine_tools') as batch_op:
+        # Колонка не используется ни моделями, ни кодом
+        if 'new_column' in columns:
+            batch_op.drop_column('new_column')
+        for name in ('group', 'type'):
+            if not isinstance(columns[name], sa.SmallInteger):
+                batch_op.alter_column(name, type_=sa.SmallInteger(), existing_type=sa.Integer(), existing_nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('machine_tools') as batch_op:
+        for name in ('group', 'type'):
+            batch_op.alter_column(name, type_=sa.Integer(), existing_type=sa.SmallInteger(), existing_nullable=True)
+        batch_op.add_column(sa.Column('new_column', sa.String(), nullable=True))
@@ -0,0 +1,130 @@
+"""machine_tools.spec JSONB document with GIN index
+
+Revision ID: d8f4a1c37b59
+Revises: c5d8e2f71a46
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8f4a1c37b59'
+down_revision: Union[str, None] = 'c5d8e2f71a46'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = 'ix_machine_tools_spec'
+VIEW = 'technical_requirements_compat'
+CREATE_VIEW = (
+    f'CREATE VIEW {VIEW} AS '
+    'SELECT t.id, t.machine_id, m.name AS machine_name, t.requirement, t.value '
+    'FROM technical_requirements AS t JOIN machine_tools AS m ON m.id = t.machine_id'
+)
+
+# Сколько ревизия ждет блокировку таблицы, прежде чем отказаться, а не копить очередь запросов за собой
+LOCK_TIMEOUT = '5s'
+
+# Количество станков, спецификации которых заполняются за один запрос
+BATCH_SIZE = 1000
+
+SPEC_TYPE = sa.JSON(none_as_null=True).with_variant(postgresql.JSONB(none_as_null=True), 'postgresql')
+
+# Таблицы в том виде, в котором их видит эта ревизия, независимо от текущих моделей. Без onupdate модели
+# заполнение не меняет updated_at: данные станков остаются прежними
+machines = sa.table('machine_tools', sa.column('id', sa.Integer()), sa.column('spec', SPEC_TYPE))
+requirements = sa.table(
+    'technical_requirements',
+    sa.column('id', sa.Integer()),
+    sa.column('machine_id', sa.Integer()),
+    sa.column('requirement', sa.String()),
+    sa.column('value', sa.String()),
+)
+
+UPDATE = sa.update(machines).where(machines.c.id == sa.bindparam('machine_id')).values(spec=sa.bindparam('new_spec'))
+
+
+def backfill(bind: sa.engine.Connection) -> None:
+    """Заполняет spec станков, у которых она пуста, по строкам требований в порядке id"""
+    last_id = 0
+    while True:
+        ids = (
+            bind.execute(
+                sa.select(machines.c.id)
+                .where(machines.c.id > last_id, machines.c.spec.is_(None))
+                .order_by(machines.c.id)
+                .limit(BATCH_SIZE)
+            )
+            .scalars()
+            .all()
+        )
+        if not ids:
+            return
+        last_id = ids[-1]
+        specs = {}
+        rows = bind.execute(
+            sa.select(requirements.c.machine_id, requirements.c.requirement, requirements.c.value)
+            .where(requirements.c.machine_id.in_(ids))
+            .order_by(requirements.c.id)
+        )
+        for machine_id, requirement, value in rows:
+            specs.setdefault(machine_id, {})[requirement] = value
+        if specs:
+            bind.execute(UPDATE, [{'machine_id': machine_id, 'new_spec': spec} for machine_id, spec in specs.items()])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Колонка со словарем требований станка и GIN-индекс для оператора @>. Все шаги идемпотентны
+    bind = op.get_bind()
+    columns = [column['name'] for column in sa.inspect(bind).get_columns('machine_tools')]
+    if bind.dialect.name != 'postgresql':
+        if 'spec' not in columns:
+            op.add_column('machine_tools', sa.Column('spec', SPEC_TYPE, nullable=True))
+        backfill(bind)
+        return
+
+    if 'spec' not in columns:
+        # Колонка без значения по умолчанию добавляется без перезаписи таблицы, но под кратковременной блокировкой
+        op.execute(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'")
+        op.add_column('machine_tools', sa.Column('spec', SPEC_TYPE, nullable=True))
+
+    with op.get_context().autocommit_block():
+        # Вне транзакции ревизии каждая порция фиксируется отдельно: блокировки строк держатся недолго
+        backfill(bind)
+
+        # Прерванный CREATE INDEX CONCURRENTLY оставляет невалидный индекс, который IF NOT EXISTS пропустил бы
+        invalid = bind.execute(
+            sa.text('SELECT 1 FROM pg_index WHERE indexrelid = to_regclass(:name) AND NOT indisvalid'), {'name': INDEX}
+        ).scalar()
+        if invalid:
+            op.drop_index(INDEX, table_name='machine_tools', postgresql_concurrently=True)
+        # jsonb_path_ops обслуживает только @>, зато индекс меньше и быстрее jsonb_ops
+        op.create_index(
+            INDEX,
+            'machine_tools',
+            ['spec'],
+            postgresql_using='gin',
+            postgresql_ops={'spec': 'jsonb_path_ops'},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index(INDEX, table_name='machine_tools', postgresql_concurrently=True, if_exists=True)
+        op.drop_column('machine_tools', 'spec')
+        return
+
+    # SQLite пересоздает таблицу при удалении колонки и не допускает этого, пока от нее зависит представление
+    op.execute(f'DROP VIEW IF EXISTS {VIEW}')
+    with op.batch_alter_table('machine_tools') as batch_op:
+        batch_op.drop_column('spec')
+    op.execute(CREATE_VIEW)
@@ -0,0 +1,89 @@
+"""technical_requirements.machine_id
+
+Revision ID: e6f1c3a8d925
+Revises: d2a7e4b9c813
+Create Date: 2026-10-18 12:20:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6f1c3a8d925'
+down_revision: Union[str, None] = 'd2a7e4b9c813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FOREIGN_KEY = 'fk_technical_requirements_machine_id'
+INDEX = 'ix_technical_requirements_machine_id'
+
+# Количество id требований, заполняемых одной транзакцией
+BATCH_SIZE = 5000
+
+BACKFILL = sa.text(
+    'UPDATE technical_requirements AS t SET machine_id = m.id FROM machine_tools AS m '
+    'WHERE m.name = t.machine_name AND t.machine_id IS NULL AND t.id >= :start AND t.id < :stop'
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Целочисленный ключ станка вместо соединения по строке machine_name. Все шаги идемпотентны:
+    # прерванную ревизию можно запустить повторно
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    columns = {column['name'] for column in inspector.get_columns('technical_requirements')}
+    if 'machine_id' not in columns:
+        # Колонка без значения по умолчанию добавляется без перезаписи таблицы
+        op.add_column('technical_requirements', sa.Column('machine_id', sa.Integer(), nullable=True))
+
+    if bind.dialect.name != 'postgresql':
+        op.execute(
+            'UPDATE technical_requirements SET machine_id = '
+            '(SELECT id FROM machine_tools WHERE machine_tools.name = technical_requirements.machine_name) '
+            'WHERE machine_id IS NULL'
+        )
+        with op.batch_alter_table('technical_requirements') as batch_op:
+            batch_op.create_foreign_key(FOREIGN_KEY, 'machine_tools', ['machine_id'], ['id'])
+            batch_op.create_index(INDEX, ['machine_id'])
+        return
+
+    with op.get_context().autocommit_block():
+        # Заполнение диапазонами id, каждый в своей транзакции: блокировки строк держатся недолго
+        start, stop = bind.execute(sa.text('SELECT MIN(id), MAX(id) + 1 FROM technical_requirements')).one()
+        for batch_start in range(start or 0, stop or 0, BATCH_SIZE):
+            bind.execute(BACKFILL, {'start': batch_start, 'stop': batch_start + BATCH_SIZE})
+
+        # NOT VALID не проверяет существующие строки под блокировкой записи, VALIDATE проверяет их
+        # под SHARE UPDATE EXCLUSIVE, не мешая чтению и записи
+        validated = bind.execute(
+            sa.text('SELECT convalidated FROM pg_constraint WHERE conname = :name'), {'name': FOREIGN_KEY}
+        ).scalar()
+        if validated is None:
+            op.execute(
+                f'ALTER TABLE technical_requirements ADD CONSTRAINT {FOREIGN_KEY} '
+                'FOREIGN KEY (machine_id) REFERENCES machine_tools (id) NOT VALID'
+            )
+        if not validated:
+            op.execute(f'ALTER TABLE technical_requirements VALIDATE CONSTRAINT {FOREIGN_KEY}')
+
+        # Прерванный CREATE INDEX CONCURRENTLY оставляет невалидный индекс, который IF NOT EXISTS пропустил бы
+        invalid = bind.execute(
+            sa.text('SELECT 1 FROM pg_index WHERE indexrelid = to_regclass(:name) AND NOT indisvalid'), {'name': INDEX}
+        ).scalar()
+        if invalid:
+            op.drop_index(INDEX, table_name='technical_requirements', postgresql_concurrently=True)
+        op.create_index(
+            INDEX, 'technical_requirements', ['machine_id'], postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('technical_requirements') as batch_op:
+        batch_op.drop_index(INDEX)
+        batch_op.drop_constraint(FOREIGN_KEY, type_='foreignkey')
+        batch_op.drop_column('machine_id')
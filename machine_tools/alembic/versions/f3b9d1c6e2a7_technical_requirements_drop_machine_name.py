@@ -0,0 +1,102 @@
+"""technical_requirements: machine_id NOT NULL, machine_name in compat view
+
+Revision ID: f3b9d1c6e2a7
+Revises: e6f1c3a8d925
+Create Date: 2026-10-18 13:05:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b9d1c6e2a7'
+down_revision: Union[str, None] = 'e6f1c3a8d925'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VIEW = 'technical_requirements_compat'
+CHECK = 'ck_technical_requirements_machine_id_not_null'
+NAME_INDEX = 'ix_technical_requirements_machine_name'
+
+# Сколько ревизия ждет блокировку таблицы, прежде чем отказаться, а не копить очередь запросов за собой
+LOCK_TIMEOUT = '5s'
+
+CREATE_VIEW = (
+    f'CREATE VIEW {VIEW} AS '
+    'SELECT t.id, t.machine_id, m.name AS machine_name, t.requirement, t.value '
+    'FROM technical_requirements AS t JOIN machine_tools AS m ON m.id = t.machine_id'
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Завершение перехода на machine_id: колонка обязательна, строковый ключ удаляется, имя станка
+    # остается доступным через представление. Все шаги идемпотентны
+    bind = op.get_bind()
+    columns = {column['name'] for column in sa.inspect(bind).get_columns('technical_requirements')}
+    if 'machine_name' in columns:
+        # Строки, записанные прежней версией пакета после ревизии e6f1c3a8d925
+        op.execute(
+            'UPDATE technical_requirements SET machine_id = '
+            '(SELECT id FROM machine_tools WHERE machine_tools.name = technical_requirements.machine_name) '
+            'WHERE machine_id IS NULL'
+        )
+    op.execute(f'DROP VIEW IF EXISTS {VIEW}')
+
+    if bind.dialect.name != 'postgresql':
+        with op.batch_alter_table('technical_requirements') as batch_op:
+            batch_op.alter_column('machine_id', existing_type=sa.Integer(), nullable=False)
+            if 'machine_name' in columns:
+                batch_op.drop_index(NAME_INDEX)
+                batch_op.drop_column('machine_name')
+        op.execute(CREATE_VIEW)
+        return
+
+    # SET NOT NULL проверяет все строки под ACCESS EXCLUSIVE. Проверенное ограничение CHECK позволяет
+    # PostgreSQL пропустить эту проверку, а само оно проверяется VALIDATE без блокировки записи
+    validated = bind.execute(
+        sa.text('SELECT convalidated FROM pg_constraint WHERE conname = :name'), {'name': CHECK}
+    ).scalar()
+    nullable = bind.execute(
+        sa.text(
+            "SELECT is_nullable = 'YES' FROM information_schema.columns "
+            "WHERE table_name = 'technical_requirements' AND column_name = 'machine_id'"
+        )
+    ).scalar()
+    if nullable:
+        with op.get_context().autocommit_block():
+            if validated is None:
+                op.execute(
+                    f'ALTER TABLE technical_requirements ADD CONSTRAINT {CHECK} '
+                    'CHECK (machine_id IS NOT NULL) NOT VALID'
+                )
+            if not validated:
+                op.execute(f'ALTER TABLE technical_requirements VALIDATE CONSTRAINT {CHECK}')
+
+    op.execute(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'")
+    if nullable:
+        op.execute('ALTER TABLE technical_requirements ALTER COLUMN machine_id SET NOT NULL')
+    op.execute(f'ALTER TABLE technical_requirements DROP CONSTRAINT IF EXISTS {CHECK}')
+    # Удаление колонки меняет только каталог: внешний ключ и индекс по имени удаляются вместе с ней
+    op.execute('ALTER TABLE technical_requirements DROP COLUMN IF EXISTS machine_name')
+    op.execute(CREATE_VIEW)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(f'DROP VIEW IF EXISTS {VIEW}')
+    op.add_column('technical_requirements', sa.Column('machine_name', sa.String(), nullable=True))
+    op.execute(
+        'UPDATE technical_requirements SET machine_name = '
+        '(SELECT name FROM machine_tools WHERE machine_tools.id = technical_requirements.machine_id)'
+    )
+    with op.batch_alter_table('technical_requirements') as batch_op:
+        batch_op.alter_column('machine_name', existing_type=sa.String(), nullable=False)
+        batch_op.alter_column('machine_id', existing_type=sa.Integer(), nullable=True)
+        batch_op.create_foreign_key(
+            'technical_requirements_machine_name_fkey', 'machine_tools', ['machine_name'], ['name']
+        )
+        batch_op.create_index(NAME_INDEX, ['machine_name'])
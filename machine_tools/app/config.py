@@ -22,43 +22,68 @@ def get_project_root():
     return Path(__file__).parent.parent.parent
 
 
-# Определяем пути к конфигурационным файлам
-PROJECT_ROOT = get_project_root()
-CONFIG_DIR = PROJECT_ROOT / "settings"
-ENV_FILE = CONFIG_DIR / "machine_tools.env"
-
-# Создаем директорию config, если её нет
-CONFIG_DIR.mkdir(exist_ok=True)
-
-
-def create_env_file() -> None:
+def create_env_file(env_file: Path) -> None:
     """Создать файл machine_tools.env с шаблоном настроек"""
-    if not ENV_FILE.exists():
+    if not env_file.exists():
         template = """# Настройки базы данных
 POSTGRES_USER=postgres
 POSTGRES_PASSWORD=postgres
 POSTGRES_HOST=localhost
 POSTGRES_PORT=5432
 POSTGRES_DB=machine_tools
+# Область видимости сессии по умолчанию: global, thread (для пулов потоков) или task (для asyncio)
+DB_SESSION_SCOPE=global
+# Пул соединений: размер, переполнение, ожидание (с), пересоздание соединений (с, -1 - никогда), проверка перед выдачей
+DB_POOL_SIZE=5
+DB_MAX_OVERFLOW=10
+DB_POOL_TIMEOUT=30
+DB_POOL_RECYCLE=1800
+DB_POOL_PRE_PING=true
+# Ограничение времени выполнения запроса на сервере (мс, 0 - без ограничения)
+DB_STATEMENT_TIMEOUT=0
+# Количество соединений, открываемых заранее при старте (0 - не прогревать)
+DB_POOL_WARMUP=0
 
 # Настройки приложения
 APP_NAME=Machine Tools
 DEBUG=True
 API_V1_STR=/api/v1
 """
-        ENV_FILE.write_text(template, encoding='utf-8')
+        env_file.write_text(template, encoding='utf-8')
 
 
-# Загружаем переменные окружения
-if not ENV_FILE.exists():
-    create_env_file()
-
-# Проверяем наличие тестовых настроек
-TEST_ENV = os.environ.get("MACHINE_TOOLS_ENV")
-if TEST_ENV and Path(TEST_ENV).exists():
-    load_dotenv(TEST_ENV, override=True)
-else:
-    load_dotenv(ENV_FILE)
+@lru_cache()
+def get_env_file() -> Path:
+    """
+    Путь к файлу настроек settings/machine_tools.env.
+
+    Поиск корня проекта, создание директории settings и файла с шаблоном выполняются
+    при первом обращении, а не при импорте пакета.
+    """
+    config_dir = get_project_root() / "settings"
+    # Создаем директорию config, если её нет
+    config_dir.mkdir(exist_ok=True)
+    env_file = config_dir / "machine_tools.env"
+    if not env_file.exists():
+        create_env_file(env_file)
+    return env_file
+
+
+def load_environment() -> Path:
+    """
+    Загружает переменные окружения из файла настроек.
+
+    Returns:
+        Path: Загруженный файл: тестовые настройки из MACHINE_TOOLS_ENV, если файл существует, иначе machine_tools.env
+    """
+    # Проверяем наличие тестовых настроек
+    test_env = os.environ.get("MACHINE_TOOLS_ENV")
+    if test_env and Path(test_env).exists():
+        load_dotenv(test_env, override=True)
+        return Path(test_env)
+    env_file = get_env_file()
+    load_dotenv(env_file)
+    return env_file
 
 
 class Settings(BaseSettings):
@@ -70,6 +95,18 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str
     POSTGRES_PORT: int
     POSTGRES_DB: str
+    # Область видимости сессии по умолчанию: global, thread или task
+    DB_SESSION_SCOPE: str = "global"
+    # Настройки пула соединений
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Ограничение времени выполнения запроса в миллисекундах, 0 - без ограничения
+    DB_STATEMENT_TIMEOUT: int = 0
+    # Количество соединений, открываемых при старте, 0 - без прогрева
+    DB_POOL_WARMUP: int = 0
 
     # Настройки приложения
     APP_NAME: str
@@ -77,7 +114,6 @@ class Settings(BaseSettings):
     API_V1_STR: str
 
     class Config:
-        env_file = str(TEST_ENV if TEST_ENV and Path(TEST_ENV).exists() else ENV_FILE)
         case_sensitive = True
 
     @property
@@ -87,11 +123,29 @@ class Settings(BaseSettings):
             f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return (
+            f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+            f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+        )
+
 
 @lru_cache()
 def get_settings() -> Settings:
-    """Получить настройки приложения"""
-    return Settings()
+    """Получить настройки приложения. Файл настроек читается при первом вызове"""
+    return Settings(_env_file=str(load_environment()))
+
+
+def __getattr__(name: str):
+    # Пути к файлам настроек вычисляются при первом обращении
+    if name == "PROJECT_ROOT":
+        return get_project_root()
+    if name == "CONFIG_DIR":
+        return get_env_file().parent
+    if name == "ENV_FILE":
+        return get_env_file()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
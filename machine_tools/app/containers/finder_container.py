@@ -18,16 +18,17 @@ from machine_tools.app.formatters import (
 class FinderContainer(containers.DeclarativeContainer):
     """Контейнер для MachineFinder и его форматтеров"""
 
-    # Провайдеры для форматтеров
+    # Провайдеры для форматтеров. Поисковики контейнера читают станки из БД пакета, поэтому форматтеры
+    # MachineInfo работают в доверенном режиме
     list_name_formatter = providers.Singleton(ListNameFormatter)
-    list_machine_info_formatter = providers.Singleton(ListMachineInfoFormatter)
+    list_machine_info_formatter = providers.Singleton(ListMachineInfoFormatter, trusted=True)
     dict_name_formatter = providers.Singleton(DictNameFormatter)
-    dict_machine_info_formatter = providers.Singleton(DictMachineInfoFormatter)
+    dict_machine_info_formatter = providers.Singleton(DictMachineInfoFormatter, trusted=True)
     indexed_name_formatter = providers.Singleton(IndexedNameFormatter)
-    indexed_machine_info_formatter = providers.Singleton(IndexedMachineInfoFormatter)
+    indexed_machine_info_formatter = providers.Singleton(IndexedMachineInfoFormatter, trusted=True)
 
-    # Провайдер для сессии БД
-    session = providers.Singleton(session_manager.get_session)
+    # Провайдер для сессии БД. Factory, чтобы в режимах "thread" и "task" каждый поток получал свою сессию
+    session = providers.Factory(session_manager.get_session)
 
     # Провайдер для MachineFinder с разными форматтерами
     finder_with_list_names = providers.Factory(
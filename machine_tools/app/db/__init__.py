@@ -1,8 +1,50 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 # ---------------------------------------------------------------------------------------------------------------------
-from machine_tools.app.db.query_builder import QueryBuilder
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from machine_tools.app.db.catalog import MachineCatalog
+    from machine_tools.app.db.catalog_query_builder import CatalogQueryBuilder
+    from machine_tools.app.db.machine_infos import MachineInfoCache, machine_info_cache, refresh_infos
+    from machine_tools.app.db.query_builder import QueryBuilder
+    from machine_tools.app.db.query_cache import QueryCache, invalidate_caches, query_cache
+    from machine_tools.app.db.session import MachineToolsSession
+
+# Имена загружаются при первом обращении: каталог тянет NumPy, построитель запросов - SQLAlchemy
+_LAZY_EXPORTS = {
+    "CatalogQueryBuilder": "machine_tools.app.db.catalog_query_builder",
+    "MachineCatalog": "machine_tools.app.db.catalog",
+    "MachineInfoCache": "machine_tools.app.db.machine_infos",
+    "MachineToolsSession": "machine_tools.app.db.session",
+    "QueryBuilder": "machine_tools.app.db.query_builder",
+    "QueryCache": "machine_tools.app.db.query_cache",
+    "invalidate_caches": "machine_tools.app.db.query_cache",
+    "machine_info_cache": "machine_tools.app.db.machine_infos",
+    "query_cache": "machine_tools.app.db.query_cache",
+    "refresh_infos": "machine_tools.app.db.machine_infos",
+}
 
 __all__ = [
+    "CatalogQueryBuilder",
+    "MachineCatalog",
+    "MachineInfoCache",
+    "MachineToolsSession",
     "QueryBuilder",
+    "QueryCache",
+    "invalidate_caches",
+    "machine_info_cache",
+    "query_cache",
+    "refresh_infos",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_LAZY_EXPORTS[name]), name)
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import threading
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from machine_tools.app.config import get_settings
+from machine_tools.app.db.session import MachineToolsSession
+from machine_tools.app.db.session_manager import get_engine_options
+
+
+class AsyncSessionManager:
+    """
+    Singleton для управления асинхронными сессиями БД.
+
+    Движок (драйвер asyncpg) создается при первом обращении, поэтому синхронный код не требует asyncpg.
+    AsyncSession нельзя использовать из нескольких задач одновременно, поэтому общей сессии по умолчанию
+    нет: каждый вызов get_session() возвращает новую сессию, а пул соединений общий.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super(AsyncSessionManager, cls).__new__(cls)
+                    instance._engine = None
+                    instance._session_factory = None
+                    cls._instance = instance
+        return cls._instance
+
+    @property
+    def engine(self) -> AsyncEngine:
+        """Асинхронный движок БД"""
+        if self._engine is None:
+            with self._lock:
+                if self._engine is None:
+                    settings = get_settings()
+                    self._engine = create_async_engine(
+                        settings.ASYNC_DATABASE_URL, **get_engine_options(settings, asynchronous=True)
+                    )
+        return self._engine
+
+    @engine.setter
+    def engine(self, engine: AsyncEngine) -> None:
+        self._engine = engine
+        self._session_factory = None
+
+    @property
+    def SessionLocal(self) -> async_sessionmaker:
+        """Фабрика асинхронных сессий"""
+        if self._session_factory is None:
+            self._session_factory = async_sessionmaker(
+                self.engine,
+                class_=AsyncSession,
+                sync_session_class=MachineToolsSession,
+                autoflush=False,
+                expire_on_commit=False,
+            )
+        return self._session_factory
+
+    @SessionLocal.setter
+    def SessionLocal(self, factory: async_sessionmaker) -> None:
+        self._session_factory = factory
+
+    def get_session(self) -> AsyncSession:
+        """
+        Создает новую асинхронную сессию БД. Закрывать ее должен вызывающий код.
+
+        Returns:
+            AsyncSession: Асинхронная сессия БД
+        """
+        return self.SessionLocal()
+
+    @asynccontextmanager
+    async def get_db(self) -> AsyncGenerator[AsyncSession, None]:
+        """
+        Асинхронный контекстный менеджер для работы с сессией БД.
+
+        Yields:
+            AsyncSession: Асинхронная сессия БД
+        """
+        async with self.SessionLocal() as session:
+            yield session
+
+    async def dispose(self) -> None:
+        """Закрывает все соединения пула асинхронного движка"""
+        if self._engine is not None:
+            await self._engine.dispose()
+
+
+# Создаем глобальный экземпляр менеджера асинхронных сессий
+async_session_manager = AsyncSessionManager()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import io
+from datetime import date, datetime
+from time import perf_counter
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Float, Integer, String, Table, insert
+from sqlalchemy.engine import Connection
+
+from machine_tools.app.db.query_cache import invalidate_caches
+
+# Методы загрузки
+LOAD_METHODS = ("auto", "copy", "executemany")
+
+# Количество строк в одном executemany, чтобы не собирать в памяти параметры всей таблицы
+EXECUTEMANY_CHUNK_SIZE = 10_000
+
+
+class LoadStats:
+    """Результат массовой загрузки таблицы"""
+
+    def __init__(self, table: str, rows: int, seconds: float, method: str):
+        self.table = table
+        self.rows = rows
+        self.seconds = seconds
+        self.method = method
+
+    @property
+    def rows_per_second(self) -> float:
+        """Скорость загрузки, строк в секунду"""
+        return self.rows / self.seconds if self.seconds > 0 else float("inf")
+
+    def __repr__(self) -> str:
+        return (
+            f"LoadStats(table={self.table!r}, rows={self.rows}, seconds={self.seconds:.3f}, method={self.method!r})"
+        )
+
+    def __str__(self) -> str:
+        return (
+            f"{self.table}: {self.rows} строк за {self.seconds:.2f} с "
+            f"({self.rows_per_second:.0f} строк/с, {self.method})"
+        )
+
+
+def frame_to_rows(frame: pd.DataFrame, table: Table, columns: Sequence[str]) -> List[Tuple[Any, ...]]:
+    """
+    Преобразует DataFrame в кортежи значений колонок таблицы без обхода строк в Python.
+
+    Каждая колонка приводится к типу колонки таблицы целиком: Integer и Float - через pd.to_numeric
+    (нечисловые значения становятся NULL), String - к строкам, остальные остаются как есть.
+    NaN везде заменяется на None, а не на строку "nan".
+
+    Args:
+        frame (pd.DataFrame): Исходные данные. Колонки, которых нет в DataFrame, заполняются NULL
+        table (Table): Таблица SQLAlchemy
+        columns (Sequence[str]): Колонки таблицы в порядке значений кортежа
+
+    Returns:
+        List[Tuple[Any, ...]]: Строки для загрузки
+    """
+    values = []
+    for column in columns:
+        if column not in frame:
+            values.append([None] * len(frame))
+            continue
+
+        series = frame[column]
+        column_type = table.columns[column].type
+        if isinstance(column_type, Integer):
+            numbers = pd.to_numeric(series, errors="coerce")
+            # Дробная часть отбрасывается, как при int(float(value))
+            series = np.trunc(numbers).astype("Int64")
+        elif isinstance(column_type, Float):
+            series = pd.to_numeric(series, errors="coerce")
+        elif isinstance(column_type, String):
+            series = series.astype(object).where(series.isna(), series.astype(str))
+
+        series = series.astype(object)
+        values.append(series.where(series.notna(), None).tolist())
+    return list(zip(*values))
+
+
+def _copy_value(value: Any) -> str:
+    """Значение в формате CSV для COPY: NULL - пустое поле, строки всегда в кавычках"""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return '"' + value.replace('"', '""') + '"'
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def copy_line(row: Sequence[Any]) -> str:
+    """Строка CSV для COPY с переводом строки в конце"""
+    return ",".join(map(_copy_value, row)) + "\n"
+
+
+def copy_buffer(rows: Iterable[Sequence[Any]]) -> io.StringIO:
+    """
+    Формирует буфер CSV для COPY FROM STDIN.
+
+    Пустая строка записывается в кавычках, а NULL - пустым полем без кавычек, поэтому PostgreSQL их различает.
+
+    Args:
+        rows (Iterable[Sequence[Any]]): Строки
+
+    Returns:
+        io.StringIO: Буфер, готовый к чтению
+    """
+    buffer = io.StringIO()
+    buffer.writelines(map(copy_line, rows))
+    buffer.seek(0)
+    return buffer
+
+
+def _copy_rows(connection: Connection, table: Table, columns: Sequence[str], rows: List[Tuple[Any, ...]]) -> None:
+    """Загрузка через COPY FROM STDIN в транзакции соединения (psycopg2)"""
+    preparer = connection.dialect.identifier_preparer
+    column_list = ", ".join(preparer.quote(column) for column in columns)
+    sql = f"COPY {preparer.format_table(table)} ({column_list}) FROM STDIN WITH (FORMAT csv)"
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(sql, copy_buffer(rows))
+    finally:
+        cursor.close()
+
+
+def _insert_rows(connection: Connection, table: Table, columns: Sequence[str], rows: List[Tuple[Any, ...]]) -> None:
+    """Загрузка через executemany порциями. SQLAlchemy собирает порцию в многострочный INSERT (insertmanyvalues)"""
+    statement = insert(table)
+    for start in range(0, len(rows), EXECUTEMANY_CHUNK_SIZE):
+        chunk = rows[start : start + EXECUTEMANY_CHUNK_SIZE]
+        connection.execute(statement, [dict(zip(columns, row)) for row in chunk])
+
+
+def supports_copy(connection: Connection) -> bool:
+    """Поддерживает ли соединение COPY FROM STDIN (PostgreSQL с драйвером psycopg2)"""
+    return connection.dialect.name == "postgresql" and connection.dialect.driver == "psycopg2"
+
+
+def bulk_load(
+    connection: Connection,
+    table: Table,
+    columns: Sequence[str],
+    rows: List[Tuple[Any, ...]],
+    method: str = "auto",
+) -> LoadStats:
+    """
+    Массовая загрузка строк в таблицу в текущей транзакции соединения.
+
+    Args:
+        connection (Connection): Соединение SQLAlchemy (например, из engine.begin())
+        table (Table): Таблица
+        columns (Sequence[str]): Колонки в порядке значений строк
+        rows (List[Tuple[Any, ...]]): Строки, например из frame_to_rows()
+        method (str, optional): "copy", "executemany" или "auto" - COPY для PostgreSQL с psycopg2,
+            иначе executemany. По умолчанию "auto"
+
+    Returns:
+        LoadStats: Количество строк, время и скорость загрузки
+
+    Raises:
+        ValueError: Если метод не поддерживается или COPY недоступен для соединения
+    """
+    if method not in LOAD_METHODS:
+        raise ValueError(f"Недопустимый метод загрузки: {method}. Допустимые значения: {LOAD_METHODS}")
+    if method == "auto":
+        method = "copy" if supports_copy(connection) else "executemany"
+    elif method == "copy" and not supports_copy(connection):
+        raise ValueError(f"COPY не поддерживается для {connection.dialect.name}+{connection.dialect.driver}")
+
+    start = perf_counter()
+    if rows:
+        if method == "copy":
+            _copy_rows(connection, table, columns, rows)
+        else:
+            _insert_rows(connection, table, columns, rows)
+        # Данные изменились, закэшированные результаты поиска устарели
+        invalidate_caches()
+    return LoadStats(table.name, len(rows), perf_counter() - start, method)
+
+
+def load_frame(
+    connection: Connection,
+    table: Table,
+    frame: pd.DataFrame,
+    columns: Optional[Sequence[str]] = None,
+    method: str = "auto",
+) -> LoadStats:
+    """
+    Загружает DataFrame в таблицу: frame_to_rows() и bulk_load().
+
+    Args:
+        connection (Connection): Соединение SQLAlchemy
+        table (Table): Таблица
+        frame (pd.DataFrame): Данные
+        columns (Sequence[str], optional): Колонки таблицы. По умолчанию колонки таблицы, которые есть в DataFrame
+        method (str, optional): Метод загрузки (см. bulk_load). По умолчанию "auto"
+
+    Returns:
+        LoadStats: Количество строк, время и скорость загрузки (включая преобразование DataFrame)
+    """
+    start = perf_counter()
+    if columns is None:
+        columns = [column for column in table.columns.keys() if column in frame]
+    rows = frame_to_rows(frame, table, columns)
+    stats = bulk_load(connection, table, columns, rows, method=method)
+    stats.seconds = perf_counter() - start
+    return stats
@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+from collections import namedtuple
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from machine_tools.app.models import Machine, TechnicalRequirement
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Колонки таблицы machine_tools в порядке модели
+MACHINE_COLUMNS: Tuple[str, ...] = tuple(Machine.__table__.columns.keys())
+# Числовые колонки, хранятся как float64 (NULL -> NaN)
+NUMERIC_COLUMNS: Tuple[str, ...] = ("id", "group", "type", "power", "efficiency", "weight", "length", "width", "height")
+# Колонки-перечисления, хранятся словарным кодированием (коды + категории)
+ENUM_COLUMNS: Tuple[str, ...] = ("accuracy", "automation", "software_control", "specialization", "weight_class")
+
+# Легкие неизменяемые строки каталога с интерфейсом, который ожидают форматтеры
+CatalogMachine = namedtuple("CatalogMachine", MACHINE_COLUMNS + ("technical_requirements",))
+CatalogRequirement = namedtuple("CatalogRequirement", ["requirement", "value"])
+
+
+class MachineCatalog:
+    """
+    Колоночный снимок таблицы machine_tools в памяти.
+
+    Каждая колонка хранится массивом NumPy, упорядоченным по id. Числовые колонки - float64 с NaN
+    вместо NULL, колонки-перечисления - массив кодов и массив категорий. Строки для форматтеров
+    собираются один раз при загрузке и переиспользуются всеми запросами.
+    """
+
+    def __init__(self, records: Iterable[Dict[str, Any]], requirements: Optional[Dict[str, List[Any]]] = None):
+        """
+        Инициализация каталога.
+
+        Args:
+            records (Iterable[Dict[str, Any]]): Записи станков {колонка: значение}
+            requirements (Dict[str, List[Any]], optional): Технические требования {имя станка: [(требование, значение)]}
+        """
+        requirements = requirements or {}
+        records = sorted(records, key=lambda record: record["id"])
+
+        self.rows: List[CatalogMachine] = [
+            CatalogMachine(
+                **{column: record.get(column) for column in MACHINE_COLUMNS},
+                technical_requirements=tuple(
+                    CatalogRequirement(*requirement) for requirement in requirements.get(record["name"], ())
+                ),
+            )
+            for record in records
+        ]
+
+        self.numeric: Dict[str, np.ndarray] = {
+            column: np.array(
+                [np.nan if record.get(column) is None else record[column] for record in records], dtype=np.float64
+            )
+            for column in NUMERIC_COLUMNS
+        }
+
+        self.codes: Dict[str, np.ndarray] = {}
+        self.categories: Dict[str, Dict[Any, int]] = {}
+        for column in ENUM_COLUMNS:
+            lookup: Dict[Any, int] = {}
+            self.codes[column] = np.fromiter(
+                (lookup.setdefault(record.get(column), len(lookup)) for record in records),
+                dtype=np.int32,
+                count=len(records),
+            )
+            self.categories[column] = lookup
+
+        self.values: Dict[str, np.ndarray] = {}
+        for column in MACHINE_COLUMNS:
+            if column not in NUMERIC_COLUMNS and column not in ENUM_COLUMNS:
+                array = np.empty(len(records), dtype=object)
+                array[:] = [record.get(column) for record in records]
+                self.values[column] = array
+
+        names = [record["name"] for record in records]
+        self.names: np.ndarray = np.array(names, dtype=str)
+        self.lower_names: np.ndarray = np.array([name.lower() for name in names], dtype=str)
+        self._sort_keys: Dict[str, np.ndarray] = {}
+        self._requirements: Optional["pd.DataFrame"] = None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @classmethod
+    def from_session(cls, session: Optional[Session] = None) -> "MachineCatalog":
+        """
+        Загружает каталог из БД двумя запросами.
+
+        Args:
+            session (Session, optional): Сессия БД. Если не указана, используется сессия по умолчанию.
+
+        Returns:
+            MachineCatalog: Каталог станков
+        """
+        if session is None:
+            from machine_tools.app.db.session_manager import session_manager
+
+            session = session_manager.get_session()
+
+        records = [dict(row) for row in session.execute(select(Machine.__table__)).mappings()]
+
+        # Требования группируются по именам станков без соединения: имена уже загружены вместе со станками
+        names = {record["id"]: record["name"] for record in records}
+        requirements: Dict[str, List[Any]] = {}
+        query = select(
+            TechnicalRequirement.machine_id, TechnicalRequirement.requirement, TechnicalRequirement.value
+        ).order_by(TechnicalRequirement.id)
+        for machine_id, requirement, value in session.execute(query):
+            requirements.setdefault(names[machine_id], []).append((requirement, value))
+
+        return cls(records, requirements)
+
+    def column(self, column: str) -> np.ndarray:
+        """
+        Возвращает массив значений колонки (для перечислений - массив кодов).
+
+        Args:
+            column (str): Имя колонки
+
+        Returns:
+            np.ndarray: Массив значений
+        """
+        if column in self.numeric:
+            return self.numeric[column]
+        if column in self.codes:
+            return self.codes[column]
+        return self.values[column]
+
+    def encode(self, column: str, values: Iterable[Any]) -> List[int]:
+        """
+        Переводит значения колонки-перечисления в коды. Неизвестные значения пропускаются.
+
+        Args:
+            column (str): Имя колонки-перечисления
+            values (Iterable[Any]): Значения
+
+        Returns:
+            List[int]: Коды значений
+        """
+        lookup = self.categories[column]
+        return [lookup[value] for value in values if value in lookup]
+
+    def decode(self, column: str, codes: Iterable[int]) -> List[Any]:
+        """
+        Переводит коды колонки-перечисления в значения.
+
+        Args:
+            column (str): Имя колонки-перечисления
+            codes (Iterable[int]): Коды
+
+        Returns:
+            List[Any]: Значения
+        """
+        values = list(self.categories[column])
+        return [values[code] for code in codes]
+
+    def sort_key(self, column: str) -> np.ndarray:
+        """
+        Возвращает числовой ключ сортировки колонки (NULL -> NaN).
+
+        Для нечисловых колонок ключ - ранг значения среди отсортированных уникальных значений,
+        вычисляется при первом обращении и кэшируется.
+
+        Args:
+            column (str): Имя колонки
+
+        Returns:
+            np.ndarray: Массив float64
+        """
+        if column in self.numeric:
+            return self.numeric[column]
+        if column not in self._sort_keys:
+            if column in self.codes:
+                values = self.decode(column, self.codes[column])
+            else:
+                values = self.values[column]
+            ranks = {value: rank for rank, value in enumerate(sorted({v for v in values if v is not None}))}
+            self._sort_keys[column] = np.array(
+                [np.nan if value is None else ranks[value] for value in values], dtype=np.float64
+            )
+        return self._sort_keys[column]
+
+    def requirements_frame(self) -> "pd.DataFrame":
+        """
+        Возвращает технические требования всех станков с разобранными значениями.
+
+        Таблица строится и разбирается при первом обращении и кэшируется.
+
+        Returns:
+            pd.DataFrame: Колонки position (позиция станка в каталоге), requirement, key (ключ наименования,
+                см. requirement_key), value и PARSED_COLUMNS
+        """
+        if self._requirements is None:
+            # Разбор значений тянет pandas, поэтому импортируется только при фильтрации по требованиям
+            import pandas as pd
+
+            from machine_tools.app.parsers import parse_requirements, requirement_key
+
+            frame = pd.DataFrame(
+                [
+                    (position, requirement.requirement, requirement.value)
+                    for position, row in enumerate(self.rows)
+                    for requirement in row.technical_requirements
+                ],
+                columns=["position", "requirement", "value"],
+            )
+            keys = {name: requirement_key(name) for name in set(frame["requirement"])}
+            frame.insert(2, "key", frame["requirement"].map(keys))
+            self._requirements = pd.concat([frame, parse_requirements(frame["requirement"], frame["value"])], axis=1)
+        return self._requirements
@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import re
+from typing import Any, Dict, Iterator, List, Union
+
+import numpy as np
+
+from machine_tools.app.db.catalog import MACHINE_COLUMNS, CatalogMachine, MachineCatalog
+from machine_tools.app.db.machine_specs import spec_condition
+from machine_tools.app.db.query_builder import requirement_condition
+
+
+def _like_to_regex(pattern: str) -> "re.Pattern":
+    """Переводит шаблон SQL LIKE в регулярное выражение"""
+    parts = (".*" if char == "%" else "." if char == "_" else re.escape(char) for char in pattern)
+    return re.compile("".join(parts), re.DOTALL)
+
+
+class CatalogQueryBuilder:
+    """
+    Построитель запросов к каталогу станков в памяти.
+
+    Повторяет интерфейс QueryBuilder: фильтры сразу сужают булеву маску по массивам каталога,
+    сортировка выполняется через lexsort, результат - строки CatalogMachine.
+    """
+
+    def __init__(self, catalog: MachineCatalog):
+        self.catalog = catalog
+        self.reset_builder()
+
+    def reset_builder(self) -> "CatalogQueryBuilder":
+        """Сброс всех фильтров и параметров запроса"""
+        self._mask = np.ones(len(self.catalog), dtype=bool)
+        self._order_by = []
+        self._limit = None
+        self._offset = None
+        return self
+
+    def select_columns(self, *columns: str) -> "CatalogQueryBuilder":
+        """Проекция на колонки. Строки каталога уже собраны, поэтому проверяются только имена колонок"""
+        unknown = [column for column in columns if column not in MACHINE_COLUMNS]
+        if unknown:
+            raise ValueError(f"Недопустимые колонки: {unknown}. Допустимые значения: {list(MACHINE_COLUMNS)}")
+        return self
+
+    def load_technical_requirements(self, strategy: str = "selectin") -> "CatalogQueryBuilder":
+        """Технические требования загружены в каталог заранее"""
+        return self
+
+    def _filter_values(self, column: str, values: Union[Any, List[Any]]) -> "CatalogQueryBuilder":
+        """Фильтр по равенству или вхождению в список"""
+        values = values if isinstance(values, list) else [values]
+        if column in self.catalog.codes:
+            self._mask &= np.isin(self.catalog.codes[column], self.catalog.encode(column, values))
+        else:
+            self._mask &= np.isin(self.catalog.numeric[column], [float(value) for value in values])
+        return self
+
+    def _filter_range(self, column: str, min_value: float = None, max_value: float = None) -> "CatalogQueryBuilder":
+        """Фильтр по диапазону. NaN (NULL) не проходит ни одно сравнение, как и в SQL"""
+        array = self.catalog.numeric[column]
+        if min_value is not None:
+            self._mask &= array >= min_value
+        if max_value is not None:
+            self._mask &= array <= max_value
+        return self
+
+    def filter_by_id(self, machine_id: int) -> "CatalogQueryBuilder":
+        """Фильтр по ID станка"""
+        return self._filter_values("id", machine_id)
+
+    def filter_by_group(self, group: Union[int, List[int]]) -> "CatalogQueryBuilder":
+        """Фильтр по группе станка"""
+        return self._filter_values("group", group)
+
+    def filter_by_type(self, type: Union[int, List[int]]) -> "CatalogQueryBuilder":
+        """Фильтр по типу станка"""
+        return self._filter_values("type", type)
+
+    def filter_by_power(self, min_power: float = None, max_power: float = None) -> "CatalogQueryBuilder":
+        """Фильтр по мощности"""
+        return self._filter_range("power", min_power, max_power)
+
+    def filter_by_efficiency(
+        self, min_efficiency: float = None, max_efficiency: float = None
+    ) -> "CatalogQueryBuilder":
+        """Фильтр по КПД"""
+        return self._filter_range("efficiency", min_efficiency, max_efficiency)
+
+    def filter_by_accuracy(self, accuracy: Union[str, List[str]]) -> "CatalogQueryBuilder":
+        """Фильтр по классу точности"""
+        return self._filter_values("accuracy", accuracy)
+
+    def filter_by_automation(self, automation: Union[str, List[str]]) -> "CatalogQueryBuilder":
+        """Фильтр по уровню автоматизации"""
+        return self._filter_values("automation", automation)
+
+    def filter_by_specialization(self, specialization: Union[str, List[str]]) -> "CatalogQueryBuilder":
+        """Фильтр по специализации"""
+        return self._filter_values("specialization", specialization)
+
+    def filter_by_software_control(self, software_control: Union[str, List[str]]) -> "CatalogQueryBuilder":
+        """Фильтр по наличию системы управления"""
+        return self._filter_values("software_control", software_control)
+
+    def filter_by_name(
+        self, name: str, case_sensitive: bool = False, exact_match: bool = False
+    ) -> "CatalogQueryBuilder":
+        """Фильтр по имени станка с той же семантикой, что и в QueryBuilder (==, ILIKE, LIKE)"""
+        names = self.catalog.names if case_sensitive else self.catalog.lower_names
+        value = name if case_sensitive else name.lower()
+
+        if exact_match and case_sensitive:
+            self._mask &= names == value
+        elif "%" in value or "_" in value:
+            # Шаблон LIKE/ILIKE с подстановочными символами
+            regex = _like_to_regex(value if exact_match else f"%{value}%")
+            self._mask &= np.fromiter((regex.fullmatch(n) is not None for n in names), dtype=bool, count=len(names))
+        elif exact_match:
+            self._mask &= names == value
+        else:
+            self._mask &= np.char.find(names, value) >= 0
+        return self
+
+    def filter_by_names(self, names: List[str], case_sensitive: bool = False) -> "CatalogQueryBuilder":
+        """Фильтр по списку имен станков (точное совпадение, регистр - как в QueryBuilder)"""
+        if case_sensitive:
+            self._mask &= np.isin(self.catalog.names, list(names))
+        else:
+            self._mask &= np.isin(self.catalog.lower_names, [name.lower() for name in names])
+        return self
+
+    def filter_by_requirement(self, name: str, op: str, value: Union[float, str]) -> "CatalogQueryBuilder":
+        """Фильтр по значению технического требования. Наименования сравниваются по ключу, как в requirement_names"""
+        from machine_tools.app.parsers import requirement_key
+
+        requirements = self.catalog.requirements_frame()
+        requirements = requirements[requirements["key"] == requirement_key(name)]
+        matched = requirements.loc[requirement_condition(requirements, op, value), "position"]
+        mask = np.zeros(len(self.catalog), dtype=bool)
+        mask[matched.to_numpy(dtype=np.int64)] = True
+        self._mask &= mask
+        return self
+
+    def filter_by_spec(self, spec: Dict[str, Any]) -> "CatalogQueryBuilder":
+        """Фильтр по вхождению пар {параметр: значение} в спецификацию станка, как в QueryBuilder"""
+        pairs = spec_condition(spec).spec.items()
+        specs = self.catalog.values["spec"]
+        self._mask &= np.fromiter(
+            (all((row_spec or {}).get(name) == value for name, value in pairs) for row_spec in specs),
+            dtype=bool,
+            count=len(specs),
+        )
+        return self
+
+    def order_by(self, column: str, descending: bool = False) -> "CatalogQueryBuilder":
+        """Сортировка по колонке. NULL - в конце по возрастанию и в начале по убыванию, как в PostgreSQL"""
+        if column in MACHINE_COLUMNS:
+            self._order_by.append((column, descending))
+        return self
+
+    def limit(self, limit: int) -> "CatalogQueryBuilder":
+        """Ограничение количества результатов"""
+        self._limit = limit
+        return self
+
+    def offset(self, offset: int) -> "CatalogQueryBuilder":
+        """Смещение результатов"""
+        self._offset = offset
+        return self
+
+    def indices(self) -> np.ndarray:
+        """Позиции строк каталога, удовлетворяющих запросу, с учетом сортировки, смещения и лимита"""
+        indices = np.flatnonzero(self._mask)
+
+        if self._order_by:
+            keys = []
+            # lexsort сортирует по последнему ключу в первую очередь
+            for column, descending in reversed(self._order_by):
+                values = self.catalog.sort_key(column)[indices]
+                nulls = np.isnan(values)
+                keys.append(-values if descending else values)
+                keys.append(~nulls if descending else nulls)
+            indices = indices[np.lexsort(keys)]
+
+        if self._offset is not None:
+            indices = indices[self._offset :]
+        if self._limit is not None:
+            indices = indices[: self._limit]
+        return indices
+
+    def execute(self) -> List[CatalogMachine]:
+        """Выполнение запроса"""
+        rows = self.catalog.rows
+        return [rows[i] for i in self.indices()]
+
+    def iter_batches(self, batch_size: int = 1000) -> Iterator[List[CatalogMachine]]:
+        """Выполнение запроса порциями"""
+        if batch_size <= 0:
+            raise ValueError(f"Размер порции должен быть положительным: {batch_size}")
+        rows = self.catalog.rows
+        indices = self.indices()
+        for start in range(0, len(indices), batch_size):
+            yield [rows[i] for i in indices[start : start + batch_size]]
+
+    def get_unique_values(self, column: str) -> Any:
+        """Получение уникальных значений колонки"""
+        if column not in MACHINE_COLUMNS:
+            return []
+        rows = self.catalog.rows
+        return list(dict.fromkeys(getattr(rows[i], column) for i in np.flatnonzero(self._mask)))
@@ -0,0 +1,480 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import hashlib
+import os
+from collections import Counter
+from datetime import datetime
+from time import perf_counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.engine import Connection
+
+from machine_tools.app.db.bulk_loader import LoadStats, bulk_load, frame_to_rows, load_frame
+from machine_tools.app.db.machine_specs import refresh_specs
+from machine_tools.app.db.query_cache import invalidate_caches
+from machine_tools.app.db.requirements_importer import (
+    LOAD_COLUMNS,
+    ParsedFile,
+    RequirementRow,
+    list_requirement_files,
+    parse_files,
+    update_values,
+    with_parsed,
+    with_requirement_ids,
+)
+from machine_tools.app.models import ImportManifest, Machine, TechnicalRequirement
+
+# Имя основной таблицы станков в папке CSV
+MACHINES_CSV = "machine_tools.csv"
+
+# Колонки machine_tools.csv, которые загружаются в таблицу (id назначает БД)
+MACHINE_CSV_COLUMNS = (
+    "name",
+    "group",
+    "type",
+    "power",
+    "efficiency",
+    "accuracy",
+    "automation",
+    "software_control",
+    "specialization",
+    "weight",
+    "weight_class",
+    "length",
+    "width",
+    "height",
+    "overall_diameter",
+    "city",
+    "manufacturer",
+    "machine_type",
+)
+
+
+def get_csv_dir() -> str:
+    """Путь к папке с CSV"""
+    base_dir = os.path.dirname(__file__)
+    return os.path.abspath(os.path.join(base_dir, "..", "resources", "tables_csv"))
+
+
+def load_machines(connection: Connection, csv_path: str, method: str = "auto") -> LoadStats:
+    """
+    Загружает станки из machine_tools.csv одной массовой вставкой.
+
+    Args:
+        connection (Connection): Соединение SQLAlchemy в открытой транзакции
+        csv_path (str): Путь к machine_tools.csv
+        method (str, optional): Метод загрузки (см. bulk_load). По умолчанию "auto"
+
+    Returns:
+        LoadStats: Статистика загрузки
+    """
+    df = pd.read_csv(csv_path)
+    # COPY не вычисляет Python-значения по умолчанию модели, поэтому метки времени задаются явно
+    now = datetime.utcnow()
+    df = df.assign(created_at=now, updated_at=now)
+    return load_frame(
+        connection, Machine.__table__, df, MACHINE_CSV_COLUMNS + ("created_at", "updated_at"), method=method
+    )
+
+
+class FileState:
+    """Состояние CSV-файла на диске: размер, время изменения и хеш содержимого"""
+
+    __slots__ = ("path", "filename", "size", "mtime_ns", "sha256")
+
+    def __init__(self, path: str, sha256: Optional[str] = None):
+        stat = os.stat(path)
+        self.path = path
+        self.filename = os.path.basename(path)
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self.sha256 = sha256
+
+    def hash(self) -> str:
+        """Вычисляет и запоминает SHA-256 содержимого файла"""
+        if self.sha256 is None:
+            with open(self.path, "rb") as file:
+                self.sha256 = hashlib.sha256(file.read()).hexdigest()
+        return self.sha256
+
+
+class SyncReport:
+    """Итог инкрементальной синхронизации CSV с БД"""
+
+    def __init__(self):
+        self.files = 0
+        self.unchanged = 0
+        self.changed: List[str] = []
+        self.removed: List[str] = []
+        self.skipped: List[str] = []
+        self.machines_inserted = 0
+        self.machines_updated = 0
+        self.requirements_inserted = 0
+        self.requirements_updated = 0
+        self.requirements_deleted = 0
+        self.stages: Dict[str, float] = {}
+
+    def __str__(self) -> str:
+        lines = [
+            f"Файлов: {self.files}, без изменений: {self.unchanged}, изменено: {len(self.changed)}, "
+            f"удалено: {len(self.removed)}, пропущено: {len(self.skipped)}",
+            f"Станки: добавлено {self.machines_inserted}, обновлено {self.machines_updated}",
+            f"Требования: добавлено {self.requirements_inserted}, обновлено {self.requirements_updated}, "
+            f"удалено {self.requirements_deleted}",
+        ]
+        lines.extend(f"  {stage}: {seconds:.2f} с" for stage, seconds in self.stages.items())
+        return "\n".join(lines)
+
+
+def read_manifest(connection: Connection) -> Dict[str, ImportManifest]:
+    """Записи манифеста импорта по именам файлов"""
+    rows = connection.execute(select(ImportManifest.__table__)).all()
+    return {row.filename: row for row in rows}
+
+
+def write_manifest(
+    connection: Connection,
+    states: Iterable[FileState],
+    machine_names: Dict[str, Optional[str]],
+    rows: Dict[str, int],
+    encodings: Optional[Dict[str, Optional[str]]] = None,
+) -> None:
+    """
+    Записывает в манифест состояние загруженных файлов, заменяя прежние записи.
+
+    Args:
+        connection (Connection): Соединение SQLAlchemy в открытой транзакции
+        states (Iterable[FileState]): Состояния файлов
+        machine_names (Dict[str, Optional[str]]): Станок каждого файла требований
+        rows (Dict[str, int]): Количество строк каждого файла
+        encodings (Dict[str, Optional[str]], optional): Кодировка каждого файла требований
+    """
+    states = list(states)
+    if not states:
+        return
+    encodings = encodings or {}
+    now = datetime.utcnow()
+    table = ImportManifest.__table__
+    connection.execute(delete(table).where(table.c.filename.in_([state.filename for state in states])))
+    connection.execute(
+        insert(table),
+        [
+            {
+                "filename": state.filename,
+                "sha256": state.hash(),
+                "size": state.size,
+                "mtime_ns": state.mtime_ns,
+                "machine_name": machine_names.get(state.filename),
+                "rows": rows.get(state.filename, 0),
+                "encoding": encodings.get(state.filename),
+                "imported_at": now,
+            }
+            for state in states
+        ],
+    )
+
+
+def find_changes(
+    csv_dir: str, manifest: Dict[str, ImportManifest]
+) -> Tuple[List[FileState], List[FileState], List[str]]:
+    """
+    Сравнивает файлы папки с манифестом.
+
+    Файл с прежними размером и временем изменения считается неизменным без чтения. Остальные файлы
+    хешируются: если хеш совпал (файл скопировали или коснулись), обновляется только их состояние.
+
+    Args:
+        csv_dir (str): Папка с CSV
+        manifest (Dict[str, ImportManifest]): Записи манифеста
+
+    Returns:
+        Tuple[List[FileState], List[FileState], List[str]]: Измененные или новые файлы, файлы с прежним
+            содержимым, но новым состоянием, и имена файлов из манифеста, которых больше нет
+    """
+    changed, touched = [], []
+    paths = list_requirement_files(csv_dir)
+    main_csv = os.path.join(csv_dir, MACHINES_CSV)
+    if os.path.exists(main_csv):
+        paths.insert(0, main_csv)
+
+    for path in paths:
+        state = FileState(path)
+        entry = manifest.get(state.filename)
+        if entry is not None and entry.size == state.size and entry.mtime_ns == state.mtime_ns:
+            continue
+        if entry is not None and entry.sha256 == state.hash():
+            touched.append(state)
+        else:
+            changed.append(state)
+
+    on_disk = {os.path.basename(path) for path in paths}
+    removed = [filename for filename in manifest if filename not in on_disk]
+    return changed, touched, removed
+
+
+def sync_machines(connection: Connection, csv_path: str) -> Tuple[int, int]:
+    """
+    Применяет изменения machine_tools.csv построчно: добавляет новые станки и обновляет измененные колонки.
+
+    Станки, которых нет в файле, не удаляются: на них могут ссылаться технические требования.
+
+    Args:
+        connection (Connection): Соединение SQLAlchemy в открытой транзакции
+        csv_path (str): Путь к machine_tools.csv
+
+    Returns:
+        Tuple[int, int]: Количество добавленных и обновленных станков
+    """
+    table = Machine.__table__
+    rows = frame_to_rows(pd.read_csv(csv_path), table, MACHINE_CSV_COLUMNS)
+    query = select(*(table.c[column] for column in MACHINE_CSV_COLUMNS))
+    existing = {row[0]: tuple(row) for row in connection.execute(query)}
+
+    now = datetime.utcnow()
+    new_rows = []
+    updated = 0
+    for row in rows:
+        current = existing.get(row[0])
+        if current is None:
+            new_rows.append(row + (now, now))
+            continue
+        changes = {column: value for column, old, value in zip(MACHINE_CSV_COLUMNS, current, row) if old != value}
+        if changes:
+            connection.execute(update(table).where(table.c.name == row[0]).values(**changes, updated_at=now))
+            updated += 1
+
+    bulk_load(connection, table, MACHINE_CSV_COLUMNS + ("created_at", "updated_at"), new_rows)
+    return len(new_rows), updated
+
+
+def diff_requirements(
+    existing: List[Tuple[int, str, Optional[str]]], new: List[Tuple[str, Optional[str]]]
+) -> Tuple[List[int], List[Tuple[int, Optional[str]]], List[Tuple[str, Optional[str]]]]:
+    """
+    Построчная разница требований одного станка.
+
+    Совпадающие строки (параметр, значение) остаются как есть. Строки с тем же параметром, но другим
+    значением обновляются на месте, чтобы сохранить порядок требований. Остальные удаляются или добавляются.
+
+    Args:
+        existing (List[Tuple[int, str, Optional[str]]]): Строки в БД (id, параметр, значение) в порядке id
+        new (List[Tuple[str, Optional[str]]]): Строки файла (параметр, значение)
+
+    Returns:
+        Tuple: id для удаления, пары (id, новое значение) для обновления, строки (параметр, значение) для вставки
+    """
+    remaining = Counter(new)
+    stale = []
+    for row_id, requirement, value in existing:
+        if remaining[(requirement, value)] > 0:
+            remaining[(requirement, value)] -= 1
+        else:
+            stale.append((row_id, requirement))
+
+    missing = []
+    for row in new:
+        if remaining[row] > 0:
+            remaining[row] -= 1
+            missing.append(row)
+
+    # Пары "удаленная строка - добавленная строка" с одинаковым параметром превращаются в обновление значения
+    free: Dict[str, List[int]] = {}
+    for row_id, requirement in stale:
+        free.setdefault(requirement, []).append(row_id)
+    updates, inserts = [], []
+    for requirement, value in missing:
+        ids = free.get(requirement)
+        if ids:
+            updates.append((ids.pop(0), value))
+        else:
+            inserts.append((requirement, value))
+    deletes = [row_id for ids in free.values() for row_id in ids]
+    return deletes, updates, inserts
+
+
+def sync_requirements(
+    connection: Connection, new_rows: Dict[str, List[RequirementRow]], machine_ids: Dict[str, int]
+) -> Tuple[int, int, int]:
+    """
+    Применяет построчную разницу требований для указанных станков и пересобирает спецификации изменившихся станков.
+
+    Args:
+        connection (Connection): Соединение SQLAlchemy в открытой транзакции
+        new_rows (Dict[str, List[RequirementRow]]): Новые строки требований по именам станков
+        machine_ids (Dict[str, int]): ID станков по именам
+
+    Returns:
+        Tuple[int, int, int]: Количество добавленных, обновленных и удаленных строк
+    """
+    table = TechnicalRequirement.__table__
+    # Станков, которых нет в БД, нет и в требованиях: внешний ключ не допускает таких строк
+    ids = {name: machine_ids[name] for name in new_rows if name in machine_ids}
+    existing: Dict[int, List[Tuple[int, str, Optional[str]]]] = {machine_id: [] for machine_id in ids.values()}
+    query = (
+        select(table.c.id, table.c.machine_id, table.c.requirement, table.c.value)
+        .where(table.c.machine_id.in_(list(existing)))
+        .order_by(table.c.id)
+    )
+    existing_machine: Dict[int, int] = {}
+    for row_id, machine_id, requirement, value in connection.execute(query):
+        existing[machine_id].append((row_id, requirement, value))
+        existing_machine[row_id] = machine_id
+
+    deletes, updates, inserts = [], [], []
+    for machine_name, machine_id in ids.items():
+        machine_deletes, machine_updates, machine_inserts = diff_requirements(
+            existing[machine_id], [(requirement, value) for _, requirement, value in new_rows[machine_name]]
+        )
+        deletes.extend(machine_deletes)
+        updates.extend(machine_updates)
+        inserts.extend((machine_id, requirement, value) for requirement, value in machine_inserts)
+
+    if deletes:
+        connection.execute(delete(table).where(table.c.id.in_(deletes)))
+    update_values(connection, updates)
+    if inserts:
+        bulk_load(connection, table, LOAD_COLUMNS, with_requirement_ids(connection, with_parsed(inserts)))
+    if deletes or updates or inserts:
+        # Спецификации пересобираются только у станков, требования которых изменились
+        changed = {machine_id for machine_id, _, _ in inserts}
+        changed.update(existing_machine[row_id] for row_id in deletes)
+        changed.update(existing_machine[row_id] for row_id, _ in updates)
+        refresh_specs(connection, changed)
+    return len(inserts), len(updates), len(deletes)
+
+
+def record_import(
+    connection: Connection, csv_dir: str, imported: Iterable[Tuple[str, Optional[str], int, Optional[str]]]
+) -> None:
+    """
+    Записывает в манифест файлы полного импорта, чтобы следующая синхронизация начиналась с них.
+
+    Args:
+        connection (Connection): Соединение SQLAlchemy в открытой транзакции
+        csv_dir (str): Папка с CSV
+        imported (Iterable[Tuple[str, Optional[str], int, Optional[str]]]): Загруженные файлы требований
+            (имя файла, имя станка, количество строк, кодировка), например ImportReport.imported
+    """
+    states, machine_names, rows, encodings = [], {}, {}, {}
+    main_csv = os.path.join(csv_dir, MACHINES_CSV)
+    if os.path.exists(main_csv):
+        states.append(FileState(main_csv))
+        rows[MACHINES_CSV] = connection.execute(select(func.count()).select_from(Machine.__table__)).scalar()
+    for filename, machine_name, count, encoding in imported:
+        states.append(FileState(os.path.join(csv_dir, filename)))
+        machine_names[filename] = machine_name
+        rows[filename] = count
+        encodings[filename] = encoding
+    write_manifest(connection, states, machine_names, rows, encodings)
+
+
+def sync_from_csv(connection: Connection, csv_dir: Optional[str] = None, workers: Optional[int] = None) -> SyncReport:
+    """
+    Инкрементальная синхронизация БД с папкой CSV по манифесту хешей.
+
+    Разбираются только новые и измененные файлы, к БД применяется построчная разница, поэтому
+    стоимость пропорциональна изменениям. Требования затронутого станка собираются из всех его текущих файлов:
+    у станка, все файлы которого удалены, требования удаляются.
+    Файлы станков, которых нет в БД, пропускаются и не попадают в манифест.
+
+    Args:
+        connection (Connection): Соединение SQLAlchemy в открытой транзакции
+        csv_dir (str, optional): Папка с CSV. По умолчанию ресурсы пакета
+        workers (int, optional): Количество процессов разбора файлов. По умолчанию количество ядер
+
+    Returns:
+        SyncReport: Счетчики изменений и время стадий
+    """
+    csv_dir = csv_dir or get_csv_dir()
+    workers = workers or os.cpu_count() or 1
+    report = SyncReport()
+
+    start = perf_counter()
+    manifest = read_manifest(connection)
+    changed, touched, removed = find_changes(csv_dir, manifest)
+    requirement_paths = list_requirement_files(csv_dir)
+    report.files = len(requirement_paths) + int(os.path.exists(os.path.join(csv_dir, MACHINES_CSV)))
+    report.unchanged = report.files - len(changed)
+    report.changed = [state.filename for state in changed]
+    report.removed = removed
+    report.stages["сравнение с манифестом"] = perf_counter() - start
+
+    # Файлы с прежним содержимым сохраняют свои записи манифеста, меняется только состояние файла
+    recorded = list(touched)
+    machine_names = {state.filename: manifest[state.filename].machine_name for state in touched}
+    rows = {state.filename: manifest[state.filename].rows for state in touched}
+    encodings = {state.filename: manifest[state.filename].encoding for state in touched}
+
+    stage = perf_counter()
+    requirement_files = []
+    for state in changed:
+        if state.filename == MACHINES_CSV:
+            report.machines_inserted, report.machines_updated = sync_machines(connection, state.path)
+            rows[MACHINES_CSV] = connection.execute(select(func.count()).select_from(Machine.__table__)).scalar()
+            recorded.append(state)
+        else:
+            requirement_files.append(state)
+    report.stages["станки"] = perf_counter() - stage
+
+    stage = perf_counter()
+    machine_ids: Dict[str, int] = dict(connection.execute(select(Machine.name, Machine.id)).all())
+    # Станок может быть описан несколькими файлами, поэтому строки затронутых станков (новых, измененных
+    # и удаленных файлов) собираются из всех их текущих файлов, включая неизмененные
+    affected = {manifest[filename].machine_name for filename in removed}
+    affected.update(manifest[state.filename].machine_name for state in requirement_files if state.filename in manifest)
+    parsed_by_file: Dict[str, ParsedFile] = {}
+    # Кодировка из манифеста проверяется вслед за UTF-8, поэтому измененный файл обычно разбирается без chardet
+    hints = [manifest[state.filename].encoding if state.filename in manifest else None for state in requirement_files]
+    parsed_files = parse_files([state.path for state in requirement_files], workers, hints)
+    for state, parsed in zip(requirement_files, parsed_files):
+        if parsed.machine_name not in machine_ids:
+            print(f"Станок {parsed.machine_name} не найден, пропускаю.")
+            print(parsed.filename)
+            report.skipped.append(parsed.filename)
+            continue
+        affected.add(parsed.machine_name)
+        parsed_by_file[state.filename] = parsed
+        machine_names[state.filename] = parsed.machine_name
+        rows[state.filename] = len(parsed.rows)
+        encodings[state.filename] = parsed.encoding
+        recorded.append(state)
+    affected.discard(None)
+
+    changed_files = {state.filename for state in requirement_files}
+    unchanged_paths = [
+        path
+        for path in requirement_paths
+        if os.path.basename(path) not in changed_files
+        and os.path.basename(path) in manifest
+        and manifest[os.path.basename(path)].machine_name in affected
+    ]
+    hints = [manifest[os.path.basename(path)].encoding for path in unchanged_paths]
+    for parsed in parse_files(unchanged_paths, workers, hints):
+        parsed_by_file[parsed.filename] = parsed
+
+    # Строки станка идут в порядке его файлов, как при полном импорте. Станок без файлов остается без требований
+    new_rows: Dict[str, List[RequirementRow]] = {machine_name: [] for machine_name in affected}
+    for path in requirement_paths:
+        parsed = parsed_by_file.get(os.path.basename(path))
+        if parsed is not None and parsed.machine_name in new_rows:
+            new_rows[parsed.machine_name].extend(parsed.rows)
+    report.stages["разбор"] = perf_counter() - stage
+
+    stage = perf_counter()
+    if new_rows:
+        counts = sync_requirements(connection, new_rows, machine_ids)
+        report.requirements_inserted, report.requirements_updated, report.requirements_deleted = counts
+
+    if removed:
+        table = ImportManifest.__table__
+        connection.execute(delete(table).where(table.c.filename.in_(removed)))
+    write_manifest(connection, recorded, machine_names, rows, encodings)
+    if report.machines_inserted or report.machines_updated or new_rows:
+        # Данные изменились, закэшированные результаты поиска устарели
+        invalidate_caches()
+    report.stages["запись"] = perf_counter() - stage
+    report.stages["всего"] = perf_counter() - start
+    return report
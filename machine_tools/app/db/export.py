@@ -0,0 +1,288 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import gzip
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime
+from time import perf_counter
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy import Column, Table, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from machine_tools.app.db.bulk_loader import copy_line, supports_copy
+from machine_tools.app.db.session_manager import session_manager
+from machine_tools.app.models import Base, Machine, RequirementName, TechnicalRequirement
+
+# Форматы выгрузки
+EXPORT_FORMATS = ("csv", "jsonl")
+
+# Методы выгрузки: COPY TO STDOUT (PostgreSQL с psycopg2, только CSV) или серверный курсор
+EXPORT_METHODS = ("auto", "copy", "cursor")
+
+# Таблицы резервной копии и порядок строк в них
+EXPORT_TABLES: Dict[str, Sequence[str]] = {
+    Machine.__tablename__: ("id",),
+    RequirementName.__tablename__: ("id",),
+    TechnicalRequirement.__tablename__: ("machine_id", "id"),
+}
+
+# Колонки, которые не выгружаются: они собираются из других таблиц при восстановлении
+# или заново по запросу (представления MachineInfo)
+DERIVED_COLUMNS: Dict[str, Sequence[str]] = {
+    Machine.__tablename__: ("spec", "info", "info_updated_at"),
+}
+
+# Количество строк, которое серверный курсор передает за один раз
+EXPORT_BATCH_SIZE = 10_000
+
+
+class ExportStats:
+    """Результат выгрузки таблицы в файл"""
+
+    def __init__(self, table: str, path: str, rows: int, seconds: float, method: str):
+        self.table = table
+        self.path = path
+        self.rows = rows
+        self.seconds = seconds
+        self.method = method
+
+    def __repr__(self) -> str:
+        return (
+            f"ExportStats(table={self.table!r}, path={self.path!r}, rows={self.rows}, "
+            f"seconds={self.seconds:.3f}, method={self.method!r})"
+        )
+
+    def __str__(self) -> str:
+        return f"{self.table}: {self.rows} строк за {self.seconds:.2f} с ({self.method}) -> {self.path}"
+
+
+def get_backup_dir() -> str:
+    """Путь к папке резервных копий database_backups в корне проекта"""
+    base_dir = os.path.dirname(__file__)
+    return os.path.abspath(os.path.join(base_dir, "..", "..", "..", "database_backups"))
+
+
+def export_path(output_dir: str, table: str, fmt: str = "csv", compress: bool = False) -> str:
+    """Путь к файлу выгрузки таблицы, например database_backups/machine_tools.csv.gz"""
+    return os.path.join(output_dir, f"{table}.{fmt}" + (".gz" if compress else ""))
+
+
+def _open_output(path: str, fmt: str, compress: bool) -> IO[str]:
+    """Текстовый файл выгрузки. CSV пишется с BOM, чтобы кириллицу без настроек открывал Excel"""
+    encoding = "utf-8-sig" if fmt == "csv" else "utf-8"
+    if compress:
+        return gzip.open(path, "wt", encoding=encoding, newline="")
+    return open(path, "w", encoding=encoding, newline="")
+
+
+def _json_value(value: Any) -> Any:
+    """Значение для JSON: даты - в ISO 8601"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def export_columns(table: Table) -> List[Column]:
+    """Выгружаемые колонки таблицы в порядке модели (без DERIVED_COLUMNS)"""
+    derived = DERIVED_COLUMNS.get(table.name, ())
+    return [column for column in table.columns if column.name not in derived]
+
+
+def _copy_table(connection: Connection, table: Table, order_by: Sequence[str], output: IO[str]) -> int:
+    """Выгрузка через COPY (SELECT ...) TO STDOUT: строки формирует сервер, драйвер пишет их сразу в файл"""
+    preparer = connection.dialect.identifier_preparer
+    columns = ", ".join(preparer.quote(column.name) for column in export_columns(table))
+    order = ", ".join(preparer.quote(column) for column in order_by)
+    sql = (
+        f"COPY (SELECT {columns} FROM {preparer.format_table(table)} ORDER BY {order}) "
+        "TO STDOUT WITH (FORMAT csv, HEADER)"
+    )
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(sql, output)
+        return cursor.rowcount
+    finally:
+        cursor.close()
+
+
+def _cursor_table(
+    connection: Connection, table: Table, order_by: Sequence[str], output: IO[str], fmt: str, batch_size: int
+) -> int:
+    """Выгрузка через серверный курсор: в памяти одновременно не больше batch_size строк"""
+    selected = export_columns(table)
+    columns = [column.name for column in selected]
+    query = select(*selected).order_by(*(table.c[column] for column in order_by))
+    result = connection.execution_options(stream_results=True, yield_per=batch_size).execute(query)
+
+    if fmt == "csv":
+        output.write(",".join(columns) + "\n")
+    rows = 0
+    for partition in result.partitions():
+        if fmt == "csv":
+            output.writelines(map(copy_line, partition))
+        else:
+            output.writelines(
+                json.dumps(dict(zip(columns, map(_json_value, row))), ensure_ascii=False) + "\n" for row in partition
+            )
+        rows += len(partition)
+    return rows
+
+
+def export_table(
+    engine: Engine,
+    table: str,
+    output_dir: str,
+    fmt: str = "csv",
+    compress: bool = False,
+    method: str = "auto",
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> ExportStats:
+    """
+    Потоковая выгрузка таблицы в файл CSV или JSON Lines, при необходимости сжатый gzip.
+
+    Строки не собираются в памяти: COPY TO STDOUT передает их драйверу потоком, а серверный курсор -
+    порциями по batch_size. Файл пишется во временный и заменяется целиком, поэтому прерванная
+    выгрузка не портит предыдущую резервную копию.
+
+    Args:
+        engine (Engine): Движок SQLAlchemy
+        table (str): Имя таблицы из EXPORT_TABLES
+        output_dir (str): Папка выгрузки
+        fmt (str, optional): "csv" или "jsonl". По умолчанию "csv"
+        compress (bool, optional): Сжимать файл gzip. По умолчанию False
+        method (str, optional): "copy", "cursor" или "auto" - COPY для CSV в PostgreSQL с psycopg2,
+            иначе серверный курсор. По умолчанию "auto"
+        batch_size (int, optional): Размер порции серверного курсора. По умолчанию 10000
+
+    Returns:
+        ExportStats: Путь к файлу, количество строк и время выгрузки
+
+    Raises:
+        ValueError: Если таблица, формат или метод не поддерживаются
+    """
+    _check_arguments(table, fmt, method)
+    with engine.connect() as connection:
+        return _export_table(connection, table, output_dir, fmt, compress, method, batch_size)
+
+
+def _check_arguments(table: str, fmt: str, method: str) -> None:
+    """Проверка таблицы, формата и метода выгрузки (см. export_table)"""
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Недопустимая таблица: {table}. Допустимые значения: {list(EXPORT_TABLES)}")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Недопустимый формат: {fmt}. Допустимые значения: {EXPORT_FORMATS}")
+    if method not in EXPORT_METHODS:
+        raise ValueError(f"Недопустимый метод выгрузки: {method}. Допустимые значения: {EXPORT_METHODS}")
+
+
+def _export_table(
+    connection: Connection, table: str, output_dir: str, fmt: str, compress: bool, method: str, batch_size: int
+) -> ExportStats:
+    """Выгрузка таблицы в соединении и его текущей транзакции. Аргументы уже проверены (см. export_table)"""
+    os.makedirs(output_dir, exist_ok=True)
+    path = export_path(output_dir, table, fmt, compress)
+    tmp_path = path + ".tmp"
+    sql_table = Base.metadata.tables[table]
+    order_by = EXPORT_TABLES[table]
+
+    start = perf_counter()
+    if method == "auto":
+        method = "copy" if fmt == "csv" and supports_copy(connection) else "cursor"
+    elif method == "copy" and (fmt != "csv" or not supports_copy(connection)):
+        raise ValueError(
+            f"COPY поддерживается только для CSV в PostgreSQL с psycopg2: {fmt}, "
+            f"{connection.dialect.name}+{connection.dialect.driver}"
+        )
+
+    try:
+        with _open_output(tmp_path, fmt, compress) as output:
+            if method == "copy":
+                rows = _copy_table(connection, sql_table, order_by, output)
+            else:
+                rows = _cursor_table(connection, sql_table, order_by, output, fmt, batch_size)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return ExportStats(table, path, rows, perf_counter() - start, method)
+
+
+@contextmanager
+def _repeatable_read(engine: Engine, snapshot: Optional[str] = None) -> Iterator[Connection]:
+    """Соединение PostgreSQL в транзакции REPEATABLE READ. Если задан снимок, транзакция читает его"""
+    with engine.connect() as connection:
+        connection.execution_options(isolation_level="REPEATABLE READ")
+        with connection.begin():
+            if snapshot is not None:
+                # Идентификатор снимка формирует сервер (pg_export_snapshot), параметры команда не принимает
+                connection.exec_driver_sql(f"SET TRANSACTION SNAPSHOT '{snapshot}'")
+            yield connection
+
+
+def export_tables(
+    engine: Optional[Engine] = None,
+    output_dir: Optional[str] = None,
+    tables: Optional[Sequence[str]] = None,
+    fmt: str = "csv",
+    compress: bool = False,
+    method: str = "auto",
+    workers: Optional[int] = None,
+) -> List[ExportStats]:
+    """
+    Выгружает таблицы в одном согласованном снимке данных.
+
+    В PostgreSQL основное соединение открывает транзакцию REPEATABLE READ и экспортирует ее снимок
+    (pg_export_snapshot), а таблицы выгружаются одновременно в соединениях, транзакции которых читают
+    этот снимок (SET TRANSACTION SNAPSHOT). Поэтому требования не ссылаются на станки, записанные после
+    выгрузки таблицы станков. Другие СУБД не экспортируют снимки: таблицы выгружаются по очереди
+    в одной транзакции соединения.
+
+    Args:
+        engine (Engine, optional): Движок SQLAlchemy. По умолчанию движок session_manager
+        output_dir (str, optional): Папка выгрузки. По умолчанию database_backups
+        tables (Sequence[str], optional): Таблицы. По умолчанию все таблицы EXPORT_TABLES
+        fmt (str, optional): "csv" или "jsonl". По умолчанию "csv"
+        compress (bool, optional): Сжимать файлы gzip. По умолчанию False
+        method (str, optional): Метод выгрузки (см. export_table). По умолчанию "auto"
+        workers (int, optional): Количество одновременных выгрузок в PostgreSQL. По умолчанию по количеству таблиц
+
+    Returns:
+        List[ExportStats]: Результаты в порядке таблиц
+
+    Raises:
+        ValueError: Если таблица, формат или метод не поддерживаются
+    """
+    engine = engine or session_manager.engine
+    output_dir = output_dir or get_backup_dir()
+    tables = list(tables or EXPORT_TABLES)
+    for table in tables:
+        _check_arguments(table, fmt, method)
+    workers = workers or len(tables)
+
+    if engine.dialect.name != "postgresql":
+        with engine.connect() as connection, connection.begin():
+            return [
+                _export_table(connection, table, output_dir, fmt, compress, method, EXPORT_BATCH_SIZE)
+                for table in tables
+            ]
+
+    with _repeatable_read(engine) as connection:
+        if workers == 1 or len(tables) == 1:
+            return [
+                _export_table(connection, table, output_dir, fmt, compress, method, EXPORT_BATCH_SIZE)
+                for table in tables
+            ]
+        # Снимок действует, пока открыта транзакция основного соединения
+        snapshot = connection.execute(text("SELECT pg_export_snapshot()")).scalar()
+
+        def export_in_snapshot(table: str) -> ExportStats:
+            with _repeatable_read(engine, snapshot) as worker:
+                return _export_table(worker, table, output_dir, fmt, compress, method, EXPORT_BATCH_SIZE)
+
+        # Выгрузка ждет сервер и диск, а не интерпретатор, поэтому достаточно потоков
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(export_in_snapshot, tables))
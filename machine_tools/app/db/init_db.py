@@ -3,12 +3,15 @@
 # ---------------------------------------------------------------------------------------------------------------------
 import os
 import sys
+from typing import Optional
 
-import chardet
-import pandas as pd
 import psycopg2
+from sqlalchemy import select
 
 from machine_tools.app.config import get_settings
+from machine_tools.app.db.csv_sync import MACHINES_CSV, get_csv_dir, load_machines, record_import, sync_from_csv
+from machine_tools.app.db.migrations import stamp_head
+from machine_tools.app.db.requirements_importer import import_requirements
 from machine_tools.app.db.session_manager import session_manager
 from machine_tools.app.models import Base, Machine, TechnicalRequirement
 
@@ -70,26 +73,15 @@ def create_database():
         return False
 
 
-def safe_int(val):
-    try:
-        if pd.isna(val) or val is None:
-            return None
-        return int(float(val))
-    except (ValueError, TypeError):
-        return None
-
-
-def safe_float(val):
-    try:
-        if pd.isna(val) or val is None:
-            return None
-        return float(val)
-    except (ValueError, TypeError):
-        return None
-
+def init_db_from_csv(workers: Optional[int] = None, incremental: bool = False):
+    """
+    Инициализирует базу данных и импортирует данные.
 
-def init_db_from_csv():
-    """Инициализирует базу данных и импортирует данные"""
+    Args:
+        workers (int, optional): Количество процессов разбора файлов требований. По умолчанию количество ядер
+        incremental (bool, optional): Синхронизировать уже заполненную БД с CSV по манифесту хешей
+            (см. sync_from_csv), а не пропускать импорт. По умолчанию False
+    """
     # Проверяем сервер
     if not check_postgres_server():
         sys.exit(1)
@@ -104,109 +96,58 @@ def init_db_from_csv():
         Base.metadata.create_all(session_manager.engine)
         print("Таблицы созданы успешно!")
 
-        # Путь к папке с CSV
-        base_dir = os.path.dirname(__file__)
-        csv_dir = os.path.join(base_dir, "..", "resources", "tables_csv")
-        csv_dir = os.path.abspath(csv_dir)
+        with session_manager.engine.begin() as connection:
+            # Схема моделей совпадает с последней ревизией: отметка нужна, чтобы alembic upgrade head
+            # не применял к ней миграции повторно
+            if stamp_head(connection):
+                print("Схема отмечена последней ревизией Alembic.")
 
-        # Используем SessionManager для получения сессии
-        with session_manager.get_db() as session:
             # Проверяем только технические требования
-            if not session.query(TechnicalRequirement).first():
+            if connection.execute(select(TechnicalRequirement.id).limit(1)).first() is None:
                 # Импорт основной таблицы
-                main_csv = os.path.join(csv_dir, "machine_tools.csv")
+                main_csv = os.path.join(get_csv_dir(), MACHINES_CSV)
                 if os.path.exists(main_csv):
                     print("Импортирую данные из machine_tools.csv...")
-                    df = pd.read_csv(main_csv)
-                    for _, row in df.iterrows():
-                        machine = Machine(
-                            name=str(row["name"]),
-                            group=safe_float(row["group"]),
-                            type=safe_float(row["type"]),
-                            power=safe_float(row["power"]),
-                            efficiency=str(row["efficiency"]),
-                            accuracy=str(row["accuracy"]),
-                            automation=str(row["automation"]),
-                            specialization=str(row["specialization"]),
-                            weight=safe_float(row["weight"]),
-                            weight_class=str(row["weight_class"]),
-                            length=safe_int(row["length"]),
-                            width=safe_int(row["width"]),
-                            height=safe_int(row["height"]),
-                            overall_diameter=str(row["overall_diameter"]),
-                            city=str(row["city"]),
-                            manufacturer=str(row["manufacturer"]),
-                            machine_type=str(row["machine_type"]),
-                        )
-                        session.add(machine)
-                    session.commit()
-                    print(f"Загружено {len(df)} записей из machine_tools.csv")
+                    print(load_machines(connection, main_csv))
                 else:
                     print("ОШИБКА: Файл machine_tools.csv не найден!")
+            elif incremental:
+                print("Синхронизирую БД с CSV по манифесту импорта...")
+                print(sync_from_csv(connection, workers=workers))
             else:
                 print("Технические требования уже импортированы, инициализация не требуется.")
 
         print("Инициализация БД завершена успешно!")
 
         # Импортируем технические требования
-        import_technical_requirements()
+        import_technical_requirements(workers=workers)
 
     except Exception as e:
         print(f"ОШИБКА при инициализации БД: {str(e)}")
         sys.exit(1)
 
 
-def import_technical_requirements():
-    """Импортирует технические требования из CSV файлов"""
-    base_dir = os.path.dirname(__file__)
-    csv_dir = os.path.join(base_dir, "..", "resources", "tables_csv")
-    csv_dir = os.path.abspath(csv_dir)
+def import_technical_requirements(workers: Optional[int] = None):
+    """
+    Импортирует технические требования из CSV файлов.
 
-    # Используем SessionManager для получения сессии
-    with session_manager.get_db() as session:
+    Args:
+        workers (int, optional): Количество процессов разбора файлов. По умолчанию количество ядер
+    """
+    with session_manager.engine.begin() as connection:
         # Проверка, есть ли уже данные
-        if session.query(TechnicalRequirement).first():
+        if connection.execute(select(TechnicalRequirement.id).limit(1)).first() is not None:
             print("Технические требования уже импортированы, пропускаю.")
             return
 
         print(f"Импортирую технические характеристики")
-        # Импорт всех CSV-файлов с требованиями
-        for filename in os.listdir(csv_dir):
-            if filename.endswith(".csv") and filename != "machine_tools.csv":
-                # Определяем кодировку файла
-                file_path = os.path.join(csv_dir, filename)
-                with open(file_path, "rb") as file:
-                    raw_data = file.read()
-                    result = chardet.detect(raw_data)
-                    encoding = result["encoding"]
-
-                # Читаем CSV с определенной кодировкой
-                df = pd.read_csv(file_path, encoding=encoding)
-
-                # Получаем имя станка из последнего столбца
-                machine_name = df.columns[-1]
-
-                # Проверяем, существует ли станок
-                machine = session.query(Machine).filter(Machine.name == machine_name).first()
-                if not machine:
-                    print(f"Станок {machine_name} не найден, пропускаю.")
-                    print(filename)
-                    continue
-
-                # Импортируем каждое требование
-                for _, row in df.iterrows():
-                    requirement = str(row["Наименование параметра"])
-                    value = str(row[machine_name]) if not pd.isna(row[machine_name]) else None
-
-                    if requirement and requirement.strip():  # Пропускаем пустые строки
-                        req = TechnicalRequirement(
-                            machine_name=machine_name,
-                            requirement=requirement,
-                            value=value,
-                        )
-                        session.add(req)
-
-                session.commit()
+        # ID станков по именам загружаются одним запросом, а не запросом на каждый файл
+        machine_ids = dict(connection.execute(select(Machine.name, Machine.id)).all())
+        csv_dir = get_csv_dir()
+        report = import_requirements(connection, csv_dir, machine_ids, workers=workers)
+        print(report)
+        # Манифест позволяет следующему запуску с --incremental загрузить только измененные файлы
+        record_import(connection, csv_dir, report.imported)
 
     print("Импорт технических требований завершён.")
 
@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Готовые MachineInfo станков: кэш процесса и сохраненные в БД представления.
+
+Запись MachineInfo действительна, пока у станка прежний updated_at: любой путь записи станка
+(ORM, QueryBuilder.update, синхронизация CSV, пересборка спецификаций) сдвигает updated_at, и запись
+перестает совпадать без явного сброса. Представления хранятся в колонке machine_tools.info вместе
+с updated_at, для которого они собраны (machine_tools.info_updated_at), и заполняются refresh_infos().
+"""
+from collections import OrderedDict
+from datetime import datetime
+from threading import RLock
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, bindparam, or_, select, update
+from sqlalchemy.engine import Connection
+
+from machine_tools.app.models import Machine
+from machine_tools.app.schemas.machine import MachineInfo
+
+# Количество станков, представления которых собираются за один запрос
+INFO_BATCH_SIZE = 1_000
+
+
+class MachineInfoCache:
+    """
+    Кэш MachineInfo станков с ключом (id, updated_at) и вытеснением LRU.
+
+    На каждый станок хранится одна запись: представление, собранное для другого updated_at, считается
+    промахом и заменяется новым. Если у строки станка есть сохраненное представление для ее updated_at
+    (колонка info), при промахе оно читается из JSON без сборки словаря. Станки без id или updated_at
+    не кэшируются. Кэш потокобезопасен и отдает общие экземпляры MachineInfo - изменять их нельзя.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        """
+        Инициализация кэша.
+
+        Args:
+            maxsize (int, optional): Максимальное количество станков. По умолчанию 4096
+        """
+        if maxsize <= 0:
+            raise ValueError(f"Размер кэша должен быть положительным: {maxsize}")
+        self.maxsize = maxsize
+        self._data: "OrderedDict[int, Tuple[datetime, MachineInfo]]" = OrderedDict()
+        self._lock = RLock()
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, machine: Any) -> Optional[MachineInfo]:
+        """
+        Получает MachineInfo станка для его текущего updated_at.
+
+        Args:
+            machine (Any): Станок (ORM-объект, строка запроса или строка каталога)
+
+        Returns:
+            Optional[MachineInfo]: Представление станка или None, если его нужно собрать
+        """
+        machine_id = getattr(machine, "id", None)
+        stamp = getattr(machine, "updated_at", None)
+        if machine_id is None or stamp is None:
+            return None
+
+        with self._lock:
+            item = self._data.get(machine_id)
+            if item is not None and item[0] == stamp:
+                self._data.move_to_end(machine_id)
+                self.hits += 1
+                return item[1]
+            self.misses += 1
+
+        payload = getattr(machine, "info", None)
+        if payload is None or getattr(machine, "info_updated_at", None) != stamp:
+            return None
+        info = MachineInfo.model_validate_json(payload)
+        with self._lock:
+            self.loads += 1
+        self.set(machine, info)
+        return info
+
+    def set(self, machine: Any, info: MachineInfo) -> None:
+        """
+        Сохраняет MachineInfo станка для его текущего updated_at.
+
+        Args:
+            machine (Any): Станок, по которому собрано представление
+            info (MachineInfo): Представление станка
+        """
+        machine_id = getattr(machine, "id", None)
+        stamp = getattr(machine, "updated_at", None)
+        if machine_id is None or stamp is None:
+            return
+
+        with self._lock:
+            self._data[machine_id] = (stamp, info)
+            self._data.move_to_end(machine_id)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self) -> None:
+        """Удаляет все записи кэша"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Счетчики кэша для подбора размера.
+
+        Returns:
+            Dict[str, Any]: hits, misses, loads (прочитано сохраненных представлений), evictions, size, maxsize
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+
+def refresh_infos(
+    connection: Connection,
+    machine_ids: Optional[Iterable[int]] = None,
+    only_stale: bool = True,
+    batch_size: int = INFO_BATCH_SIZE,
+) -> int:
+    """
+    Сохраняет представления MachineInfo станков в колонку machine_tools.info.
+
+    Станки читаются порциями по batch_size в порядке id, представления записываются одним executemany
+    на порцию вместе с updated_at, для которого они собраны. Сам updated_at не меняется. Представление
+    станка, измененного во время сборки, не записывается: его updated_at уже не совпадает.
+
+    Args:
+        connection (Connection): Соединение SQLAlchemy в открытой транзакции
+        machine_ids (Iterable[int], optional): ID станков. По умолчанию все станки
+        only_stale (bool, optional): Только станки без представления для текущего updated_at. По умолчанию True
+        batch_size (int, optional): Количество станков в порции. По умолчанию 1000
+
+    Returns:
+        int: Количество станков, представления которых собраны
+    """
+    # Форматтеры используют кэш этого модуля
+    from machine_tools.app.formatters import machine_infos
+
+    machines = Machine.__table__
+    conditions = [machines.c.updated_at.is_not(None)]
+    if machine_ids is not None:
+        conditions.append(machines.c.id.in_(sorted(set(machine_ids))))
+    if only_stale:
+        conditions.append(
+            or_(machines.c.info_updated_at.is_(None), machines.c.info_updated_at != machines.c.updated_at)
+        )
+    columns = [column for column in machines.columns if column.name not in ("info", "info_updated_at")]
+
+    statement = (
+        update(machines)
+        .where(machines.c.id == bindparam("machine_id"), machines.c.updated_at == bindparam("stamp"))
+        .values(info=bindparam("new_info"), info_updated_at=bindparam("stamp"))
+        # Явное значение отменяет onupdate колонки
+        .values(updated_at=machines.c.updated_at)
+    )
+    written = 0
+    last_id = 0
+    while True:
+        query = select(*columns).where(and_(machines.c.id > last_id, *conditions)).order_by(machines.c.id)
+        rows: List[Any] = connection.execute(query.limit(batch_size)).all()
+        if not rows:
+            return written
+        last_id = rows[-1].id
+        infos = machine_infos(rows, trusted=True)
+        connection.execute(
+            statement,
+            [
+                {"machine_id": row.id, "stamp": row.updated_at, "new_info": info.model_dump_json()}
+                for row, info in zip(rows, infos)
+            ],
+        )
+        written += len(rows)
+
+
+# Общий кэш представлений. Включается передачей в форматтер: ListMachineInfoFormatter(cache=machine_info_cache)
+machine_info_cache = MachineInfoCache()
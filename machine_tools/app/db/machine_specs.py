@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Спецификация станка - колонка machine_tools.spec со словарем технических требований {параметр: значение}.
+
+Колонка дублирует строки technical_requirements, чтобы поиск читал требования вместе со станком без
+соединения и без сборки словаря из строк. Ее поддерживают все пути записи требований: импорт и
+синхронизация CSV, восстановление резервной копии, MachineUpdater (update_statements) и сброс
+сессии пакета (см. machine_tools.app.db.session). Ключи - наименования параметров
+в написании строк требований, при повторе наименования остается значение последней строки.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Boolean, and_, bindparam, exists, func, select, true, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.elements import ColumnElement
+
+from machine_tools.app.models import Machine, TechnicalRequirement
+
+# Количество станков, спецификации которых собираются за один запрос
+SPEC_BATCH_SIZE = 1_000
+
+
+def machine_spec(requirements: Iterable[Tuple[str, Optional[str]]]) -> Optional[Dict[str, Optional[str]]]:
+    """Спецификация из строк (параметр, значение) в порядке id. Станок без требований получает NULL"""
+    return dict(requirements) or None
+
+
+def refresh_specs(
+    connection: Connection,
+    machine_ids: Optional[Iterable[int]] = None,
+    batch_size: int = SPEC_BATCH_SIZE,
+    touch: bool = True,
+) -> int:
+    """
+    Пересобирает спецификации станков по строкам technical_requirements.
+
+    Строки требований читаются по индексу machine_id порциями по batch_size станков, спецификации
+    записываются одним executemany на порцию.
+
+    Args:
+        connection (Connection): Соединение SQLAlchemy в открытой транзакции
+        machine_ids (Iterable[int], optional): ID станков. По умолчанию все станки
+        batch_size (int, optional): Количество станков в порции. По умолчанию 1000
+        touch (bool, optional): Обновлять updated_at: требования станка изменились. По умолчанию True.
+            False - спецификации восстанавливаются для неизменных данных (например, из резервной копии)
+
+    Returns:
+        int: Количество станков, спецификации которых записаны
+    """
+    machines = Machine.__table__
+    requirements = TechnicalRequirement.__table__
+    if machine_ids is None:
+        ids: List[int] = connection.execute(select(machines.c.id).order_by(machines.c.id)).scalars().all()
+    else:
+        ids = sorted(set(machine_ids))
+
+    statement = update(machines).where(machines.c.id == bindparam("machine_id")).values(spec=bindparam("new_spec"))
+    if not touch:
+        # Явное значение отменяет onupdate колонки
+        statement = statement.values(updated_at=machines.c.updated_at)
+    for start in range(0, len(ids), batch_size):
+        chunk = ids[start : start + batch_size]
+        rows: Dict[int, List[Tuple[str, Optional[str]]]] = {machine_id: [] for machine_id in chunk}
+        query = (
+            select(requirements.c.machine_id, requirements.c.requirement, requirements.c.value)
+            .where(requirements.c.machine_id.in_(chunk))
+            .order_by(requirements.c.id)
+        )
+        for machine_id, requirement, value in connection.execute(query):
+            rows[machine_id].append((requirement, value))
+        connection.execute(
+            statement, [{"machine_id": machine_id, "new_spec": machine_spec(spec)} for machine_id, spec in rows.items()]
+        )
+    return len(ids)
+
+
+class SpecContains(ColumnElement):
+    """
+    Условие: спецификация станка содержит все пары {параметр: значение}.
+
+    В PostgreSQL компилируется в оператор @> над JSONB, который обслуживает GIN-индекс
+    ix_machine_tools_spec, в SQLite - в поиск пар через json_each, в остальных СУБД - в сравнения
+    значений по путям JSON. Выражение собирается при компиляции под диалект, поэтому кэширование
+    компиляции для него выключено.
+    """
+
+    type = Boolean()
+    inherit_cache = False
+
+    def __init__(self, column: Any, spec: Dict[str, str]):
+        self.column = column
+        self.spec = spec
+
+
+@compiles(SpecContains)
+def _compile_spec_contains(element: SpecContains, compiler: Any, **kw: Any) -> str:
+    """Сравнения значений по путям JSON"""
+    if not element.spec:
+        return compiler.process(true(), **kw)
+    conditions = [element.column[name].as_string() == value for name, value in element.spec.items()]
+    return compiler.process(and_(*conditions), **kw)
+
+
+@compiles(SpecContains, "sqlite")
+def _compile_spec_contains_sqlite(element: SpecContains, compiler: Any, **kw: Any) -> str:
+    """Поиск пар через json_each: пути json_extract не совпадают с ключами, сохраненными экранированием \\uXXXX"""
+    if not element.spec:
+        return compiler.process(true(), **kw)
+    conditions = []
+    for name, value in element.spec.items():
+        entries = func.json_each(element.column).table_valued("key", "value")
+        conditions.append(exists().where(entries.c.key == name, entries.c.value == value))
+    return compiler.process(and_(*conditions), **kw)
+
+
+@compiles(SpecContains, "postgresql")
+def _compile_spec_contains_postgresql(element: SpecContains, compiler: Any, **kw: Any) -> str:
+    """Оператор вхождения JSONB @>"""
+    spec = bindparam(None, element.spec, type_=Machine.__table__.c.spec.type)
+    return f"{compiler.process(element.column, **kw)} @> {compiler.process(spec, **kw)}"
+
+
+def spec_condition(spec: Dict[str, Any]) -> SpecContains:
+    """
+    Условие вхождения пар {параметр: значение} в спецификацию станка.
+
+    Значения сравниваются как строки, так же как они хранятся в technical_requirements.value.
+
+    Raises:
+        ValueError: Если значение параметра не задано
+    """
+    missing = [name for name, value in spec.items() if value is None]
+    if missing:
+        raise ValueError(f"Не заданы значения параметров: {missing}")
+    return SpecContains(Machine.spec, {name: str(value) for name, value in spec.items()})
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import os
+from typing import Optional
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy.engine import Connection
+
+
+def get_alembic_config(connection: Optional[Connection] = None) -> Config:
+    """
+    Конфигурация Alembic пакета, не зависящая от текущей папки.
+
+    Args:
+        connection (Connection, optional): Соединение, на котором выполнять команды вместо sqlalchemy.url
+
+    Returns:
+        Config: Конфигурация для команд alembic.command
+    """
+    base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    config = Config(os.path.join(base_dir, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(base_dir, "alembic"))
+    config.attributes["configure_logger"] = False
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+def current_revision(connection: Connection) -> Optional[str]:
+    """Ревизия схемы, отмеченная в alembic_version. None, если схема не отмечена"""
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+def stamp_head(connection: Connection) -> bool:
+    """
+    Отмечает схему, созданную Base.metadata.create_all, последней ревизией, если она еще не отмечена.
+
+    Схема моделей совпадает с результатом всей цепочки миграций, поэтому дальнейшие
+    "alembic upgrade head" применят только новые ревизии.
+
+    Args:
+        connection (Connection): Соединение SQLAlchemy
+
+    Returns:
+        bool: True, если схема отмечена сейчас
+    """
+    if current_revision(connection) is not None:
+        return False
+    command.stamp(get_alembic_config(connection), "head")
+    return True
+
+
+def upgrade_head(connection: Connection) -> None:
+    """Применяет к БД все ревизии до последней"""
+    command.upgrade(get_alembic_config(connection), "head")
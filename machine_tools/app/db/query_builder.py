@@ -1,13 +1,74 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 # ---------------------------------------------------------------------------------------------------------------------
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
-from sqlalchemy import and_, asc, desc, select, update
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, asc, delete, desc, exists, func, insert, select, update
+from sqlalchemy.engine import Dialect, Result
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.sql.dml import Update
+from sqlalchemy.sql.expression import Executable
 from sqlalchemy.sql.selectable import Select
 
-from machine_tools.app.models import Machine, TechnicalRequirement
+from machine_tools.app.db.machine_specs import machine_spec, spec_condition
+from machine_tools.app.db.query_cache import invalidate_caches
+from machine_tools.app.models import Machine, RequirementName, TechnicalRequirement
+
+# Стратегии пакетной загрузки технических требований
+REQUIREMENTS_LOADING_STRATEGIES = {
+    "selectin": selectinload,
+    "joined": joinedload,
+}
+
+# Условия на значение технического требования. Числовые условия проверяются по границам разобранного значения
+# (для числа обе границы равны ему самому, для списка - наименьшее и наибольшее значения): ">=" и ">" означают,
+# что параметр станка достигает значения, "<=" и "<" - что опускается до него, "covers" - что значение входит
+# в диапазон параметра. "==" для числа сравнивает value_number, для строки - исходное значение value
+NUMERIC_REQUIREMENT_CONDITIONS = {
+    "==": lambda requirements, value: requirements.value_number == value,
+    ">": lambda requirements, value: requirements.value_max > value,
+    ">=": lambda requirements, value: requirements.value_max >= value,
+    "<": lambda requirements, value: requirements.value_min < value,
+    "<=": lambda requirements, value: requirements.value_min <= value,
+    "covers": lambda requirements, value: (requirements.value_min <= value) & (requirements.value_max >= value),
+}
+TEXT_REQUIREMENT_CONDITIONS = {
+    "==": lambda requirements, value: requirements.value == value,
+}
+
+
+def requirement_condition(requirements: Any, op: str, value: Union[float, str]) -> Any:
+    """
+    Условие на значение технического требования.
+
+    Условие строится операторами сравнения над колонками, поэтому одинаково работает для модели
+    TechnicalRequirement (выражение SQL) и для DataFrame требований каталога (булева Series).
+
+    Args:
+        requirements (Any): Модель TechnicalRequirement или DataFrame с ее колонками
+        op (str): Оператор (см. NUMERIC_REQUIREMENT_CONDITIONS и TEXT_REQUIREMENT_CONDITIONS)
+        value (Union[float, str]): Число или строка
+
+    Raises:
+        ValueError: Если оператор не поддерживается для типа значения
+    """
+    numeric = isinstance(value, (int, float)) and not isinstance(value, bool)
+    conditions = NUMERIC_REQUIREMENT_CONDITIONS if numeric else TEXT_REQUIREMENT_CONDITIONS
+    condition = conditions.get(op)
+    if condition is None:
+        raise ValueError(
+            f"Недопустимый оператор для значения {value!r}: {op}. Допустимые значения: {list(conditions)}"
+        )
+    return condition(requirements, value)
+
+
+def parsed_requirements(requirements: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Строки технических требований из словаря {параметр: значение} вместе с разбором значений"""
+    # Разбор значений тянет pandas, поэтому импортируется только при обновлении требований
+    from machine_tools.app.db.requirements_importer import REQUIREMENT_COLUMNS, with_parsed
+
+    rows = [(None, name, str(value) if value is not None else None) for name, value in requirements.items()]
+    return [dict(zip(REQUIREMENT_COLUMNS[1:], row[1:])) for row in with_parsed(rows)]
 
 
 class QueryBuilder:
@@ -22,6 +83,10 @@ class QueryBuilder:
         self._order_by = []
         self._limit = None
         self._offset = None
+        self._options = []
+        self._loading = None
+        self._unique = False
+        self._columns = None
 
     def reset_builder(self) -> "QueryBuilder":
         """Сброс всех фильтров и параметров запроса"""
@@ -30,6 +95,56 @@ class QueryBuilder:
         self._order_by = []
         self._limit = None
         self._offset = None
+        self._options = []
+        self._loading = None
+        self._unique = False
+        self._columns = None
+        return self
+
+    def select_columns(self, *columns: str) -> "QueryBuilder":
+        """Проекция запроса на указанные колонки
+
+        Вместо полных ORM-объектов Machine запрос возвращает легкие строки (Row)
+        с атрибутами по именам колонок, без гидратации и identity map.
+
+        Args:
+            *columns (str): Имена колонок Machine (например, "id", "name")
+
+        Raises:
+            ValueError: Если колонка не найдена в модели Machine
+        """
+        available = Machine.__table__.columns.keys()
+        unknown = [column for column in columns if column not in available]
+        if unknown:
+            raise ValueError(f"Недопустимые колонки: {unknown}. Допустимые значения: {available}")
+        self._columns = tuple(columns)
+        self._query = select(*(getattr(Machine, column) for column in columns))
+        return self
+
+    def load_technical_requirements(self, strategy: str = "selectin") -> "QueryBuilder":
+        """Пакетная загрузка технических требований вместе со станками
+
+        Без явной стратегии связь Machine.technical_requirements загружается лениво,
+        отдельным запросом на каждый станок (1 + N запросов).
+
+        Args:
+            strategy (str, optional): Стратегия загрузки. По умолчанию "selectin"
+                - "selectin": один дополнительный запрос `WHERE machine_id IN (...)` на весь результат
+                - "joined": LEFT OUTER JOIN в основном запросе
+
+        Raises:
+            ValueError: Если стратегия не поддерживается
+        """
+        loader = REQUIREMENTS_LOADING_STRATEGIES.get(strategy)
+        if loader is None:
+            raise ValueError(
+                f"Недопустимая стратегия загрузки: {strategy}. "
+                f"Допустимые значения: {list(REQUIREMENTS_LOADING_STRATEGIES)}"
+            )
+        self._options = [loader(Machine.technical_requirements)]
+        self._loading = strategy
+        # joinedload коллекции размножает строки станка, их нужно схлопнуть
+        self._unique = strategy == "joined"
         return self
 
     def filter_by_id(self, machine_id: int) -> "QueryBuilder":
@@ -145,6 +260,69 @@ class QueryBuilder:
                 self._filters.append(Machine.name.ilike(f"%{name}%"))
         return self
 
+    def filter_by_names(self, names: List[str], case_sensitive: bool = False) -> "QueryBuilder":
+        """Фильтр по списку имен станков (точное совпадение, один запрос IN)
+
+        Без учета регистра обе стороны сравнения приводятся к нижнему регистру функцией lower() БД,
+        поэтому результат совпадает с filter_by_name(name, exact_match=True) для каждого имени.
+
+        Args:
+            names (List[str]): Имена станков
+            case_sensitive (bool, optional): Учитывать регистр. По умолчанию False
+        """
+        if case_sensitive:
+            self._filters.append(Machine.name.in_(names))
+        else:
+            self._filters.append(func.lower(Machine.name).in_([func.lower(name) for name in names]))
+        return self
+
+    def filter_by_requirement(self, name: str, op: str, value: Union[float, str]) -> "QueryBuilder":
+        """Фильтр по значению технического требования
+
+        Условие компилируется в коррелированный EXISTS по technical_requirements: равенство ID наименования
+        и условие на value_min/value_max (value_number, value) проверяются по индексу
+        ix_technical_requirements_requirement_id_min_max, без загрузки требований станков. ID наименования
+        находится по словарю requirement_names, поэтому условие выполняется для всех написаний параметра.
+
+        Args:
+            name (str): Наименование параметра в любом написании (например, "Наибольший диаметр сверления, мм")
+            op (str): Оператор: "==", ">", ">=", "<", "<=", "covers" для числа, "==" для строки
+            value (Union[float, str]): Число или строка
+
+        Raises:
+            ValueError: Если оператор не поддерживается для типа значения
+        """
+        # Пакет разбора тянет pandas, поэтому импортируется только при фильтрации по требованиям
+        from machine_tools.app.parsers import requirement_key
+
+        condition = requirement_condition(TechnicalRequirement, op, value)
+        requirement_id = select(RequirementName.id).where(RequirementName.key == requirement_key(name))
+        self._filters.append(
+            exists().where(
+                TechnicalRequirement.machine_id == Machine.id,
+                TechnicalRequirement.requirement_id == requirement_id.scalar_subquery(),
+                condition,
+            )
+        )
+        return self
+
+    def filter_by_spec(self, spec: Dict[str, Any]) -> "QueryBuilder":
+        """Фильтр по вхождению пар {параметр: значение} в спецификацию станка
+
+        Условие проверяется по колонке machine_tools.spec без обращения к technical_requirements,
+        в PostgreSQL - оператором @> по GIN-индексу ix_machine_tools_spec. Наименования и значения
+        сравниваются точно, в написании строк требований.
+
+        Args:
+            spec (Dict[str, Any]): Параметры и значения (например, {"Конус шпинделя": "Морзе 4"}).
+                Значения сравниваются как строки
+
+        Raises:
+            ValueError: Если значение параметра не задано
+        """
+        self._filters.append(spec_condition(spec))
+        return self
+
     def order_by(self, column: str, descending: bool = False) -> "QueryBuilder":
         """Сортировка по колонке"""
         column_obj = getattr(Machine, column, None)
@@ -163,42 +341,149 @@ class QueryBuilder:
         return self
 
     def build(self) -> Select:
-        """Построение запроса"""
+        """Построение запроса. Состояние построителя не меняется, метод можно вызывать повторно"""
+        query = self._query
+
         # Применяем фильтры
         if self._filters:
-            self._query = self._query.where(and_(*self._filters))
+            query = query.where(and_(*self._filters))
+
+        # Применяем стратегию загрузки связей
+        if self._options:
+            query = query.options(*self._options)
 
         # Применяем сортировку
         if self._order_by:
-            self._query = self._query.order_by(*self._order_by)
+            query = query.order_by(*self._order_by)
 
         # Применяем лимит и смещение
         if self._limit is not None:
-            self._query = self._query.limit(self._limit)
+            query = query.limit(self._limit)
         if self._offset is not None:
-            self._query = self._query.offset(self._offset)
+            query = query.offset(self._offset)
 
-        return self._query
+        return query
 
-    def execute(self) -> Any:
-        """Выполнение запроса"""
+    def statement(self) -> Select:
+        """Итоговый запрос, который выполняет execute()"""
         query = self.build()
 
         # Если нет явной сортировки, сортируем по id
         if not self._order_by:
             query = query.order_by(Machine.id)
 
-        return self.session.execute(query).scalars().all()
+        return query
 
-    def update(self, update_data: Dict[str, Any]) -> int:
+    def cache_key(self, dialect: Optional[Dialect] = None) -> Tuple[Any, ...]:
         """
-        Обновление данных в БД.
+        Ключ результата запроса для кэша: скомпилированный SQL, связанные параметры и стратегия загрузки.
+
+        Args:
+            dialect (Dialect, optional): Диалект для компиляции запроса. По умолчанию диалект сессии
+
+        Returns:
+            Tuple[Any, ...]: Хешируемый ключ
+        """
+        compiled = self.statement().compile(dialect=dialect or self.session.get_bind().dialect)
+        return str(compiled), repr(sorted(compiled.params.items())), self._loading
+
+    def execute(self) -> Any:
+        """Выполнение запроса"""
+        return self._fetch(self.statement()).all()
+
+    def shape_result(self, result: Result) -> Any:
+        """
+        Приводит результат выполнения statement() к виду, который возвращает execute().
+
+        Нужен, когда запрос выполняет другой исполнитель, например AsyncSession.
+
+        Args:
+            result (Result): Результат выполнения запроса
+
+        Returns:
+            Any: Строки при проекции колонок, иначе ORM-объекты
+        """
+        if self._columns:
+            return result
+        if self._unique:
+            result = result.unique()
+        return result.scalars()
+
+    def _fetch(self, query: Select, **execution_options: Any) -> Any:
+        """Выполняет запрос и возвращает результат в виде строк или ORM-объектов"""
+        return self.shape_result(self.session.execute(query, execution_options=execution_options))
+
+    def _keyset_statement(self, last_id: Optional[int], size: int, offset: Optional[int]) -> Select:
+        """Запрос очередной порции для keyset-пагинации: `id > last_id ORDER BY id LIMIT size`"""
+        filters = list(self._filters)
+        if last_id is not None:
+            filters.append(Machine.id > last_id)
+
+        query = self._query
+        if filters:
+            query = query.where(and_(*filters))
+        if self._options:
+            query = query.options(*self._options)
+        query = query.order_by(Machine.id).limit(size)
+        if offset is not None:
+            query = query.offset(offset)
+        return query
+
+    def iter_batches(self, batch_size: int = 1000) -> Iterator[List[Any]]:
+        """
+        Выполнение запроса порциями без загрузки всего результата в память.
+
+        Без явной сортировки используется keyset-пагинация по id: каждая порция - отдельный запрос
+        `id > последний_id ORDER BY id LIMIT batch_size`, стоимость которого не растет с номером порции.
+        При явной сортировке результат читается серверным курсором (yield_per).
+        Лимит и смещение построителя применяются ко всему результату.
+
+        Args:
+            batch_size (int, optional): Размер порции. По умолчанию 1000
+
+        Yields:
+            List[Any]: Порция станков (ORM-объекты или строки при проекции колонок)
+
+        Raises:
+            ValueError: Если размер порции не положительный или при проекции не выбрана колонка id
+        """
+        if batch_size <= 0:
+            raise ValueError(f"Размер порции должен быть положительным: {batch_size}")
+
+        if self._order_by:
+            if self._unique:
+                raise ValueError("Стратегия загрузки joined несовместима с чтением серверным курсором")
+            yield from (list(batch) for batch in self._fetch(self.statement(), yield_per=batch_size).partitions())
+            return
+
+        if self._columns and "id" not in self._columns:
+            raise ValueError("Для keyset-пагинации проекция должна содержать колонку id")
+
+        last_id = None
+        offset = self._offset
+        remaining = self._limit
+        while remaining is None or remaining > 0:
+            size = batch_size if remaining is None else min(batch_size, remaining)
+            batch = self._fetch(self._keyset_statement(last_id, size, offset)).all()
+            if not batch:
+                return
+            yield batch
+            if len(batch) < size:
+                return
+            last_id = batch[-1].id
+            offset = None
+            if remaining is not None:
+                remaining -= len(batch)
+
+    def update_statements(self, update_data: Dict[str, Any]) -> Tuple[Update, List[Executable]]:
+        """
+        Запросы обновления: UPDATE станков и замена технических требований вместе со спецификацией станка.
 
         Args:
             update_data (Dict[str, Any]): Словарь с данными для обновления
 
         Returns:
-            int: Количество обновленных записей
+            Tuple[Update, List[Executable]]: Запрос UPDATE и запросы замены требований (могут отсутствовать)
         """
         # Создаем запрос на обновление
         stmt = update(Machine)
@@ -211,32 +496,62 @@ class QueryBuilder:
         # так как это relationship, а не поле
         processed_data = {k: v for k, v in update_data.items() if k != 'technical_requirements'}
 
+        # Если есть technical_requirements, обновляем их отдельно
+        requirement_statements = []
+        if 'technical_requirements' in update_data and update_data['technical_requirements']:
+            machine_name = processed_data.get('name')
+            if machine_name:
+                # ID станка подставляется подзапросом: запросы выполняются после UPDATE в той же транзакции
+                machine_id = select(Machine.id).where(Machine.name == machine_name).scalar_subquery()
+                # Удаляем старые требования и добавляем новые
+                requirement_statements.append(
+                    delete(TechnicalRequirement).where(TechnicalRequirement.machine_id == machine_id)
+                )
+                # Словарь наименований импортирует парсеры, поэтому импортируется только при обновлении требований
+                from machine_tools.app.db.requirement_names import add_names_statement, requirement_id_query
+
+                rows = parsed_requirements(update_data['technical_requirements'])
+                # Новые наименования попадают в словарь до вставки, ID наименования подставляется подзапросом
+                requirement_statements.append(add_names_statement(row["requirement"] for row in rows))
+                requirement_statements.append(
+                    insert(TechnicalRequirement).values(
+                        [
+                            dict(machine_id=machine_id, requirement_id=requirement_id_query(row["requirement"]), **row)
+                            for row in rows
+                        ]
+                    )
+                )
+                # Спецификация станка записывается тем же UPDATE, что и остальные колонки
+                processed_data['spec'] = machine_spec((row["requirement"], row["value"]) for row in rows)
+
         # Применяем данные для обновления
         stmt = stmt.values(**processed_data)
 
+        return stmt, requirement_statements
+
+    def update(self, update_data: Dict[str, Any]) -> int:
+        """
+        Обновление данных в БД.
+
+        Args:
+            update_data (Dict[str, Any]): Словарь с данными для обновления
+
+        Returns:
+            int: Количество обновленных записей
+        """
+        stmt, requirement_statements = self.update_statements(update_data)
+
         # Выполняем обновление
         result = self.session.execute(stmt)
         self.session.commit()
 
-        # Если есть technical_requirements, обновляем их отдельно
-        if 'technical_requirements' in update_data and update_data['technical_requirements']:
-            machine_name = processed_data.get('name')
-            if machine_name:
-                # Удаляем старые требования
-                self.session.query(TechnicalRequirement).filter(
-                    TechnicalRequirement.machine_name == machine_name
-                ).delete()
-
-                # Добавляем новые требования
-                for req_name, req_value in update_data['technical_requirements'].items():
-                    requirement = TechnicalRequirement(
-                        machine_name=machine_name,
-                        requirement=req_name,
-                        value=str(req_value) if req_value is not None else None,
-                    )
-                    self.session.add(requirement)
-                self.session.commit()
+        if requirement_statements:
+            for requirement_statement in requirement_statements:
+                self.session.execute(requirement_statement)
+            self.session.commit()
 
+        # Данные изменились, закэшированные результаты поиска устарели
+        invalidate_caches()
         return result.rowcount
 
     def get_unique_values(self, column: str) -> Any:
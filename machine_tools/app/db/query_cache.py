@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+from collections import OrderedDict
+from threading import RLock
+from time import monotonic
+from typing import Any, Dict, Hashable, Optional, Tuple
+from weakref import WeakSet
+
+# Все созданные кэши, чтобы запись в БД могла сбросить их разом
+_caches: "WeakSet[QueryCache]" = WeakSet()
+
+
+class QueryCache:
+    """
+    Кэш результатов запросов с вытеснением LRU и временем жизни записей (TTL).
+
+    Ключ записи формирует вызывающий код (например, MachineFinder: SQL запроса, параметры и тип форматтера).
+    Кэш потокобезопасен. Все кэши процесса сбрасываются функцией invalidate_caches(), которую вызывают
+    пути записи пакета: QueryBuilder.update() (а значит и MachineUpdater), bulk_load(), import_requirements(),
+    sync_from_csv() и restore_backup(). Каждый сброс увеличивает поколение кэша: результат запроса, начатого
+    до сброса, не сохраняется (см. set). Изменения БД из других процессов кэш не видит, их задержку ограничивает TTL.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 300.0):
+        """
+        Инициализация кэша.
+
+        Args:
+            maxsize (int, optional): Максимальное количество записей. По умолчанию 1024
+            ttl (float, optional): Время жизни записи в секундах. None - без ограничения. По умолчанию 300
+        """
+        if maxsize <= 0:
+            raise ValueError(f"Размер кэша должен быть положительным: {maxsize}")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.generation = 0
+        _caches.add(self)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Получает значение из кэша.
+
+        Args:
+            key (Hashable): Ключ записи
+
+        Returns:
+            Tuple[bool, Any]: (найдено ли значение, значение или None)
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return False, None
+
+            expires_at, value = item
+            if expires_at < monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """
+        Сохраняет значение в кэш, вытесняя самые давно использованные записи при переполнении.
+
+        Args:
+            key (Hashable): Ключ записи
+            value (Any): Значение
+            generation (int, optional): Поколение кэша, прочитанное до выполнения запроса. Если с тех пор
+                кэш сбрасывался, значение могло устареть и не сохраняется. По умолчанию без проверки
+        """
+        expires_at = monotonic() + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self) -> None:
+        """Удаляет все записи кэша и начинает новое поколение"""
+        with self._lock:
+            self._data.clear()
+            self.generation += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Счетчики кэша для подбора размера и TTL.
+
+        Returns:
+            Dict[str, Any]: hits, misses, evictions, expirations, size, maxsize, ttl
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
+
+
+def invalidate_caches() -> None:
+    """Сбрасывает все кэши запросов процесса"""
+    for cache in list(_caches):
+        cache.invalidate()
+
+
+# Общий кэш для поисковиков. Включается передачей в MachineFinder(cache=query_cache)
+query_cache = QueryCache()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+from typing import Dict, Iterable
+
+from sqlalchemy import exists, insert, literal, select, union_all
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql.dml import Insert
+from sqlalchemy.sql.selectable import ScalarSelect
+
+from machine_tools.app.models import RequirementName
+from machine_tools.app.parsers import requirement_key
+
+
+def _insert_missing(connection: Connection, rows: Dict[str, str]) -> None:
+    """Добавляет наименования в словарь. Ключи, добавленные параллельной транзакцией, пропускаются"""
+    table = RequirementName.__table__
+    values = [{"key": key, "name": name} for key, name in rows.items()]
+    if connection.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif connection.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        connection.execute(insert(table), values)
+        return
+    connection.execute(dialect_insert(table).on_conflict_do_nothing(index_elements=["key"]), values)
+
+
+def requirement_ids(connection: Connection, names: Iterable[str]) -> Dict[str, int]:
+    """
+    ID наименований параметров по словарю requirement_names.
+
+    Наименования сводятся по ключу (requirement_key), поэтому разные написания одного параметра получают
+    один ID. Отсутствующие ключи добавляются в словарь, основным написанием становится первое наименование
+    с этим ключом.
+
+    Args:
+        connection (Connection): Соединение SQLAlchemy в открытой транзакции
+        names (Iterable[str]): Наименования параметров (повторы допускаются)
+
+    Returns:
+        Dict[str, int]: ID по каждому переданному наименованию
+    """
+    keys: Dict[str, str] = {}
+    for name in names:
+        if name not in keys:
+            keys[name] = requirement_key(name)
+    if not keys:
+        return {}
+
+    table = RequirementName.__table__
+    wanted = set(keys.values())
+    query = select(table.c.key, table.c.id).where(table.c.key.in_(wanted))
+    ids = dict(connection.execute(query).all())
+    missing: Dict[str, str] = {}
+    for name, key in keys.items():
+        if key not in ids:
+            missing.setdefault(key, name)
+    if missing:
+        _insert_missing(connection, missing)
+        ids.update(connection.execute(select(table.c.key, table.c.id).where(table.c.key.in_(missing))).all())
+    return {name: ids[key] for name, key in keys.items()}
+
+
+def add_names_statement(names: Iterable[str]) -> Insert:
+    """
+    Запрос, добавляющий в словарь requirement_names ключи наименований, которых в нем нет.
+
+    В отличие от requirement_ids() не выполняет запросов сам: нужен, когда запросы выполняет другой
+    исполнитель (например, AsyncSession), вместе с requirement_id_query() в значениях вставки требований.
+
+    Args:
+        names (Iterable[str]): Наименования параметров (хотя бы одно)
+
+    Returns:
+        Insert: INSERT ... SELECT по всем ключам, которых нет в словаре
+    """
+    table = RequirementName.__table__
+    keys: Dict[str, str] = {}
+    for name in names:
+        keys.setdefault(requirement_key(name), name)
+    selects = [
+        select(literal(key).label("key"), literal(name).label("name")).where(~exists().where(table.c.key == key))
+        for key, name in keys.items()
+    ]
+    return insert(table).from_select(["key", "name"], union_all(*selects) if len(selects) > 1 else selects[0])
+
+
+def requirement_id_query(name: str) -> ScalarSelect:
+    """Подзапрос ID наименования по его ключу в словаре requirement_names"""
+    table = RequirementName.__table__
+    return select(table.c.id).where(table.c.key == requirement_key(name)).scalar_subquery()
@@ -0,0 +1,384 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import codecs
+import hashlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import chardet
+import pandas as pd
+from sqlalchemy import bindparam, inspect, select, update
+from sqlalchemy.engine import Connection
+
+from machine_tools.app.db.bulk_loader import LoadStats, bulk_load, frame_to_rows
+from machine_tools.app.db.machine_specs import refresh_specs
+from machine_tools.app.db.query_cache import invalidate_caches
+from machine_tools.app.db.requirement_names import requirement_ids
+from machine_tools.app.models import ImportManifest, TechnicalRequirement
+from machine_tools.app.parsers import PARSED_COLUMNS, parse_requirements, parse_values
+
+# Колонки technical_requirements, которые заполняет импорт
+REQUIREMENT_COLUMNS = ("machine_id", "requirement", "value") + PARSED_COLUMNS
+
+# Колонки, которые загружает массовая вставка: REQUIREMENT_COLUMNS и ID наименования в словаре
+LOAD_COLUMNS = REQUIREMENT_COLUMNS + ("requirement_id",)
+
+# Строка требования: (имя станка, наименование параметра, значение)
+RequirementRow = Tuple[str, str, Optional[str]]
+
+
+def with_machine_id(machine_id: int, rows: List[RequirementRow]) -> List[Tuple[int, str, Optional[str]]]:
+    """Строки требований (ID станка, параметр, значение): имя станка заменяется его ID"""
+    return [(machine_id, requirement, value) for _, requirement, value in rows]
+
+
+def with_parsed(rows: List[Tuple[int, str, Optional[str]]]) -> List[Tuple[Any, ...]]:
+    """Строки (ID станка, параметр, значение), дополненные разбором значений, в порядке REQUIREMENT_COLUMNS"""
+    frame = pd.DataFrame(rows, columns=REQUIREMENT_COLUMNS[:3])
+    frame = pd.concat([frame, parse_requirements(frame["requirement"], frame["value"])], axis=1)
+    return frame_to_rows(frame, TechnicalRequirement.__table__, REQUIREMENT_COLUMNS)
+
+
+def with_requirement_ids(connection: Connection, rows: List[Tuple[Any, ...]]) -> List[Tuple[Any, ...]]:
+    """
+    Строки в порядке REQUIREMENT_COLUMNS, дополненные ID наименований, в порядке LOAD_COLUMNS.
+
+    Наименования сводятся по ключу в словарь requirement_names одним запросом на порцию,
+    новые наименования добавляются в словарь.
+    """
+    ids = requirement_ids(connection, (row[1] for row in rows))
+    return [row + (ids[row[1]],) for row in rows]
+
+
+def update_values(connection: Connection, updates: List[Tuple[int, Optional[str]]]) -> None:
+    """
+    Записывает новые значения требований вместе с результатом их разбора одним executemany.
+
+    Наименование параметра не меняется, поэтому единица измерения остается прежней.
+
+    Args:
+        connection (Connection): Соединение SQLAlchemy
+        updates (List[Tuple[int, Optional[str]]]): Пары (id требования, новое значение)
+    """
+    if not updates:
+        return
+    table = TechnicalRequirement.__table__
+    columns = ["value"] + [column for column in PARSED_COLUMNS if column != "unit"]
+    frame = pd.DataFrame(updates, columns=["id", "value"])
+    frame = pd.concat([frame, parse_values(frame["value"])], axis=1)
+    rows = frame_to_rows(frame, table, ["id"] + columns)
+    statement = (
+        update(table).where(table.c.id == bindparam("row_id")).values({column: bindparam(column) for column in columns})
+    )
+    connection.execute(statement, [dict(zip(["row_id"] + columns, row)) for row in rows])
+
+
+def reparse_requirements(connection: Connection, only_missing: bool = False, batch_size: int = 50_000) -> int:
+    """
+    Заново разбирает значения уже загруженных требований, например после изменения правил разбора.
+
+    Строки читаются порциями по возрастанию id, поэтому память не зависит от размера таблицы.
+
+    Args:
+        connection (Connection): Соединение SQLAlchemy в открытой транзакции
+        only_missing (bool, optional): Только строки без результата разбора. По умолчанию False
+        batch_size (int, optional): Размер порции в строках. По умолчанию 50000
+
+    Returns:
+        int: Количество разобранных строк
+    """
+    table = TechnicalRequirement.__table__
+    columns = ["row_id"] + list(PARSED_COLUMNS)
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("row_id"))
+        .values({column: bindparam(column) for column in PARSED_COLUMNS})
+    )
+    count, last_id = 0, None
+    while True:
+        query = select(table.c.id, table.c.requirement, table.c.value).order_by(table.c.id).limit(batch_size)
+        if only_missing:
+            query = query.where(table.c.parse_status.is_(None))
+        if last_id is not None:
+            query = query.where(table.c.id > last_id)
+        frame = pd.DataFrame(connection.execute(query).all(), columns=["id", "requirement", "value"])
+        if frame.empty:
+            return count
+        frame = pd.concat([frame, parse_requirements(frame["requirement"], frame["value"])], axis=1)
+        rows = frame_to_rows(frame, table, ["id"] + list(PARSED_COLUMNS))
+        connection.execute(statement, [dict(zip(columns, row)) for row in rows])
+        count += len(rows)
+        last_id = rows[-1][0]
+
+
+# Сколько байт начала файла анализирует chardet, если файл не в UTF-8
+DETECT_PREFIX_SIZE = 64 * 1024
+
+# Кодировка, если chardet не смог ее определить (ресурсы пакета - русскоязычные таблицы)
+FALLBACK_ENCODING = "cp1251"
+
+
+class ParsedFile:
+    """Результат разбора CSV-файла требований одного станка"""
+
+    __slots__ = ("filename", "machine_name", "rows", "encoding")
+
+    def __init__(self, filename: str, machine_name: Optional[str], rows: List[RequirementRow], encoding: str):
+        self.filename = filename
+        self.machine_name = machine_name
+        self.rows = rows
+        self.encoding = encoding
+
+
+class ImportReport:
+    """Итог импорта требований: счетчики и время стадий"""
+
+    def __init__(self):
+        self.files = 0
+        self.skipped: List[str] = []
+        self.rows = 0
+        # Загруженные файлы: (имя файла, имя станка, количество строк, кодировка) - для манифеста импорта
+        self.imported: List[Tuple[str, str, int, str]] = []
+        self.workers = 1
+        self.stages: Dict[str, float] = {}
+        self.loads: List[LoadStats] = []
+
+    def __str__(self) -> str:
+        lines = [f"Файлов: {self.files}, пропущено: {len(self.skipped)}, строк: {self.rows}, процессов: {self.workers}"]
+        lines.extend(f"  {stage}: {seconds:.2f} с" for stage, seconds in self.stages.items())
+        return "\n".join(lines)
+
+
+def _decode(raw_data: bytes, encoding: str) -> Optional[str]:
+    """Строгое декодирование. None, если байты не соответствуют кодировке"""
+    try:
+        return raw_data.decode(encoding)
+    except (UnicodeDecodeError, LookupError):
+        return None
+
+
+def detect_encoding(raw_data: bytes, hint: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Определяет кодировку файла и декодирует его.
+
+    Сначала проверяются BOM и строгий UTF-8, затем подсказка (например, кодировка из манифеста импорта):
+    для файлов в UTF-8 и в ожидаемой кодировке chardet не вызывается. Подсказка проверяется после UTF-8,
+    потому что однобайтовые кодировки декодируют любые байты: устаревшая подсказка для файла, уже
+    перекодированного в UTF-8, дала бы искаженный текст. Иначе chardet анализирует только первые
+    DETECT_PREFIX_SIZE байт.
+
+    Args:
+        raw_data (bytes): Содержимое файла
+        hint (str, optional): Ожидаемая кодировка
+
+    Returns:
+        Tuple[str, str]: Кодировка и декодированный текст
+    """
+    if raw_data.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig", raw_data.decode("utf-8-sig")
+    for encoding in ("utf-8", hint):
+        if encoding:
+            text = _decode(raw_data, encoding)
+            if text is not None:
+                return encoding, text
+
+    encoding = chardet.detect(raw_data[:DETECT_PREFIX_SIZE])["encoding"] or FALLBACK_ENCODING
+    text = _decode(raw_data, encoding)
+    if text is None:
+        # Префикс мог не содержать символов, отличающих кодировку от похожей
+        encoding = chardet.detect(raw_data)["encoding"] or FALLBACK_ENCODING
+        text = raw_data.decode(encoding, errors="replace")
+    return encoding, text
+
+
+def parse_requirements_file(file_path: str, encoding: Optional[str] = None) -> ParsedFile:
+    """
+    Разбирает CSV-файл требований станка в строки (имя станка, параметр, значение).
+
+    Файл читается с диска один раз: кодировка определяется по байтам, которые затем и разбираются.
+    Имя станка берется из последнего столбца, строки с пустым наименованием параметра отбрасываются.
+    Функция выполняется в процессах пула, поэтому возвращает простые кортежи, а не DataFrame.
+
+    Args:
+        file_path (str): Путь к CSV-файлу
+        encoding (str, optional): Ожидаемая кодировка (см. detect_encoding)
+
+    Returns:
+        ParsedFile: Имя станка и строки требований
+    """
+    with open(file_path, "rb") as file:
+        raw_data = file.read()
+    encoding, text = detect_encoding(raw_data, encoding)
+
+    df = pd.read_csv(io.StringIO(text))
+    if df.empty and len(df.columns) < 2:
+        return ParsedFile(os.path.basename(file_path), None, [], encoding)
+
+    # Получаем имя станка из последнего столбца
+    machine_name = df.columns[-1]
+    requirements = df["Наименование параметра"]
+    values = df[machine_name]
+    mask = requirements.notna() & (requirements.astype(str).str.strip() != "")
+    requirements = requirements[mask].astype(str).tolist()
+    values = values[mask]
+    values = values.astype(object).where(values.isna(), values.astype(str))
+    values = values.where(values.notna(), None).tolist()
+    rows = [(machine_name, requirement, value) for requirement, value in zip(requirements, values)]
+    return ParsedFile(os.path.basename(file_path), machine_name, rows, encoding)
+
+
+def list_requirement_files(csv_dir: str) -> List[str]:
+    """Пути к CSV-файлам требований папки (все CSV, кроме machine_tools.csv), по алфавиту"""
+    return [
+        os.path.join(csv_dir, filename)
+        for filename in sorted(os.listdir(csv_dir))
+        if filename.endswith(".csv") and filename != "machine_tools.csv"
+    ]
+
+
+def parse_files(
+    paths: List[str], workers: int, encodings: Optional[List[Optional[str]]] = None
+) -> Iterator[ParsedFile]:
+    """Разбор файлов в пуле процессов. Результаты выдаются в порядке файлов по мере готовности"""
+    encodings = encodings or [None] * len(paths)
+    if workers <= 1:
+        yield from map(parse_requirements_file, paths, encodings)
+        return
+    # Порции по несколько файлов уменьшают накладные расходы на передачу задач между процессами
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(parse_requirements_file, paths, encodings, chunksize=chunksize)
+
+
+def normalize_encodings(csv_dir: str, connection: Optional[Connection] = None) -> List[Tuple[str, str]]:
+    """
+    Перекодирует CSV-файлы требований папки в UTF-8 без BOM.
+
+    После нормализации кодировка всех файлов определяется строгой проверкой UTF-8 без chardet.
+    Если передано соединение, записи манифеста импорта перекодированных файлов получают кодировку
+    UTF-8, а записи файлов, не менявшихся с импорта, - еще и хеш, размер и время изменения нового файла:
+    текст файла прежний, и следующая инкрементальная синхронизация его не разбирает.
+
+    Args:
+        csv_dir (str): Папка с CSV-файлами требований
+        connection (Connection, optional): Соединение SQLAlchemy в открытой транзакции для обновления манифеста
+
+    Returns:
+        List[Tuple[str, str]]: Перекодированные файлы: (имя файла, исходная кодировка)
+    """
+    converted = []
+    states: Dict[str, Dict[str, Any]] = {}
+    for path in list_requirement_files(csv_dir):
+        with open(path, "rb") as file:
+            raw_data = file.read()
+        encoding, text = detect_encoding(raw_data)
+        if encoding == "utf-8":
+            continue
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            file.write(text)
+        filename = os.path.basename(path)
+        converted.append((filename, encoding))
+        stat = os.stat(path)
+        states[filename] = {
+            "old_sha256": hashlib.sha256(raw_data).hexdigest(),
+            "sha256": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+
+    if connection is not None and states and inspect(connection).has_table(ImportManifest.__tablename__):
+        table = ImportManifest.__table__
+        rows = connection.execute(
+            select(table.c.filename, table.c.sha256).where(table.c.filename.in_(list(states)))
+        ).all()
+        for filename, sha256 in rows:
+            state = states[filename]
+            values: Dict[str, Any] = {"encoding": "utf-8"}
+            if sha256 == state["old_sha256"]:
+                values.update(sha256=state["sha256"], size=state["size"], mtime_ns=state["mtime_ns"])
+            connection.execute(update(table).where(table.c.filename == filename).values(**values))
+    return converted
+
+
+def import_requirements(
+    connection: Connection,
+    csv_dir: str,
+    machine_ids: Dict[str, int],
+    workers: Optional[int] = None,
+    batch_rows: int = 50_000,
+    method: str = "auto",
+) -> ImportReport:
+    """
+    Параллельный импорт технических требований из CSV-файлов.
+
+    Процессы пула определяют кодировку и разбирают файлы в строки, а единственный писатель в текущем
+    процессе находит id станков по заранее загруженному словарю, разбирает значения всей порции
+    (with_parsed), сводит наименования параметров в словарь requirement_names (with_requirement_ids)
+    и загружает строки через bulk_load() в транзакции соединения. Запись идет параллельно
+    с разбором оставшихся файлов. После загрузки пересобираются спецификации загруженных станков
+    (machine_tools.spec).
+
+    Args:
+        connection (Connection): Соединение SQLAlchemy в открытой транзакции
+        csv_dir (str): Папка с CSV-файлами требований
+        machine_ids (Dict[str, int]): ID станков в БД по именам. Файлы других станков пропускаются
+        workers (int, optional): Количество процессов. По умолчанию количество ядер, 1 - без пула
+        batch_rows (int, optional): Размер порции записи в строках. По умолчанию 50000
+        method (str, optional): Метод загрузки (см. bulk_load). По умолчанию "auto"
+
+    Returns:
+        ImportReport: Счетчики и время стадий: поиск файлов, разбор, запись, спецификации, всего
+    """
+    report = ImportReport()
+    report.workers = workers or os.cpu_count() or 1
+    table = TechnicalRequirement.__table__
+
+    start = perf_counter()
+    paths = list_requirement_files(csv_dir)
+    report.files = len(paths)
+    report.stages["поиск файлов"] = perf_counter() - start
+
+    write_seconds = 0.0
+    batch: List[Tuple[int, str, Optional[str]]] = []
+    imported_ids: Set[int] = set()
+
+    def flush() -> None:
+        nonlocal write_seconds, batch
+        if batch:
+            rows = with_requirement_ids(connection, with_parsed(batch))
+            stats = bulk_load(connection, table, LOAD_COLUMNS, rows, method=method)
+            report.loads.append(stats)
+            write_seconds += stats.seconds
+            batch = []
+
+    parse_start = perf_counter()
+    for parsed in parse_files(paths, report.workers):
+        if parsed.machine_name not in machine_ids:
+            print(f"Станок {parsed.machine_name} не найден, пропускаю.")
+            print(parsed.filename)
+            report.skipped.append(parsed.filename)
+            continue
+        imported_ids.add(machine_ids[parsed.machine_name])
+        batch.extend(with_machine_id(machine_ids[parsed.machine_name], parsed.rows))
+        report.rows += len(parsed.rows)
+        report.imported.append((parsed.filename, parsed.machine_name, len(parsed.rows), parsed.encoding))
+        if len(batch) >= batch_rows:
+            flush()
+    flush()
+
+    total = perf_counter() - parse_start
+    # Писатель работает в том же цикле, что и сбор результатов, поэтому его время вычитается из разбора
+    report.stages["разбор"] = total - write_seconds
+    report.stages["запись"] = write_seconds
+
+    stage = perf_counter()
+    refresh_specs(connection, imported_ids)
+    report.stages["спецификации"] = perf_counter() - stage
+    # Спецификации станков изменились, закэшированные результаты поиска устарели
+    invalidate_caches()
+    report.stages["всего"] = perf_counter() - start
+    return report
@@ -0,0 +1,495 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import csv
+import gzip
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from time import perf_counter
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import DateTime, Float, Integer, Table, delete, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from machine_tools.app.db.bulk_loader import EXECUTEMANY_CHUNK_SIZE, bulk_load, supports_copy
+from machine_tools.app.db.export import EXPORT_TABLES, export_path, get_backup_dir
+from machine_tools.app.db.machine_specs import refresh_specs
+from machine_tools.app.db.query_cache import invalidate_caches
+from machine_tools.app.db.requirement_names import requirement_ids
+from machine_tools.app.db.requirements_importer import reparse_requirements
+from machine_tools.app.db.session_manager import session_manager
+from machine_tools.app.models import (
+    Base,
+    ImportManifest,
+    Machine,
+    TechnicalRequirement,
+    technical_requirements_compat,
+)
+
+# Модуль контрольной суммы: сумма хешей строк не зависит от их порядка
+_CHECKSUM_MODULUS = 2**64
+
+# Колонка, по которой узнается копия прежнего формата, и описание, по которому она читается и проверяется
+LEGACY_SOURCES: Dict[str, Tuple[str, Table]] = {
+    TechnicalRequirement.__tablename__: ("machine_name", technical_requirements_compat),
+}
+
+
+class RestoreStats:
+    """Результат восстановления таблицы из файла"""
+
+    def __init__(self, table: str, path: str, rows: int, seconds: float, method: str):
+        self.table = table
+        self.path = path
+        self.rows = rows
+        self.seconds = seconds
+        self.method = method
+        self.checksum: Optional[int] = None
+
+    def __str__(self) -> str:
+        checksum = f", контрольная сумма {self.checksum:016x}" if self.checksum is not None else ""
+        return f"{self.table}: {self.rows} строк за {self.seconds:.2f} с ({self.method}{checksum}) <- {self.path}"
+
+
+class RestoreReport:
+    """Итог восстановления: результаты таблиц, пропущенные таблицы и время стадий"""
+
+    def __init__(self):
+        self.tables: List[RestoreStats] = []
+        self.stages: Dict[str, float] = {}
+        self.skipped: List[str] = []
+
+    def __str__(self) -> str:
+        lines = [str(stats) for stats in self.tables]
+        lines.extend(f"{table}: пропущена (нет файла резервной копии)" for table in self.skipped)
+        lines.extend(f"  {stage}: {seconds:.2f} с" for stage, seconds in self.stages.items())
+        return "\n".join(lines)
+
+
+def find_backup_file(backup_dir: str, table: str) -> str:
+    """
+    Файл резервной копии таблицы: <таблица>.csv или <таблица>.csv.gz.
+
+    Raises:
+        ValueError: Если файла нет
+    """
+    for compress in (False, True):
+        path = export_path(backup_dir, table, "csv", compress)
+        if os.path.exists(path):
+            return path
+    raise ValueError(f"В папке {backup_dir} нет резервной копии таблицы {table} (.csv или .csv.gz)")
+
+
+def _backup_exists(backup_dir: str, table: str) -> bool:
+    """Есть ли в папке файл резервной копии таблицы (см. find_backup_file)"""
+    return any(os.path.exists(export_path(backup_dir, table, "csv", compress)) for compress in (False, True))
+
+
+def _open_backup(path: str) -> IO[str]:
+    """Текстовый файл резервной копии. BOM, который пишет выгрузка, пропускается"""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8-sig", newline="")
+    return open(path, "r", encoding="utf-8-sig", newline="")
+
+
+def _read_header(file: IO[str], table: Table) -> List[str]:
+    """Колонки из заголовка файла. Файл остается на первой строке данных"""
+    columns = next(csv.reader([file.readline()]))
+    unknown = [column for column in columns if column not in table.columns]
+    if unknown:
+        raise ValueError(f"Колонки {unknown} файла резервной копии отсутствуют в таблице {table.name}")
+    return columns
+
+
+def parse_value(table: Table, column: str, value: str) -> Any:
+    """
+    Значение поля CSV в типе колонки таблицы.
+
+    Пустое поле становится NULL: модуль csv не отличает пустую строку в кавычках от поля без значения.
+    """
+    if value == "":
+        return None
+    column_type = table.columns[column].type
+    if isinstance(column_type, Integer):
+        try:
+            return int(value)
+        except ValueError:
+            return int(float(value))
+    if isinstance(column_type, Float):
+        return float(value)
+    if isinstance(column_type, DateTime):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def _read_rows(path: str, table: Table) -> Tuple[List[str], Iterator[Tuple[Any, ...]]]:
+    """Колонки и типизированные строки файла резервной копии"""
+    file = _open_backup(path)
+    columns = _read_header(file, table)
+
+    def rows() -> Iterator[Tuple[Any, ...]]:
+        with file:
+            for record in csv.reader(file):
+                yield tuple(parse_value(table, column, value) for column, value in zip(columns, record))
+
+    return columns, rows()
+
+
+def _row_hash(row: Sequence[Any]) -> int:
+    """Хеш строки по каноническому представлению значений: одинаковый для файла и БД"""
+    parts = []
+    for value in row:
+        if value is None or value == "":
+            parts.append("")
+        elif isinstance(value, float):
+            parts.append(repr(value))
+        elif isinstance(value, datetime):
+            parts.append(value.isoformat())
+        else:
+            parts.append(str(value))
+    digest = hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def checksum(rows: Iterator[Sequence[Any]]) -> Tuple[int, int]:
+    """
+    Контрольная сумма строк, не зависящая от их порядка.
+
+    Args:
+        rows (Iterator[Sequence[Any]]): Строки
+
+    Returns:
+        Tuple[int, int]: Количество строк и сумма хешей строк по модулю 2^64
+    """
+    count, total = 0, 0
+    for row in rows:
+        count += 1
+        total = (total + _row_hash(row)) % _CHECKSUM_MODULUS
+    return count, total
+
+
+def file_checksum(path: str, table: Table) -> Tuple[int, int]:
+    """Количество строк и контрольная сумма файла резервной копии"""
+    return checksum(_read_rows(path, table)[1])
+
+
+def table_checksum(connection: Connection, table: Table, columns: Sequence[str]) -> Tuple[int, int]:
+    """Количество строк и контрольная сумма таблицы. Строки читаются серверным курсором порциями"""
+    query = select(*(table.c[column] for column in columns))
+    result = connection.execution_options(stream_results=True, yield_per=EXECUTEMANY_CHUNK_SIZE).execute(query)
+    return checksum(row for partition in result.partitions() for row in partition)
+
+
+def _drop_postgres_constraints(connection: Connection, tables: Sequence[Table]) -> List[str]:
+    """
+    Удаляет внешние ключи и индексы таблиц, не обслуживающие ограничения, PostgreSQL.
+
+    Возвращает SQL для их пересоздания: внешние ключи в конце, после индексов.
+    """
+    preparer = connection.dialect.identifier_preparer
+    foreign_keys: Dict[str, str] = {}
+    indexes: Dict[str, str] = {}
+    for table in tables:
+        rows = connection.execute(
+            text(
+                "SELECT conname, conrelid::regclass::text, pg_get_constraintdef(oid) FROM pg_constraint "
+                "WHERE contype = 'f' AND (conrelid = CAST(:table AS regclass) OR confrelid = CAST(:table AS regclass))"
+            ),
+            {"table": table.name},
+        )
+        for name, relation, definition in rows:
+            foreign_keys[f"ALTER TABLE {relation} DROP CONSTRAINT {preparer.quote(name)}"] = (
+                f"ALTER TABLE {relation} ADD CONSTRAINT {preparer.quote(name)} {definition}"
+            )
+
+        # Индексы первичного ключа и уникальных ограничений остаются: на них опираются внешние ключи
+        rows = connection.execute(
+            text(
+                "SELECT i.indexrelid::regclass::text, pg_get_indexdef(i.indexrelid) FROM pg_index i "
+                "WHERE i.indrelid = CAST(:table AS regclass) "
+                "AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)"
+            ),
+            {"table": table.name},
+        )
+        for name, definition in rows:
+            indexes[f"DROP INDEX {name}"] = definition
+
+    for statement in list(foreign_keys) + list(indexes):
+        connection.execute(text(statement))
+    return list(indexes.values()) + list(foreign_keys.values())
+
+
+def _copy_file(connection: Connection, table: Table, path: str) -> int:
+    """Загрузка файла через COPY FROM STDIN: файл читается драйвером потоком"""
+    preparer = connection.dialect.identifier_preparer
+    with _open_backup(path) as file:
+        columns = _read_header(file, table)
+        column_list = ", ".join(preparer.quote(column) for column in columns)
+        sql = f"COPY {preparer.format_table(table)} ({column_list}) FROM STDIN WITH (FORMAT csv)"
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(sql, file)
+            return cursor.rowcount
+        finally:
+            cursor.close()
+
+
+def _insert_rows(
+    connection: Connection, table: Table, columns: Sequence[str], rows: Iterator[Tuple[Any, ...]], method: str
+) -> int:
+    """Загрузка строк порциями через bulk_load()"""
+    count = 0
+    batch: List[Tuple[Any, ...]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= EXECUTEMANY_CHUNK_SIZE:
+            count += bulk_load(connection, table, columns, batch, method=method).rows
+            batch = []
+    count += bulk_load(connection, table, columns, batch, method=method).rows
+    return count
+
+
+def _insert_file(connection: Connection, table: Table, path: str) -> int:
+    """Загрузка файла порциями через bulk_load() для СУБД без COPY"""
+    columns, rows = _read_rows(path, table)
+    return _insert_rows(connection, table, columns, rows, "executemany")
+
+
+def _source_table(table: Table, path: str) -> Table:
+    """Описание, по которому читается и проверяется файл: для копий прежнего формата - представление"""
+    legacy = LEGACY_SOURCES.get(table.name)
+    if legacy is None:
+        return table
+    column, view = legacy
+    with _open_backup(path) as file:
+        header = next(csv.reader([file.readline()]))
+    return view if column in header else table
+
+
+def _derived_columns(table: Table, source: Table, path: str) -> List[str]:
+    """
+    Колонки требований, которых нет в копии прежнего формата и которые находятся при загрузке.
+
+    machine_id находится по machine_name, requirement_id - по наименованию параметра.
+    """
+    if table.name != TechnicalRequirement.__tablename__:
+        return []
+    with _open_backup(path) as file:
+        header = _read_header(file, source)
+    derived = ["machine_id"] if "machine_name" in header else []
+    if "requirement_id" not in header:
+        derived.append("requirement_id")
+    return derived
+
+
+def _load_converted(
+    connection: Connection, table: Table, source: Table, path: str, derived: List[str], method: str
+) -> int:
+    """
+    Загрузка требований из копии прежнего формата (см. _derived_columns).
+
+    Имя станка заменяется его ID по уже восстановленной таблице станков, наименования параметров
+    сводятся в словарь requirement_names по порции строк за раз.
+
+    Raises:
+        ValueError: Если станка требования нет в таблице станков
+    """
+    machines = Base.metadata.tables[Machine.__tablename__]
+    columns, rows = _read_rows(path, source)
+    kept = [i for i, column in enumerate(columns) if column in table.columns and column not in derived]
+    machine_ids: Dict[str, int] = {}
+    if "machine_id" in derived:
+        machine_ids = dict(connection.execute(select(machines.c.name, machines.c.id)).all())
+        machine_name = columns.index("machine_name")
+    requirement = columns.index("requirement")
+
+    def converted(batch: List[Tuple[Any, ...]]) -> Iterator[Tuple[Any, ...]]:
+        ids = requirement_ids(connection, (row[requirement] for row in batch)) if "requirement_id" in derived else {}
+        for row in batch:
+            values = tuple(row[i] for i in kept)
+            if "machine_id" in derived:
+                if row[machine_name] not in machine_ids:
+                    raise ValueError(
+                        f"Станок {row[machine_name]} из {os.path.basename(path)} отсутствует в {machines.name}"
+                    )
+                values += (machine_ids[row[machine_name]],)
+            if "requirement_id" in derived:
+                values += (ids[row[requirement]],)
+            yield values
+
+    def batches() -> Iterator[Tuple[Any, ...]]:
+        batch: List[Tuple[Any, ...]] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= EXECUTEMANY_CHUNK_SIZE:
+                yield from converted(batch)
+                batch = []
+        yield from converted(batch)
+
+    return _insert_rows(connection, table, [columns[i] for i in kept] + derived, batches(), method)
+
+
+def _parse_missing_values(connection: Connection, table: Table, source: Table, path: str) -> None:
+    """Разбирает значения требований, если копия сделана до появления колонок разбора"""
+    if table.name != TechnicalRequirement.__tablename__:
+        return
+    with _open_backup(path) as file:
+        if "parse_status" in _read_header(file, source):
+            return
+    reparse_requirements(connection, only_missing=True)
+
+
+def _reset_sequences(connection: Connection, tables: Sequence[Table]) -> None:
+    """Продолжает последовательности первичных ключей PostgreSQL после максимального восстановленного id"""
+    preparer = connection.dialect.identifier_preparer
+    for table in tables:
+        if "id" not in table.columns:
+            continue
+        connection.execute(
+            text(
+                "SELECT setval(pg_get_serial_sequence(:table, 'id'), COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) "
+                f"FROM {preparer.format_table(table)}"
+            ),
+            {"table": table.name},
+        )
+
+
+def restore_backup(
+    engine: Optional[Engine] = None,
+    backup_dir: Optional[str] = None,
+    tables: Optional[Sequence[str]] = None,
+    verify: bool = True,
+) -> RestoreReport:
+    """
+    Восстанавливает таблицы из резервной копии (например, созданной командой export) в одной транзакции.
+
+    В PostgreSQL с psycopg2 таблицы очищаются TRUNCATE, внешние ключи и индексы, не обслуживающие
+    ограничения, удаляются, файлы загружаются через COPY, после чего индексы строятся, а внешние ключи
+    проверяются один раз на всех строках вместо проверки каждой вставки. Затем продолжаются
+    последовательности id и обновляется статистика планировщика. Для других СУБД строки загружаются
+    через bulk_load(), а индексы модели удаляются и создаются заново.
+
+    При проверке количество строк и контрольная сумма каждой таблицы сравниваются с файлом.
+    Любая ошибка, включая расхождение, откатывает транзакцию, и прежние данные остаются на месте.
+    Манифест импорта CSV очищается: восстановленные данные могут не совпадать с ресурсами пакета.
+    Требования из копий прежнего формата (с machine_name вместо machine_id) связываются со станками по имени
+    и сверяются с представлением technical_requirements_compat. Значения из копий без колонок разбора
+    разбираются после загрузки, наименования из копий без requirement_id сводятся в словарь requirement_names.
+    Спецификации станков (machine_tools.spec) в копию не входят и собираются заново. Сохраненные представления
+    MachineInfo (machine_tools.info) в копию тоже не входят, их заполняет refresh_infos().
+
+    Args:
+        engine (Engine, optional): Движок SQLAlchemy. По умолчанию движок session_manager
+        backup_dir (str, optional): Папка резервной копии. По умолчанию database_backups
+        tables (Sequence[str], optional): Таблицы. По умолчанию таблицы EXPORT_TABLES, файлы которых есть
+            в папке, остальные пропускаются
+        verify (bool, optional): Сверять количество строк и контрольные суммы. По умолчанию True
+
+    Returns:
+        RestoreReport: Результаты таблиц, пропущенные таблицы и время стадий
+
+    Raises:
+        ValueError: Если нет файла явно указанной таблицы или ни одного файла, в файле неизвестные колонки
+            или проверка не прошла
+    """
+    engine = engine or session_manager.engine
+    backup_dir = backup_dir or get_backup_dir()
+    # Родительские таблицы загружаются раньше дочерних
+    names = [name for name in EXPORT_TABLES if tables is None or name in tables]
+    report = RestoreReport()
+    if tables is None:
+        # Без явного списка восстанавливаются таблицы, файлы которых есть в папке, остальные пропускаются
+        report.skipped = [name for name in names if not _backup_exists(backup_dir, name)]
+        names = [name for name in names if name not in report.skipped]
+        if not names:
+            raise ValueError(f"В папке {backup_dir} нет резервных копий таблиц {', '.join(EXPORT_TABLES)}")
+    sql_tables = [Base.metadata.tables[name] for name in names]
+    paths = [find_backup_file(backup_dir, name) for name in names]
+    sources = [_source_table(table, path) for table, path in zip(sql_tables, paths)]
+
+    # Контрольные суммы файлов считаются в потоках одновременно с загрузкой
+    with ThreadPoolExecutor(max_workers=len(names) or 1) as executor:
+        file_checksums = [
+            executor.submit(file_checksum, path, source) if verify else None for path, source in zip(paths, sources)
+        ]
+
+        start = perf_counter()
+        with engine.begin() as connection:
+            use_copy = supports_copy(connection)
+            # Таблицы создаются, даже если не восстанавливаются: на словарь наименований ссылаются требования,
+            # а требования читаются при сборке спецификаций станков
+            created = [Base.metadata.tables[name] for name in EXPORT_TABLES]
+            Base.metadata.create_all(connection, tables=created + [ImportManifest.__table__])
+
+            stage = perf_counter()
+            if use_copy:
+                recreate = _drop_postgres_constraints(connection, sql_tables)
+                # При wal_level=minimal TRUNCATE в той же транзакции, что и COPY, избавляет загрузку от записи в WAL
+                table_list = ", ".join(connection.dialect.identifier_preparer.format_table(t) for t in sql_tables)
+                connection.execute(text(f"TRUNCATE {table_list}"))
+            else:
+                for table in reversed(sql_tables):
+                    connection.execute(delete(table))
+                for table in sql_tables:
+                    for index in table.indexes:
+                        index.drop(connection, checkfirst=True)
+            connection.execute(delete(ImportManifest.__table__))
+            report.stages["подготовка"] = perf_counter() - stage
+
+            stage = perf_counter()
+            for table, source, path in zip(sql_tables, sources, paths):
+                table_start = perf_counter()
+                method = "copy" if use_copy else "executemany"
+                derived = _derived_columns(table, source, path)
+                if derived:
+                    rows = _load_converted(connection, table, source, path, derived, method)
+                elif use_copy:
+                    rows = _copy_file(connection, table, path)
+                else:
+                    rows = _insert_file(connection, table, path)
+                _parse_missing_values(connection, table, source, path)
+                report.tables.append(RestoreStats(table.name, path, rows, perf_counter() - table_start, method))
+            report.stages["загрузка"] = perf_counter() - stage
+
+            # Спецификации станков не выгружаются: они собираются по восстановленным требованиям
+            # до создания индексов, updated_at остается как в копии
+            if Machine.__tablename__ in names or TechnicalRequirement.__tablename__ in names:
+                stage = perf_counter()
+                refresh_specs(connection, touch=False)
+                report.stages["спецификации"] = perf_counter() - stage
+
+            stage = perf_counter()
+            if use_copy:
+                for statement in recreate:
+                    connection.execute(text(statement))
+                _reset_sequences(connection, sql_tables)
+                for table in sql_tables:
+                    connection.execute(text(f"ANALYZE {connection.dialect.identifier_preparer.format_table(table)}"))
+            else:
+                for table in sql_tables:
+                    for index in table.indexes:
+                        index.create(connection, checkfirst=True)
+            report.stages["индексы и ограничения"] = perf_counter() - stage
+
+            if verify:
+                stage = perf_counter()
+                for stats, table, source, future in zip(report.tables, sql_tables, sources, file_checksums):
+                    with _open_backup(stats.path) as file:
+                        columns = _read_header(file, source)
+                    expected = future.result()
+                    # Копия прежнего формата сверяется с представлением, где есть ее колонка machine_name
+                    actual = table_checksum(connection, source, columns)
+                    if actual != expected:
+                        raise ValueError(
+                            f"Проверка {table.name} не прошла: в файле {expected[0]} строк "
+                            f"(контрольная сумма {expected[1]:016x}), в БД {actual[0]} ({actual[1]:016x})"
+                        )
+                    stats.checksum = actual[1]
+                report.stages["проверка"] = perf_counter() - stage
+
+    # Кэши сбрасываются после фиксации транзакции, чтобы запрос во время восстановления не сохранил прежние данные
+    invalidate_caches()
+    report.stages["всего"] = perf_counter() - start
+    return report
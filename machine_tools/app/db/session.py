@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Сессия ORM пакета.
+
+Обработчики событий сброса регистрируются на классе MachineToolsSession, а не на Session SQLAlchemy:
+сессии других библиотек процесса их не вызывают. Фабрики session_manager и async_session_manager
+создают сессии этого класса.
+"""
+from itertools import chain
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+
+from machine_tools.app.db.machine_specs import refresh_specs
+from machine_tools.app.db.requirement_names import requirement_ids
+from machine_tools.app.models import Machine, TechnicalRequirement
+
+# Ключ Session.info со станками, требования которых изменились в текущем сбросе сессии
+_CHANGED_SPECS = "machine_tools.changed_specs"
+
+
+class MachineToolsSession(Session):
+    """
+    Сессия ORM пакета.
+
+    Перед сбросом находит ID наименований новых технических требований без requirement_id одним обращением
+    к словарю requirement_names на сброс. После сброса пересобирает спецификации станков, требования которых
+    ORM вставил, изменил или удалил.
+    """
+
+
+@event.listens_for(MachineToolsSession, "before_flush")
+def _resolve_requirement_ids(session: Session, flush_context: Any, instances: Optional[Sequence[Any]]) -> None:
+    """Заполняет requirement_id новых требований по словарю наименований, одним вызовом requirement_ids()"""
+    pending = [
+        instance
+        for instance in session.new
+        if isinstance(instance, TechnicalRequirement)
+        and instance.requirement_id is None
+        and instance.requirement_name is None
+        and instance.requirement is not None
+    ]
+    if not pending:
+        return
+    ids = requirement_ids(session.connection(), [instance.requirement for instance in pending])
+    for instance in pending:
+        instance.requirement_id = ids[instance.requirement]
+
+
+@event.listens_for(MachineToolsSession, "after_flush")
+def _collect_changed_specs(session: Session, flush_context: Any) -> None:
+    """Запоминает станки, требования которых ORM вставил, изменил или удалил (в том числе прежний станок строки)"""
+    machine_ids = set()
+    for instance in chain(session.new, session.dirty, session.deleted):
+        if isinstance(instance, TechnicalRequirement):
+            history = inspect(instance).attrs.machine_id.history
+            machine_ids.update(machine_id for machine_id in chain(history.sum(), history.unchanged) if machine_id)
+    if machine_ids:
+        session.info.setdefault(_CHANGED_SPECS, set()).update(machine_ids)
+
+
+@event.listens_for(MachineToolsSession, "after_flush_postexec")
+def _refresh_changed_specs(session: Session, flush_context: Any) -> None:
+    """Пересобирает спецификации станков после сброса сессии. Загруженные станки перечитают spec при обращении"""
+    machine_ids = session.info.pop(_CHANGED_SPECS, None)
+    if not machine_ids:
+        return
+    refresh_specs(session.connection(), machine_ids)
+    for machine_id in machine_ids:
+        machine = session.identity_map.get(identity_key(Machine, machine_id))
+        if machine is not None:
+            session.expire(machine, ["spec", "updated_at"])
@@ -1,35 +1,195 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 # ---------------------------------------------------------------------------------------------------------------------
+import asyncio
+import threading
 from contextlib import contextmanager
-from typing import Dict, Generator, Optional
+from functools import partial
+from typing import Any, Dict, Generator, Optional
 
 from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
 
-from machine_tools.app.config import get_settings
+from machine_tools.app.config import Settings, get_settings
+from machine_tools.app.db.session import MachineToolsSession
 
-settings = get_settings()
+# Режимы области видимости сессии по умолчанию:
+# "global" - одна сессия на процесс, "thread" - своя сессия в каждом потоке,
+# "task" - своя сессия в каждой задаче asyncio (вне задачи - в каждом потоке)
+SESSION_SCOPES = ("global", "thread", "task")
+
+
+def _current_task_or_thread() -> Any:
+    """Ключ области видимости для режима "task": текущая задача asyncio или идентификатор потока"""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return task if task is not None else threading.get_ident()
+
+
+def _release_task_session(registry: scoped_session, task: "asyncio.Task") -> None:
+    """Закрывает и удаляет из реестра сессию завершенной задачи asyncio"""
+    session = registry.registry.registry.pop(task, None)
+    if session is not None:
+        session.close()
+
+
+def get_engine_options(settings: Settings, asynchronous: bool = False) -> Dict[str, Any]:
+    """
+    Параметры create_engine из настроек: пул соединений и ограничение времени запроса.
+
+    Args:
+        settings (Settings): Настройки приложения
+        asynchronous (bool, optional): Параметры для create_async_engine (драйвер asyncpg). По умолчанию False
+
+    Returns:
+        Dict[str, Any]: Именованные аргументы для create_engine
+    """
+    options: Dict[str, Any] = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if settings.DB_STATEMENT_TIMEOUT > 0:
+        # Передается при установке соединения, поэтому не требует отдельного запроса SET
+        if asynchronous:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT}"}
+    return options
 
 
 class SessionManager:
     """
     Singleton для управления сессиями БД.
+
+    В режиме "global" сессия по умолчанию одна на процесс, и ее нельзя использовать из нескольких потоков.
+    В режимах "thread" и "task" сессии по умолчанию хранятся в реестре scoped_session: каждый поток
+    (или задача asyncio) получает свою сессию, а close_session() закрывает и удаляет только ее.
+    Сессия задачи asyncio закрывается и удаляется из реестра и при завершении задачи, даже без close_session():
+    иначе реестр хранил бы задачу и сессию (с соединением пула, если транзакция открыта) до конца процесса.
+
+    Настройки, движок и фабрика сессий создаются при первом обращении к БД, а не при импорте.
     """
 
     _instance = None
     _default_session: Optional[Session] = None
     _sessions: Dict[str, Session] = {}
+    _scope: Optional[str] = None
+    _registry: Optional[scoped_session] = None
+    _lock = threading.RLock()
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(SessionManager, cls).__new__(cls)
-            # Создаем движок БД
-            cls._instance.engine = create_engine(settings.DATABASE_URL)
-            # Создаем фабрику сессий
-            cls._instance.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=cls._instance.engine)
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super(SessionManager, cls).__new__(cls)
+                    instance._engine = None
+                    instance._session_factory = None
+                    cls._instance = instance
         return cls._instance
 
+    @property
+    def engine(self) -> Engine:
+        """Движок БД. Создается при первом обращении и, если задан DB_POOL_WARMUP, сразу прогревается"""
+        if self._engine is None:
+            with self._lock:
+                if self._engine is None:
+                    settings = get_settings()
+                    self._engine = create_engine(settings.DATABASE_URL, **get_engine_options(settings))
+                    if settings.DB_POOL_WARMUP > 0:
+                        self.warm_up(settings.DB_POOL_WARMUP)
+        return self._engine
+
+    @engine.setter
+    def engine(self, engine: Engine) -> None:
+        self._engine = engine
+        self._session_factory = None
+
+    @property
+    def SessionLocal(self) -> sessionmaker:
+        """Фабрика сессий, привязанная к движку"""
+        if self._session_factory is None:
+            with self._lock:
+                if self._session_factory is None:
+                    self._session_factory = sessionmaker(
+                        autocommit=False, autoflush=False, bind=self.engine, class_=MachineToolsSession
+                    )
+        return self._session_factory
+
+    @SessionLocal.setter
+    def SessionLocal(self, factory: sessionmaker) -> None:
+        self._session_factory = factory
+
+    @classmethod
+    def warm_up(cls, connections: int = None) -> int:
+        """
+        Открывает соединения пула заранее, чтобы первые запросы не ждали подключения к БД.
+
+        Соединения берутся из пула одновременно и сразу возвращаются в него открытыми.
+        Количество ограничено размером пула: соединения сверх него пул закрыл бы при возврате.
+
+        Args:
+            connections (int, optional): Количество соединений. По умолчанию DB_POOL_WARMUP
+
+        Returns:
+            int: Количество открытых соединений
+        """
+        engine = cls().engine
+        if connections is None:
+            connections = get_settings().DB_POOL_WARMUP
+        size = getattr(engine.pool, "size", None)
+        if callable(size):
+            connections = min(connections, size())
+
+        opened = []
+        try:
+            for _ in range(max(connections, 0)):
+                opened.append(engine.raw_connection())
+        finally:
+            for connection in opened:
+                connection.close()
+        return len(opened)
+
+    @classmethod
+    def set_scope(cls, scope: str) -> None:
+        """
+        Устанавливает область видимости сессии по умолчанию.
+
+        Открытые сессии по умолчанию закрываются. Переключать режим следует до запуска рабочих потоков.
+
+        Args:
+            scope (str): "global", "thread" или "task"
+
+        Raises:
+            ValueError: Если режим не поддерживается
+        """
+        if scope not in SESSION_SCOPES:
+            raise ValueError(f"Недопустимая область видимости сессии: {scope}. Допустимые значения: {SESSION_SCOPES}")
+        with cls._lock:
+            cls.close_session()
+            if cls._registry is not None:
+                cls._registry.remove()
+            cls._scope = scope
+            cls._registry = None
+            if scope != "global":
+                scopefunc = _current_task_or_thread if scope == "task" else None
+                # Фабрика вызывается при первом обращении, поэтому учитывает подмену SessionLocal
+                cls._registry = scoped_session(lambda: cls().SessionLocal(), scopefunc=scopefunc)
+
+    @classmethod
+    def get_scope(cls) -> str:
+        """Возвращает текущую область видимости сессии по умолчанию (при первом вызове - из DB_SESSION_SCOPE)"""
+        if cls._scope is None:
+            with cls._lock:
+                if cls._scope is None:
+                    cls.set_scope(get_settings().DB_SESSION_SCOPE)
+        return cls._scope
+
     @classmethod
     def get_session(cls, session_id: str = None) -> Session:
         """
@@ -37,21 +197,34 @@ class SessionManager:
 
         Args:
             session_id (str, optional): Идентификатор сессии.
-                Если None, возвращает дефолтную сессию.
+                Если None, возвращает дефолтную сессию (в режимах "thread" и "task" - сессию текущего потока
+                или задачи).
 
         Returns:
             Session: Сессия БД
         """
         if session_id is None:
+            cls.get_scope()
+            # Сессия текущего потока или задачи
+            registry = cls._registry
+            if registry is not None:
+                # Новая сессия задачи удаляется из реестра по завершении задачи
+                if cls._scope == "task" and not registry.registry.has():
+                    key = _current_task_or_thread()
+                    if isinstance(key, asyncio.Task):
+                        key.add_done_callback(partial(_release_task_session, registry))
+                return registry()
             # Используем дефолтную сессию для обычных операций
-            if cls._default_session is None:
-                cls._default_session = cls().SessionLocal()
-            return cls._default_session
+            with cls._lock:
+                if cls._default_session is None:
+                    cls._default_session = cls().SessionLocal()
+                return cls._default_session
         else:
             # Создаем новую сессию для изолированных операций
-            if session_id not in cls._sessions:
-                cls._sessions[session_id] = cls().SessionLocal()
-            return cls._sessions[session_id]
+            with cls._lock:
+                if session_id not in cls._sessions:
+                    cls._sessions[session_id] = cls().SessionLocal()
+                return cls._sessions[session_id]
 
     @classmethod
     def close_session(cls, session_id: str = None):
@@ -60,16 +233,22 @@ class SessionManager:
 
         Args:
             session_id (str, optional): Идентификатор сессии.
-                Если None, закрывает дефолтную сессию.
+                Если None, закрывает дефолтную сессию (в режимах "thread" и "task" - сессию текущего потока
+                или задачи).
         """
         if session_id is None:
-            if cls._default_session is not None:
-                cls._default_session.close()
-                cls._default_session = None
+            if cls._registry is not None:
+                cls._registry.remove()
+                return
+            with cls._lock:
+                if cls._default_session is not None:
+                    cls._default_session.close()
+                    cls._default_session = None
         else:
-            if session_id in cls._sessions:
-                cls._sessions[session_id].close()
-                del cls._sessions[session_id]
+            with cls._lock:
+                session = cls._sessions.pop(session_id, None)
+            if session is not None:
+                session.close()
 
     @classmethod
     @contextmanager
@@ -91,10 +270,17 @@ class SessionManager:
             cls.close_session(session_id)
 
 
-# Создаем глобальный экземпляр менеджера сессий
+# Создаем глобальный экземпляр менеджера сессий (без подключения к БД)
 session_manager = SessionManager()
 
 # Экспортируем функции для удобства использования
 get_session = session_manager.get_session
 close_session = session_manager.close_session
 get_db = session_manager.get_db
+
+
+def __getattr__(name: str):
+    # Настройки читаются при первом обращении
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,6 +3,7 @@
 # ---------------------------------------------------------------------------------------------------------------------
 from machine_tools.app.enumerations.accuracy import Accuracy
 from machine_tools.app.enumerations.automation import Automation
+from machine_tools.app.enumerations.parse_status import ParseStatus
 from machine_tools.app.enumerations.software_control import SoftwareControl
 from machine_tools.app.enumerations.specialization import Specialization
 from machine_tools.app.enumerations.weight_class import WeightClass
@@ -10,6 +11,7 @@ from machine_tools.app.enumerations.weight_class import WeightClass
 __all__ = [
     "Accuracy",
     "Automation",
+    "ParseStatus",
     "Specialization",
     "WeightClass",
     "SoftwareControl",
@@ -0,0 +1,15 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+from machine_tools.app.enumerations.base import BaseEnum
+
+
+class ParseStatus(BaseEnum):
+    """Перечисление результатов разбора значения технического требования"""
+
+    EMPTY = "Пусто"  # Значения нет (пустая строка или прочерк)
+    NUMBER = "Число"  # Одно число: "400", "1,5 (15)"
+    RANGE = "Диапазон"  # Диапазон: "28..410", "±45°"
+    LIST = "Список"  # Дискретные значения: "450, 800, 1400", "1000/ 1400"
+    DIMENSIONS = "Габариты"  # Размеры по осям: "795 х 370 х 950"
+    TEXT = "Текст"  # Нечисловое значение: "Морзе 4", "есть"
@@ -1,8 +1,23 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 # ---------------------------------------------------------------------------------------------------------------------
+from typing import TYPE_CHECKING, Any
+
 from machine_tools.app.finders.finder import MachineFinder
 
+if TYPE_CHECKING:
+    from machine_tools.app.finders.async_finder import AsyncMachineFinder
+
 __all__ = [
+    "AsyncMachineFinder",
     "MachineFinder",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # Асинхронный поисковик тянет sqlalchemy.ext.asyncio, поэтому загружается при первом обращении
+    if name == "AsyncMachineFinder":
+        from machine_tools.app.finders.async_finder import AsyncMachineFinder
+
+        return AsyncMachineFinder
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
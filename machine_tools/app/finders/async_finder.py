@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import copy
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Optional, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from machine_tools.app.db.async_session_manager import async_session_manager
+from machine_tools.app.db.query_builder import QueryBuilder
+from machine_tools.app.db.query_cache import QueryCache
+from machine_tools.app.finders.finder import MachineFinder
+from machine_tools.app.formatters import (
+    IndexedMachineInfoFormatter,
+    IndexedNameFormatter,
+    ListMachineInfoFormatter,
+    MachineFormatter,
+)
+
+if TYPE_CHECKING:
+    from machine_tools.app.db.catalog import MachineCatalog
+    from machine_tools.app.db.catalog_query_builder import CatalogQueryBuilder
+
+
+class AsyncMachineFinder(MachineFinder):
+    """
+    Асинхронный поисковик станков на AsyncSession.
+
+    Повторяет API MachineFinder: те же методы find_by_* и форматтеры, но методы поиска возвращают
+    корутины, а stream() и iter_* - асинхронные итераторы. Запросы строит тот же QueryBuilder.
+
+    Если сессия не передана, каждый запрос выполняется в своей короткой сессии из общего пула,
+    поэтому один поисковик можно использовать из множества задач одновременно (asyncio.gather).
+    Переданную сессию, как и любую AsyncSession, нельзя использовать из нескольких задач сразу.
+    """
+
+    def __init__(
+        self,
+        session: Optional[AsyncSession] = None,
+        limit: Optional[int] = None,
+        formatter: Optional[MachineFormatter] = None,
+        catalog: Optional["MachineCatalog"] = None,
+        cache: Optional[QueryCache] = None,
+    ):
+        """
+        Инициализация поисковика.
+
+        Args:
+            session (AsyncSession, optional): Асинхронная сессия БД. Если не указана, каждый запрос
+                получает свою сессию от async_session_manager.
+            limit (int, optional): Глобальный лимит для всех запросов
+            formatter (MachineFormatter, optional): Форматтер для результатов. По умолчанию ListNameFormatter
+            catalog (MachineCatalog, optional): Каталог станков в памяти. Если указан, запросы к БД не выполняются
+            cache (QueryCache, optional): Кэш результатов запросов к БД. По умолчанию кэширование выключено
+        """
+        super().__init__(
+            session=session,
+            limit=limit,
+            formatter=formatter,
+            catalog=catalog,
+            cache=cache,
+        )
+
+    def _default_session(self) -> None:
+        """Общей сессии нет: каждый запрос открывает свою"""
+        return None
+
+    def __enter__(self):
+        raise TypeError("Используйте 'async with' для AsyncMachineFinder")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        # Переданной сессией владеет вызывающий код, собственные сессии закрываются после каждого запроса
+        pass
+
+    @asynccontextmanager
+    async def _session_scope(self) -> AsyncIterator[AsyncSession]:
+        """Переданная сессия или новая сессия на время одного запроса"""
+        if self.session is not None:
+            yield self.session
+        else:
+            async with async_session_manager.get_db() as session:
+                yield session
+
+    def _dialect(self) -> Any:
+        """Диалект БД для ключа кэша"""
+        bind = self.session.bind if self.session is not None else async_session_manager.engine
+        return bind.dialect
+
+    def _execute(self, builder: Union[QueryBuilder, "CatalogQueryBuilder"]) -> Awaitable[Any]:
+        """
+        Готовит запрос и возвращает корутину с результатом форматтера.
+
+        Построитель сбрасывается сразу, а не после выполнения, поэтому несколько поисков
+        одного поисковика можно запускать одновременно.
+
+        Args:
+            builder (Union[QueryBuilder, CatalogQueryBuilder]): Подготовленный построитель запросов
+
+        Returns:
+            Awaitable[Any]: Корутина с результатом форматтера
+        """
+        self._prepare(builder)
+        self.reset_builder()
+        return self._run(builder, self._formatter)
+
+    async def _run(self, builder: Union[QueryBuilder, "CatalogQueryBuilder"], formatter: MachineFormatter) -> Any:
+        """Выполняет запрос и форматирует результат, с кэшем, если он задан"""
+        if self._catalog is not None:
+            return formatter.format(builder.execute())
+
+        if self._cache is None:
+            return await self._fetch_formatted(builder, formatter)
+
+        key = (builder.cache_key(self._dialect()), type(formatter))
+        found, result = self._cache.get(key)
+        if not found:
+            # Поколение читается до запроса: результат, полученный до сброса кэша записью, не сохраняется
+            generation = self._cache.generation
+            result = await self._fetch_formatted(builder, formatter)
+            self._cache.set(key, result, generation)
+        # Глубокая копия, чтобы изменение результата или его элементов вызывающим кодом не портило кэш
+        return copy.deepcopy(result)
+
+    async def _fetch_formatted(self, builder: QueryBuilder, formatter: MachineFormatter) -> Any:
+        """Выполняет запрос в сессии и форматирует результат, пока сессия открыта"""
+        async with self._session_scope() as session:
+            result = await session.execute(builder.statement())
+            return formatter.format(builder.shape_result(result).all())
+
+    def _stream(self, builder: Union[QueryBuilder, "CatalogQueryBuilder"], batch_size: int) -> AsyncIterator[Any]:
+        """
+        Выполняет запрос порциями через серверный курсор и форматирует каждую порцию.
+
+        Args:
+            builder (Union[QueryBuilder, CatalogQueryBuilder]): Подготовленный построитель запросов
+            batch_size (int): Размер порции
+
+        Raises:
+            ValueError: Если размер порции не положительный или требования загружаются стратегией joined,
+                несовместимой с чтением серверным курсором (как в QueryBuilder.iter_batches)
+        """
+        if batch_size <= 0:
+            raise ValueError(f"Размер порции должен быть положительным: {batch_size}")
+        if self._catalog is None and builder._unique:
+            raise ValueError("Стратегия загрузки joined несовместима с чтением серверным курсором")
+        self._prepare(builder)
+        self.reset_builder()
+        return self._format_batches(self._iter_batches(builder, batch_size), self._formatter)
+
+    async def _iter_batches(
+        self, builder: Union[QueryBuilder, "CatalogQueryBuilder"], batch_size: int
+    ) -> AsyncIterator[Any]:
+        """Порции результата запроса"""
+        if self._catalog is not None:
+            for batch in builder.iter_batches(batch_size):
+                yield batch
+            return
+
+        async with self._session_scope() as session:
+            result = await session.stream(builder.statement(), execution_options={"yield_per": batch_size})
+            async for batch in builder.shape_result(result).partitions():
+                yield batch
+
+    @staticmethod
+    async def _format_batches(batches: AsyncIterator[Any], formatter: MachineFormatter) -> AsyncIterator[Any]:
+        """Форматирует порции. Нумерация индексированных форматтеров сквозная"""
+        count = 0
+        async for batch in batches:
+            if isinstance(formatter, (IndexedNameFormatter, IndexedMachineInfoFormatter)):
+                yield formatter.format(batch, start=count + 1)
+            else:
+                yield formatter.format(batch)
+            count += len(batch)
+
+    @staticmethod
+    async def _iter_items(batches: AsyncIterator[Any]) -> AsyncIterator[Any]:
+        """Разворачивает порции результата форматтера в отдельные элементы"""
+        async for batch in batches:
+            for item in batch.items() if isinstance(batch, dict) else batch:
+                yield item
+
+
+# Пример использования:
+if __name__ == "__main__":
+    import asyncio
+
+    async def main():
+        finder = AsyncMachineFinder(formatter=ListMachineInfoFormatter())
+        # Запросы выполняются одновременно, каждый в своей сессии
+        by_group, by_power = await asyncio.gather(
+            finder.find_by_group(1, limit=5),
+            finder.find_by_power(min_power=10.0, order_by_power=True, descending=True, limit=5),
+        )
+        print([machine.name for machine in by_group])
+        print([machine.name for machine in by_power])
+
+        async for name in AsyncMachineFinder().iter_all(batch_size=100):
+            print(name)
+
+        await async_session_manager.dispose()
+
+    asyncio.run(main())
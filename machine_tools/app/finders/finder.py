@@ -1,18 +1,27 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 # ---------------------------------------------------------------------------------------------------------------------
-from typing import Any, List, Optional, Union
+import copy
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple, Union
 
 from sqlalchemy.orm import Session
 
 from machine_tools.app.db.query_builder import QueryBuilder
+from machine_tools.app.db.query_cache import QueryCache
 from machine_tools.app.db.session_manager import session_manager
 from machine_tools.app.formatters import (
+    IndexedMachineInfoFormatter,
+    IndexedNameFormatter,
     ListMachineInfoFormatter,
     ListNameFormatter,
     MachineFormatter,
 )
 
+if TYPE_CHECKING:
+    # Каталог тянет NumPy, поэтому импортируется только при использовании
+    from machine_tools.app.db.catalog import MachineCatalog
+    from machine_tools.app.db.catalog_query_builder import CatalogQueryBuilder
+
 
 class MachineFinder:
     """
@@ -24,6 +33,8 @@ class MachineFinder:
         session: Optional[Session] = None,
         limit: Optional[int] = None,
         formatter: Optional[MachineFormatter] = None,
+        catalog: Optional["MachineCatalog"] = None,
+        cache: Optional[QueryCache] = None,
     ):
         """
         Инициализация поисковика.
@@ -32,15 +43,27 @@ class MachineFinder:
             session (Session, optional): Сессия БД. Если не указана, будет создана новая.
             limit (int, optional): Глобальный лимит для всех запросов
             formatter (MachineFormatter, optional): Форматтер для результатов. По умолчанию ListNameFormatter
+            catalog (MachineCatalog, optional): Каталог станков в памяти. Если указан, запросы выполняются
+                по каталогу без обращения к БД, и сессия не создается.
+            cache (QueryCache, optional): Кэш результатов запросов к БД (например, общий query_cache).
+                По умолчанию кэширование выключено.
         """
-        self.session: Session = session or session_manager.get_session()
-        self._builder: QueryBuilder = QueryBuilder(self.session)
+        self._catalog: Optional["MachineCatalog"] = catalog
+        self.session: Optional[Session] = session
+        if self.session is None and catalog is None:
+            self.session = self._default_session()
+        self._builder: Union[QueryBuilder, "CatalogQueryBuilder"] = self._new_builder()
         self._global_limit: int = limit
         self._formatter: MachineFormatter = formatter or ListNameFormatter()
+        self._cache: Optional[QueryCache] = cache
 
         if self._global_limit:
             self._builder.limit(self._global_limit)
 
+    def _default_session(self) -> Optional[Session]:
+        """Сессия, если она не передана и каталог не указан"""
+        return session_manager.get_session()
+
     def __enter__(self):
         return self
 
@@ -116,9 +139,7 @@ class MachineFinder:
         if limit:
             builder = builder.limit(limit)
 
-        machines = builder.execute()
-        self.reset_builder()
-        return self._formatter.format(machines)
+        return self._execute(builder)
 
     def find_by_efficiency(
         self,
@@ -137,9 +158,7 @@ class MachineFinder:
         if limit:
             builder = builder.limit(limit)
 
-        machines = builder.execute()
-        self.reset_builder()
-        return self._formatter.format(machines)
+        return self._execute(builder)
 
     def find_by_accuracy(self, accuracy: Union[str, List[str]], limit: int = None) -> List[Any]:
         """Получение станков по классу точности"""
@@ -148,9 +167,7 @@ class MachineFinder:
         if limit:
             builder = builder.limit(limit)
 
-        machines = builder.execute()
-        self.reset_builder()
-        return self._formatter.format(machines)
+        return self._execute(builder)
 
     def find_by_automation(self, automation: Union[str, List[str]], limit: int = None) -> List[Any]:
         """Получение станков по уровню автоматизации"""
@@ -159,9 +176,7 @@ class MachineFinder:
         if limit:
             builder = builder.limit(limit)
 
-        machines = builder.execute()
-        self.reset_builder()
-        return self._formatter.format(machines)
+        return self._execute(builder)
 
     def find_by_specialization(self, specialization: Union[str, List[str]], limit: int = None) -> List[Any]:
         """Получение станков по специализации"""
@@ -170,9 +185,7 @@ class MachineFinder:
         if limit:
             builder = builder.limit(limit)
 
-        machines = builder.execute()
-        self.reset_builder()
-        return self._formatter.format(machines)
+        return self._execute(builder)
 
     def find_by_name(
         self, name: str, case_sensitive: bool = False, exact_match: bool = True, limit: int = None
@@ -190,9 +203,55 @@ class MachineFinder:
         if limit:
             builder = builder.limit(limit)
 
-        machines = builder.execute()
-        self.reset_builder()
-        return self._formatter.format(machines)
+        return self._execute(builder)
+
+    def find_by_names(self, names: List[str], case_sensitive: bool = False, limit: int = None) -> List[Any]:
+        """Получение станков по списку имен одним запросом
+
+        Args:
+            names (List[str]): Имена станков (точное совпадение)
+            case_sensitive (bool, optional): Учитывать регистр. По умолчанию False, как в find_by_name
+            limit (int, optional): Ограничение количества результатов
+        """
+        builder = self._builder.filter_by_names(names, case_sensitive=case_sensitive)
+
+        if limit:
+            builder = builder.limit(limit)
+
+        return self._execute(builder)
+
+    def find_by_requirements(self, requirements: List[Tuple[str, str, Any]], limit: int = None) -> List[Any]:
+        """Получение станков, удовлетворяющих всем условиям на технические требования
+
+        Args:
+            requirements (List[Tuple[str, str, Any]]): Условия (наименование параметра, оператор, значение),
+                например [("Наибольший диаметр сверления, мм", ">=", 20), ("Конус шпинделя", "==", "Морзе 4")].
+                Операторы - см. QueryBuilder.filter_by_requirement
+            limit (int, optional): Ограничение количества результатов
+        """
+        builder = self._builder
+        for name, op, value in requirements:
+            builder = builder.filter_by_requirement(name, op, value)
+
+        if limit:
+            builder = builder.limit(limit)
+
+        return self._execute(builder)
+
+    def find_by_spec(self, spec: Dict[str, Any], limit: int = None) -> List[Any]:
+        """Получение станков, в спецификации которых есть все пары {параметр: значение}
+
+        Args:
+            spec (Dict[str, Any]): Параметры и значения в написании строк требований,
+                например {"Конус шпинделя": "Морзе 4"}. См. QueryBuilder.filter_by_spec
+            limit (int, optional): Ограничение количества результатов
+        """
+        builder = self._builder.filter_by_spec(spec)
+
+        if limit:
+            builder = builder.limit(limit)
+
+        return self._execute(builder)
 
     def find_by_software_control(self, software_control: Union[str, List[str]], limit: int = None) -> List[Any]:
         """Получение станков по наличию системы управления"""
@@ -201,9 +260,7 @@ class MachineFinder:
         if limit:
             builder = builder.limit(limit)
 
-        machines = builder.execute()
-        self.reset_builder()
-        return self._formatter.format(machines)
+        return self._execute(builder)
 
     def find_by_group(self, group: Union[int, List[int]], limit: int = None) -> List[Any]:
         """Получение станков по группе"""
@@ -213,9 +270,7 @@ class MachineFinder:
         if limit:
             builder = builder.limit(limit)
 
-        machines = builder.execute()
-        self.reset_builder()
-        return self._formatter.format(machines)
+        return self._execute(builder)
     
     def find_by_type(self, type: Union[int, List[int]], limit: int = None) -> List[Any]:
         """Получение станков по типу"""
@@ -225,9 +280,7 @@ class MachineFinder:
         if limit:
             builder = builder.limit(limit)  
 
-        machines = builder.execute()
-        self.reset_builder()
-        return self._formatter.format(machines)    
+        return self._execute(builder)    
 
     def find_all(self, limit: int = None) -> List[Any]:
         """Получение всех станков"""
@@ -236,13 +289,125 @@ class MachineFinder:
         if limit:
             builder = builder.limit(limit)
 
-        machines = builder.execute()
-        self.reset_builder()
-        return self._formatter.format(machines)
+        return self._execute(builder)
     
+    def stream(self, batch_size: int = 1000) -> Iterator[Any]:
+        """
+        Получение всех станков порциями.
+
+        Форматтер применяется к каждой порции отдельно, поэтому память не растет с размером каталога.
+        Глобальный лимит поисковика ограничивает общее количество станков.
+
+        Args:
+            batch_size (int, optional): Размер порции. По умолчанию 1000
+
+        Returns:
+            Iterator[Any]: Результаты форматтера по порциям
+        """
+        return self._stream(self._builder, batch_size)
+
+    def iter_all(self, batch_size: int = 1000) -> Iterator[Any]:
+        """
+        Поэлементный обход всех станков.
+
+        Args:
+            batch_size (int, optional): Размер порции запроса к БД. По умолчанию 1000
+
+        Returns:
+            Iterator[Any]: Элементы результата форматтера (для словарных форматтеров - пары ключ, значение)
+        """
+        return self._iter_items(self._stream(self._builder, batch_size))
+
+    def iter_by_group(self, group: Union[int, List[int]], batch_size: int = 1000) -> Iterator[Any]:
+        """Поэлементный обход станков группы"""
+        group = [str(g) for g in group] if isinstance(group, list) else str(group)
+        return self._iter_items(self._stream(self._builder.filter_by_group(group), batch_size))
+
+    def iter_by_type(self, type: Union[int, List[int]], batch_size: int = 1000) -> Iterator[Any]:
+        """Поэлементный обход станков типа"""
+        type = [str(t) for t in type] if isinstance(type, list) else str(type)
+        return self._iter_items(self._stream(self._builder.filter_by_type(type), batch_size))
+
+    @staticmethod
+    def _iter_items(batches: Iterator[Any]) -> Iterator[Any]:
+        """Разворачивает порции результата форматтера в отдельные элементы"""
+        for batch in batches:
+            yield from batch.items() if isinstance(batch, dict) else batch
+
+    def _stream(self, builder: Union[QueryBuilder, "CatalogQueryBuilder"], batch_size: int) -> Iterator[Any]:
+        """
+        Выполняет запрос порциями и форматирует каждую порцию.
+
+        Построитель сбрасывается сразу, поэтому поисковиком можно пользоваться, пока идет обход.
+
+        Args:
+            builder (Union[QueryBuilder, CatalogQueryBuilder]): Подготовленный построитель запросов
+            batch_size (int): Размер порции
+        """
+        self._prepare(builder)
+        self.reset_builder()
+        return self._format_batches(builder.iter_batches(batch_size), self._formatter)
+
+    @staticmethod
+    def _format_batches(batches: Iterator[List[Any]], formatter: MachineFormatter) -> Iterator[Any]:
+        """Форматирует порции. Нумерация индексированных форматтеров сквозная"""
+        count = 0
+        for batch in batches:
+            if isinstance(formatter, (IndexedNameFormatter, IndexedMachineInfoFormatter)):
+                yield formatter.format(batch, start=count + 1)
+            else:
+                yield formatter.format(batch)
+            count += len(batch)
+
+    def _prepare(self, builder: Union[QueryBuilder, "CatalogQueryBuilder"]) -> None:
+        """Настраивает выборку под форматтер: проекция колонок, если форматтер их объявил"""
+        columns = getattr(self._formatter, "columns", None)
+        if columns:
+            builder.select_columns(*columns)
+
+    def _execute(self, builder: Union[QueryBuilder, "CatalogQueryBuilder"]) -> Any:
+        """
+        Выполняет запрос и форматирует результат.
+
+        Если форматтер объявил нужные ему колонки, запрос выбирает только их (см. _prepare).
+        Технические требования форматтеры MachineInfo берут из колонки spec той же строки, без отдельных запросов.
+        Если задан кэш, результат форматтера берется из него по ключу запроса и типу форматтера.
+
+        Args:
+            builder (Union[QueryBuilder, CatalogQueryBuilder]): Подготовленный построитель запросов
+
+        Returns:
+            Any: Результат форматтера
+        """
+        self._prepare(builder)
+
+        if self._cache is None or self._catalog is not None:
+            machines = builder.execute()
+            self.reset_builder()
+            return self._formatter.format(machines)
+
+        key = (builder.cache_key(), type(self._formatter))
+        found, result = self._cache.get(key)
+        if not found:
+            # Поколение читается до запроса: результат, полученный до сброса кэша записью, не сохраняется
+            generation = self._cache.generation
+            result = self._formatter.format(builder.execute())
+            self._cache.set(key, result, generation)
+        self.reset_builder()
+        # Глубокая копия, чтобы изменение результата или его элементов вызывающим кодом не портило кэш
+        return copy.deepcopy(result)
+
+    def _new_builder(self) -> Union[QueryBuilder, "CatalogQueryBuilder"]:
+        """Создает построитель запросов к каталогу в памяти или к БД"""
+        if self._catalog is not None:
+            from machine_tools.app.db.catalog_query_builder import CatalogQueryBuilder
+
+            return CatalogQueryBuilder(self._catalog)
+        return QueryBuilder(self.session)
+
     def reset_builder(self):
         """Сброс всех параметров поиска"""
-        self._builder = QueryBuilder(self.session)
+        self._builder = self._new_builder()
         self._builder.limit(self._global_limit)
 
 
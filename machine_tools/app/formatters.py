@@ -1,63 +1,164 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from typing import Any, Dict, List, Protocol, Union
+from typing import Any, Dict, List, Mapping, Optional, Protocol, Sequence, Tuple, Union
 
+from pydantic import TypeAdapter
+
+from machine_tools.app.db.machine_infos import MachineInfoCache
 from machine_tools.app.models.machine import Machine
 from machine_tools.app.schemas.machine import MachineInfo
 
-
-def _machine_to_dict(machine: Machine) -> dict:
+# Колонки Machine, из которых собирается MachineInfo
+INFO_COLUMNS: Tuple[str, ...] = (
+    "name",
+    "group",
+    "type",
+    "power",
+    "efficiency",
+    "accuracy",
+    "automation",
+    "software_control",
+    "specialization",
+    "weight",
+    "weight_class",
+    "machine_type",
+    "length",
+    "width",
+    "height",
+    "overall_diameter",
+    "city",
+    "manufacturer",
+    "spec",
+)
+_INFO_COLUMN_SET = frozenset(INFO_COLUMNS)
+
+# Скомпилированный валидатор списка: доверенный режим проверяет все станки одним вызовом pydantic-core
+_MACHINE_INFO_LIST = TypeAdapter(List[MachineInfo])
+
+
+def _info_data(values: Mapping[str, Any]) -> dict:
     """
-    Преобразует объект Machine в словарь для MachineInfo.
+    Собирает словарь для MachineInfo из значений колонок станка.
 
     Args:
-        machine (Machine): Объект станка.
+        values (Mapping[str, Any]): Значения колонок INFO_COLUMNS.
 
     Returns:
         dict: Словарь с данными станка.
     """
+    length, width, height = values["length"], values["width"], values["height"]
+    overall_diameter, city, manufacturer = values["overall_diameter"], values["city"], values["manufacturer"]
     return {
-        "name": machine.name,
-        "group": machine.group,
-        "type": machine.type,
-        "power": machine.power,
-        "efficiency": machine.efficiency,
-        "accuracy": machine.accuracy,
-        "automation": machine.automation,
-        "software_control": machine.software_control,
-        "specialization": machine.specialization,
-        "weight": machine.weight,
-        "weight_class": machine.weight_class,
-        "machine_type": machine.machine_type,
+        "name": values["name"],
+        "group": values["group"],
+        "type": values["type"],
+        "power": values["power"],
+        "efficiency": values["efficiency"],
+        "accuracy": values["accuracy"],
+        "automation": values["automation"],
+        "software_control": values["software_control"],
+        "specialization": values["specialization"],
+        "weight": values["weight"],
+        "weight_class": values["weight_class"],
+        "machine_type": values["machine_type"],
         # Создаем вложенные модели
         "dimensions": (
-            {
-                "length": machine.length,
-                "width": machine.width,
-                "height": machine.height,
-                "overall_diameter": machine.overall_diameter,
-            }
-            if machine.length or machine.width or machine.height or machine.overall_diameter
-            else None
-        ),
-        "location": (
-            {"city": machine.city, "manufacturer": machine.manufacturer}
-            if machine.city or machine.manufacturer
-            else None
-        ),
-        # Преобразуем список TechnicalRequirement в словарь
-        "technical_requirements": (
-            {req.requirement: req.value for req in machine.technical_requirements}
-            if machine.technical_requirements
+            {"length": length, "width": width, "height": height, "overall_diameter": overall_diameter}
+            if length or width or height or overall_diameter
             else None
         ),
+        "location": {"city": city, "manufacturer": manufacturer} if city or manufacturer else None,
+        # Спецификация станка уже хранит технические требования словарем, соединение с требованиями не нужно
+        "technical_requirements": values["spec"] or None,
     }
 
 
+def _machine_to_dict(machine: Machine) -> dict:
+    """
+    Преобразует объект Machine в словарь для MachineInfo.
+
+    Args:
+        machine (Machine): Объект станка.
+
+    Returns:
+        dict: Словарь с данными станка.
+    """
+    return _info_data({column: getattr(machine, column) for column in INFO_COLUMNS})
+
+
+def _row_values(machine: Machine) -> Mapping[str, Any]:
+    """
+    Значения колонок станка из БД.
+
+    Загруженные атрибуты ORM-объекта берутся прямо из его __dict__, без дескрипторов ORM. Если каких-то
+    колонок там нет (атрибуты истекли или отложены) или станок - строка каталога или запроса, значения
+    читаются по атрибутам.
+    """
+    if isinstance(machine, Machine):
+        values = machine.__dict__
+        if _INFO_COLUMN_SET <= values.keys():
+            return values
+    return {column: getattr(machine, column) for column in INFO_COLUMNS}
+
+
+def _trusted_infos(machines: Sequence[Machine]) -> List[MachineInfo]:
+    """
+    Представления станков из БД пакета.
+
+    Все поля, кроме технических требований, проверяются одним вызовом скомпилированного валидатора списка.
+    Технические требования - словарь строк из колонки spec: вместо проверки каждой пары он копируется
+    в готовую модель (значения полей pydantic хранятся в __dict__ экземпляра).
+    """
+    rows = [_row_values(machine) for machine in machines]
+    data = [_info_data(row) for row in rows]
+    for item in data:
+        item["technical_requirements"] = None
+    infos = _MACHINE_INFO_LIST.validate_python(data)
+    for info, row in zip(infos, rows):
+        if row["spec"]:
+            info.__dict__["technical_requirements"] = dict(row["spec"])
+    return infos
+
+
+def machine_infos(
+    machines: Sequence[Machine], cache: Optional[MachineInfoCache] = None, trusted: bool = False
+) -> List[MachineInfo]:
+    """
+    Представления MachineInfo станков в порядке списка.
+
+    Args:
+        machines (Sequence[Machine]): Станки.
+        cache (MachineInfoCache, optional): Кэш представлений. Если указан, представления для текущего
+            updated_at станков берутся из него, а собранные сохраняются в него.
+        trusted (bool, optional): Станки прочитаны из БД пакета (см. _trusted_infos). По умолчанию False:
+            каждый станок целиком проверяется через MachineInfo.model_validate.
+
+    Returns:
+        List[MachineInfo]: Представления станков.
+    """
+    infos: List[Optional[MachineInfo]] = (
+        [None] * len(machines) if cache is None else [cache.get(machine) for machine in machines]
+    )
+    missing = [index for index, info in enumerate(infos) if info is None]
+    if trusted:
+        built = _trusted_infos([machines[index] for index in missing])
+    else:
+        built = [MachineInfo.model_validate(_machine_to_dict(machines[index])) for index in missing]
+    for index, info in zip(missing, built):
+        infos[index] = info
+        if cache is not None:
+            cache.set(machines[index], info)
+    return infos
+
+
 class MachineFormatter(Protocol):
     """Протокол для форматтеров станков"""
 
+    # Колонки Machine, которые нужны форматтеру. Если заданы, поиск выбирает только их
+    # и передает в format легкие строки вместо ORM-объектов. None - нужны полные объекты
+    columns: Optional[Tuple[str, ...]] = None
+
     def format(self, machines: List[Machine]):
         """Форматирует список станков"""
         ...
@@ -66,44 +167,64 @@ class MachineFormatter(Protocol):
 class ListNameFormatter(MachineFormatter):
     """Форматтер, возвращающий список имен станков"""
 
+    columns = ("id", "name")
+
     def format(self, machines: List[Machine]) -> List[str]:
         return [machine.name for machine in machines]
 
 
-class ListMachineInfoFormatter(MachineFormatter):
+class _MachineInfoFormatter(MachineFormatter):
+    """Основа форматтеров MachineInfo с необязательным кэшем представлений и доверенным режимом"""
+
+    def __init__(self, cache: Optional[MachineInfoCache] = None, trusted: bool = False):
+        """
+        Args:
+            cache (MachineInfoCache, optional): Кэш представлений (например, общий machine_info_cache).
+                По умолчанию каждое представление собирается заново.
+            trusted (bool, optional): Станки приходят из БД пакета (поисковик, каталог) - см. machine_infos().
+                По умолчанию False: строгая проверка каждого станка для данных из других источников.
+        """
+        self.cache = cache
+        self.trusted = trusted
+
+    def _infos(self, machines: List[Machine]) -> List[MachineInfo]:
+        return machine_infos(machines, self.cache, self.trusted)
+
+
+class ListMachineInfoFormatter(_MachineInfoFormatter):
     """Форматтер, возвращающий список MachineInfo"""
 
     def format(self, machines: List[Machine]) -> List[MachineInfo]:
-        result = []
-        for machine in machines:
-            data = _machine_to_dict(machine)
-            result.append(MachineInfo.model_validate(data))
-        return result
+        return self._infos(machines)
 
 
 class DictNameFormatter(MachineFormatter):
     """Форматтер, возвращающий словарь {id: name}"""
 
+    columns = ("id", "name")
+
     def format(self, machines: List[Machine]) -> Dict[int, str]:
         return {machine.id: machine.name for machine in machines}
 
 
-class DictMachineInfoFormatter(MachineFormatter):
+class DictMachineInfoFormatter(_MachineInfoFormatter):
     """Форматтер, возвращающий словарь {id: MachineInfo}"""
 
     def format(self, machines: List[Machine]) -> Dict[int, MachineInfo]:
-        return {machine.name: MachineInfo.model_validate(_machine_to_dict(machine)) for machine in machines}
+        return {machine.name: info for machine, info in zip(machines, self._infos(machines))}
 
 
 class IndexedNameFormatter(MachineFormatter):
     """Форматтер, возвращающий словарь {номер: name}"""
 
-    def format(self, machines: List[Machine]) -> Dict[int, str]:
-        return {i + 1: machine.name for i, machine in enumerate(machines)}
+    columns = ("id", "name")
 
+    def format(self, machines: List[Machine], start: int = 1) -> Dict[int, str]:
+        return {i: machine.name for i, machine in enumerate(machines, start)}
 
-class IndexedMachineInfoFormatter(MachineFormatter):
+
+class IndexedMachineInfoFormatter(_MachineInfoFormatter):
     """Форматтер, возвращающий словарь {номер: MachineInfo}"""
 
-    def format(self, machines: List[Machine]) -> Dict[int, MachineInfo]:
-        return {i + 1: MachineInfo.model_validate(_machine_to_dict(machine)) for i, machine in enumerate(machines)}
+    def format(self, machines: List[Machine], start: int = 1) -> Dict[int, MachineInfo]:
+        return dict(enumerate(self._infos(machines), start))
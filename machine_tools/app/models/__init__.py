@@ -1,11 +1,21 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 # ---------------------------------------------------------------------------------------------------------------------
+from machine_tools.app.models.import_manifest import ImportManifest
 from machine_tools.app.models.machine import Base, Machine
-from machine_tools.app.models.technical_requirement import TechnicalRequirement
+from machine_tools.app.models.requirement_name import RequirementName
+from machine_tools.app.models.technical_requirement import (
+    COMPAT_VIEW,
+    TechnicalRequirement,
+    technical_requirements_compat,
+)
 
 __all__ = [
+    "COMPAT_VIEW",
     "Base",
+    "ImportManifest",
     "Machine",
+    "RequirementName",
     "TechnicalRequirement",
+    "technical_requirements_compat",
 ]
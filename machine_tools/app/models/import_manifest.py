@@ -0,0 +1,23 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String
+
+from machine_tools.app.models.machine import Base
+
+
+class ImportManifest(Base):
+    """SQLAlchemy модель записи манифеста импорта: какой CSV-файл и в каком состоянии уже загружен в БД"""
+
+    __tablename__ = "import_manifest"
+
+    filename = Column(String, primary_key=True)  # Имя CSV-файла в папке tables_csv
+    sha256 = Column(String(64), nullable=False)  # Хеш содержимого файла
+    size = Column(BigInteger, nullable=False)  # Размер файла в байтах
+    mtime_ns = Column(BigInteger, nullable=False)  # Время изменения файла, нс
+    machine_name = Column(String, nullable=True)  # Станок, требования которого описывает файл
+    rows = Column(Integer, nullable=False, default=0)  # Количество загруженных строк
+    encoding = Column(String, nullable=True)  # Кодировка файла, определенная при импорте
+    imported_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # Дата последнего импорта
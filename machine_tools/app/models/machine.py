@@ -3,7 +3,8 @@
 # ---------------------------------------------------------------------------------------------------------------------
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, Float, Integer, String
+from sqlalchemy import DDL, JSON, Boolean, Column, DateTime, Float, Index, Integer, SmallInteger, String, Text, event
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -14,11 +15,30 @@ class Machine(Base):
     """SQLAlchemy модель станка, которая представляет таблицу в базе данных"""
 
     __tablename__ = "machine_tools"
+    __table_args__ = (
+        # Индексы колонок, по которым фильтрует QueryBuilder
+        Index("ix_machine_tools_group_type", "group", "type"),
+        Index("ix_machine_tools_type", "type"),
+        Index("ix_machine_tools_power", "power"),
+        Index("ix_machine_tools_efficiency", "efficiency"),
+        Index("ix_machine_tools_accuracy", "accuracy"),
+        Index("ix_machine_tools_automation", "automation"),
+        Index("ix_machine_tools_specialization", "specialization"),
+        Index("ix_machine_tools_software_control", "software_control"),
+        # Триграммный индекс для поиска по части имени (ILIKE '%...%'), только PostgreSQL
+        Index(
+            "ix_machine_tools_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+        # Индекс вхождения пар {параметр: значение} в спецификацию (оператор @>), только PostgreSQL
+        Index(
+            "ix_machine_tools_spec", "spec", postgresql_using="gin", postgresql_ops={"spec": "jsonb_path_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)  # Уникальный идентификатор станка
     name = Column(String, nullable=False, unique=True)  # Название станка (например, "16К20")
-    group = Column(Integer)  # Группа станка
-    type = Column(Integer)  # Тип станка
+    group = Column(SmallInteger)  # Группа станка
+    type = Column(SmallInteger)  # Тип станка
     power = Column(Float)  # Мощность станка в кВт
     efficiency = Column(Float)  # КПД станка
     accuracy = Column(String)  # Класс точности станка
@@ -36,8 +56,19 @@ class Machine(Base):
     machine_type = Column(String)  # Тип станка (например, "Токарный")
     created_at = Column(DateTime, default=datetime.utcnow)  # Дата создания записи
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # Дата последнего обновления
-    technical_requirements = relationship(
-        "TechnicalRequirement",
-        back_populates="machine",
-        primaryjoin="Machine.name == TechnicalRequirement.machine_name",
-    )
+    # Технические требования {параметр: значение} - копия строк technical_requirements для чтения без соединения
+    # (см. machine_tools.app.db.machine_specs). NULL - требований нет
+    spec = Column(JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"))
+    # Сохраненное представление MachineInfo в JSON и updated_at, для которого оно собрано
+    # (см. machine_tools.app.db.machine_infos). Представление действительно, пока info_updated_at = updated_at
+    info = Column(Text)
+    info_updated_at = Column(DateTime)
+    technical_requirements = relationship("TechnicalRequirement", back_populates="machine")
+
+
+# Класс операторов gin_trgm_ops триграммного индекса входит в расширение pg_trgm
+event.listen(
+    Machine.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,18 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+from sqlalchemy import Column, Integer, SmallInteger, String
+
+from machine_tools.app.models.machine import Base
+
+
+class RequirementName(Base):
+    """SQLAlchemy модель словаря наименований параметров: одна запись на все написания одного параметра"""
+
+    __tablename__ = "requirement_names"
+
+    # Уникальный идентификатор наименования. В SQLite только INTEGER PRIMARY KEY получает значения автоматически
+    id = Column(SmallInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    # Ключ наименования (см. machine_tools.app.parsers.requirement_names.requirement_key)
+    key = Column(String, nullable=False, unique=True)
+    name = Column(String, nullable=False)  # Основное написание - первое, с которым наименование попало в словарь
@@ -1,21 +1,100 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 # ---------------------------------------------------------------------------------------------------------------------
-from sqlalchemy import Column, ForeignKey, Integer, String
+from typing import Optional
+
+from sqlalchemy import (
+    DDL,
+    Column,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    SmallInteger,
+    String,
+    Table,
+    event,
+    select,
+)
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 
-from machine_tools.app.models.machine import Base
+from machine_tools.app.models.machine import Base, Machine
+from machine_tools.app.models.requirement_name import RequirementName
+
+# Представление с прежней колонкой machine_name для внешних запросов и резервных копий старого формата
+COMPAT_VIEW = "technical_requirements_compat"
 
 
 class TechnicalRequirement(Base):
     """SQLAlchemy модель технических требований станка, которая представляет таблицу в базе данных"""
 
     __tablename__ = "technical_requirements"
+    __table_args__ = (
+        # Числовые условия по параметру: равенство ID наименования и диапазон по границам значения
+        Index("ix_technical_requirements_requirement_id_min_max", "requirement_id", "value_min", "value_max"),
+    )
 
     id = Column(Integer, primary_key=True)  # Уникальный идентификатор требования
-    machine_name = Column(String, ForeignKey("machine_tools.name"), nullable=False)  # Имя станка (внешний ключ)
+    # ID станка (внешний ключ). Индекс нужен соединению со станками и пакетной загрузке требований
+    machine_id = Column(
+        Integer, ForeignKey("machine_tools.id", name="fk_technical_requirements_machine_id"), nullable=False, index=True
+    )
     requirement = Column(String, nullable=False)  # Наименование параметра (например, "Максимальный диаметр обработки")
     value = Column(String, nullable=True)  # Значение параметра (может быть числом, текстом или диапазоном)
+    # Результат разбора value и наименования (см. machine_tools.app.parsers), заполняется при записи value
+    unit = Column(String, nullable=True)  # Единица измерения из окончания наименования (например, "мм")
+    value_number = Column(Float, nullable=True)  # Значение-число
+    value_min = Column(Float, nullable=True)  # Нижняя граница числа, диапазона или списка
+    value_max = Column(Float, nullable=True)  # Верхняя граница числа, диапазона или списка
+    value_list = Column(String, nullable=True)  # Числа списка или габаритов через ";"
+    parse_status = Column(String, nullable=True)  # Результат разбора (см. ParseStatus)
+    # ID наименования в словаре requirement_names: одинаковый для всех написаний параметра. Массовая загрузка
+    # передает его явно (см. requirement_ids), сессия пакета находит его для всех новых строк сброса разом
+    # (см. MachineToolsSession)
+    requirement_id = Column(
+        SmallInteger,
+        ForeignKey("requirement_names.id", name="fk_technical_requirements_requirement_id"),
+        nullable=False,
+    )
 
     # Связь с моделью Machine
     machine = relationship("Machine", back_populates="technical_requirements")
+    # Запись словаря наименований
+    requirement_name = relationship(RequirementName)
+
+    @hybrid_property
+    def machine_name(self) -> Optional[str]:
+        """Имя станка. Колонка machine_name заменена на machine_id, имя берется из связанного станка"""
+        return self.machine.name if self.machine is not None else None
+
+    @machine_name.inplace.expression
+    @classmethod
+    def _machine_name_expression(cls):
+        """Имя станка в запросах: коррелированный подзапрос по первичному ключу станка"""
+        return select(Machine.name).where(Machine.id == cls.machine_id).scalar_subquery()
+
+
+# Описание представления COMPAT_VIEW для чтения через SQLAlchemy. Отдельный MetaData: create_all
+# не должен создавать его как таблицу
+technical_requirements_compat = Table(
+    COMPAT_VIEW,
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("machine_id", Integer),
+    Column("machine_name", String),
+    Column("requirement", String),
+    Column("value", String),
+)
+
+event.listen(
+    TechnicalRequirement.__table__,
+    "after_create",
+    DDL(
+        f"CREATE VIEW {COMPAT_VIEW} AS "
+        "SELECT t.id, t.machine_id, m.name AS machine_name, t.requirement, t.value "
+        "FROM technical_requirements AS t JOIN machine_tools AS m ON m.id = t.machine_id"
+    ),
+)
+event.listen(TechnicalRequirement.__table__, "before_drop", DDL(f"DROP VIEW IF EXISTS {COMPAT_VIEW}"))
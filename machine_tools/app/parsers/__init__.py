@@ -0,0 +1,21 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+from machine_tools.app.parsers.requirement_names import UNIT_ALIASES, requirement_key
+from machine_tools.app.parsers.requirement_values import (
+    LIST_SEPARATOR,
+    PARSED_COLUMNS,
+    parse_requirements,
+    parse_units,
+    parse_values,
+)
+
+__all__ = [
+    "LIST_SEPARATOR",
+    "PARSED_COLUMNS",
+    "UNIT_ALIASES",
+    "parse_requirements",
+    "parse_units",
+    "parse_values",
+    "requirement_key",
+]
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Нормализация наименований параметров технических требований.
+
+CSV-файлы станков записывают один и тот же параметр по-разному: регистр ("Род тока питающей сети" и
+"род тока питающей сети"), пробелы перед запятой ("Масса станка , кг"), точка в конце, написание
+единиц измерения ("Н*м", "Н.м", "Нм"). Ключ наименования совпадает у всех таких написаний, по нему
+наименования сводятся в словарь requirement_names. Ключ вычисляется для уникальных наименований,
+которых на порядок меньше строк, поэтому функция работает со строкой, а не с колонкой pandas.
+"""
+import re
+from typing import Tuple
+
+# Написания единиц измерения (в нижнем регистре) и их основная форма. Заменяются только в единице
+# измерения - окончании наименования после последней запятой
+UNIT_ALIASES: Tuple[Tuple[str, str], ...] = (
+    (r"н\s*[.·×*]\s*м|нм", "н*м"),
+    (r"кн\s*[.·×*]\s*м|кнм", "кн*м"),
+    (r"кгс\s*[.·×*]\s*м", "кгс*м"),
+    (r"об\.\s*/\s*мин|об\s*/\s*мин", "об/мин"),
+    (r"м\s*/\s*сек", "м/с"),
+    (r"сек", "с"),
+    (r"градусов|°", "град"),
+)
+
+_UNIT_ALIASES = [(re.compile(rf"(?<![\w*/])(?:{pattern})(?![\w*/])"), unit) for pattern, unit in UNIT_ALIASES]
+_SPACES = re.compile(r"\s+")
+_SEPARATORS = re.compile(r"\s*([,;:])\s*")
+
+
+def requirement_key(name: str) -> str:
+    """
+    Ключ наименования параметра.
+
+    Регистр, буква "ё", повторные пробелы, пробелы вокруг знаков препинания и скобок, знаки препинания
+    в конце и написание единицы измерения (UNIT_ALIASES) на ключ не влияют.
+
+    Args:
+        name (str): Наименование параметра
+
+    Returns:
+        str: Ключ наименования
+    """
+    key = _SPACES.sub(" ", name.lower().replace("ё", "е"))
+    key = _SEPARATORS.sub(r"\1 ", key)
+    key = key.replace("( ", "(").replace(" )", ")").strip(" .,;:")
+    head, comma, unit = key.rpartition(",")
+    if comma:
+        for pattern, replacement in _UNIT_ALIASES:
+            unit = pattern.sub(replacement, unit)
+        key = head + comma + unit
+    return key
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Разбор текстовых значений технических требований в типизированные колонки.
+
+Все функции работают с колонками pandas целиком (строковые методы и регулярные выражения pandas),
+без обхода строк в Python, поэтому разбирают порцию импорта или всю таблицу за один вызов.
+"""
+import pandas as pd
+
+from machine_tools.app.enumerations.parse_status import ParseStatus
+
+# Колонки technical_requirements, которые заполняет разбор, в порядке колонок результата parse_requirements()
+PARSED_COLUMNS = ("unit", "value_number", "value_min", "value_max", "value_list", "parse_status")
+
+# Разделитель чисел в value_list
+LIST_SEPARATOR = ";"
+
+# Число: знак, целая часть и дробная после точки или запятой без пробела ("1,5", но не "1, 5")
+_NUMBER = r"[-+]?\d+(?:[.,]\d+)?"
+# Пояснение в скобках после значения: "1,5 (15)", "28..410 (12)"
+_NOTE = r"(?:\s*\([^)]*\))?"
+_SCALAR = rf"(?P<number>{_NUMBER})\s*[°%]?{_NOTE}"
+_PLUS_MINUS = rf"±\s*(?P<bound>{_NUMBER})\s*°?{_NOTE}"
+_RANGE = rf"(?P<low>{_NUMBER})\s*°?\s*(?:\.\.|-)\s*(?P<high>{_NUMBER})\s*°?{_NOTE}"
+_DIMENSIONS = rf"{_NUMBER}(?:\s*х\s*{_NUMBER})+"
+_LIST = rf"{_NUMBER}(?:\s*(?:,\s+|;|/)\s*{_NUMBER})+{_NOTE}"
+
+# Значения, которые означают отсутствие параметра
+_EMPTY_VALUES = ("", "-", "—", "–")
+
+
+def _normalize(values: pd.Series) -> pd.Series:
+    """Приводит к одному написанию многоточия, знаков умножения и минуса"""
+    text = values.astype(object).where(values.notna(), "").astype(str).str.strip()
+    text = text.str.replace(r"\.{2,}|…", "..", regex=True)
+    text = text.str.replace(r"(?<=\d)\s*[хХxX×*]\s*(?=[-+]?\d)", " х ", regex=True)
+    return text.str.replace("−", "-", regex=False)
+
+
+def to_numbers(tokens: pd.Series) -> pd.Series:
+    """
+    Числа из строк, найденных регулярным выражением числа.
+
+    Запятая считается десятичным разделителем. Число с ведущим нулем ("055", "0094") считается дробью
+    с потерянной запятой: при выгрузке ресурсов "0,55" превратилось в "055".
+    """
+    text = tokens.str.replace(",", ".", regex=False)
+    text = text.str.replace(r"^([-+]?)0(?=\d)", r"\g<1>0.", regex=True)
+    return pd.to_numeric(text, errors="coerce")
+
+
+def parse_units(names: pd.Series) -> pd.Series:
+    """
+    Единицы измерения из окончаний наименований параметров: "Наибольший диаметр, мм" -> "мм".
+
+    Окончание с лишней закрывающей скобкой - часть перечисления в скобках, а не единица.
+    """
+    units = names.astype(object).where(names.notna(), "").astype(str).str.extract(r",\s*([^,]+?)\s*$")[0]
+    balanced = units.str.count(r"\(") >= units.str.count(r"\)")
+    return units.where(units.notna() & balanced, None)
+
+
+def parse_values(values: pd.Series) -> pd.DataFrame:
+    """
+    Разбирает значения требований.
+
+    Args:
+        values (pd.Series): Текстовые значения (None - значения нет)
+
+    Returns:
+        pd.DataFrame: Колонки value_number, value_min, value_max, value_list, parse_status с индексом values.
+            Для числа границы диапазона равны самому числу, для списка - наименьшему и наибольшему значениям,
+            чтобы числовые условия проверялись по value_min и value_max для любого числового статуса
+    """
+    text = _normalize(values)
+    result = pd.DataFrame(
+        {
+            "value_number": pd.Series(float("nan"), index=values.index),
+            "value_min": pd.Series(float("nan"), index=values.index),
+            "value_max": pd.Series(float("nan"), index=values.index),
+            "value_list": pd.Series(None, index=values.index, dtype=object),
+            "parse_status": pd.Series(ParseStatus.TEXT.value, index=values.index, dtype=object),
+        }
+    )
+    result.loc[text.isin(_EMPTY_VALUES), "parse_status"] = ParseStatus.EMPTY.value
+
+    scalar = text.str.extract(rf"^{_SCALAR}$")["number"]
+    mask = scalar.notna()
+    numbers = to_numbers(scalar[mask])
+    result.loc[mask, ["value_number", "value_min", "value_max"]] = numbers.to_numpy()[:, None].repeat(3, axis=1)
+    result.loc[mask, "parse_status"] = ParseStatus.NUMBER.value
+
+    bound = text.str.extract(rf"^{_PLUS_MINUS}$")["bound"]
+    mask = bound.notna()
+    numbers = to_numbers(bound[mask]).abs()
+    result.loc[mask, "value_min"] = -numbers
+    result.loc[mask, "value_max"] = numbers
+    result.loc[mask, "parse_status"] = ParseStatus.RANGE.value
+
+    bounds = text.str.extract(rf"^{_RANGE}$")
+    mask = bounds["low"].notna()
+    low, high = to_numbers(bounds.loc[mask, "low"]), to_numbers(bounds.loc[mask, "high"])
+    result.loc[mask, "value_min"] = pd.concat([low, high], axis=1).min(axis=1)
+    result.loc[mask, "value_max"] = pd.concat([low, high], axis=1).max(axis=1)
+    result.loc[mask, "parse_status"] = ParseStatus.RANGE.value
+
+    for pattern, status in ((_LIST, ParseStatus.LIST), (_DIMENSIONS, ParseStatus.DIMENSIONS)):
+        mask = text.str.fullmatch(pattern) & (result["parse_status"] == ParseStatus.TEXT.value)
+        if not mask.any():
+            continue
+        # Числа без пояснений в скобках: по одной строке на число с индексом исходной строки
+        tokens = text[mask].str.replace(r"\([^)]*\)", "", regex=True).str.findall(_NUMBER).explode()
+        numbers = to_numbers(tokens)
+        rendered = numbers.map(repr).str.replace(r"\.0$", "", regex=True)
+        result.loc[mask, "value_list"] = rendered.groupby(level=0).agg(LIST_SEPARATOR.join)
+        if status is ParseStatus.LIST:
+            # Границы габаритов не имеют смысла: числа относятся к разным осям
+            result.loc[mask, "value_min"] = numbers.groupby(level=0).min()
+            result.loc[mask, "value_max"] = numbers.groupby(level=0).max()
+        result.loc[mask, "parse_status"] = status.value
+    return result
+
+
+def parse_requirements(names: pd.Series, values: pd.Series) -> pd.DataFrame:
+    """
+    Разбирает требования в колонки PARSED_COLUMNS.
+
+    Args:
+        names (pd.Series): Наименования параметров
+        values (pd.Series): Текстовые значения с тем же индексом
+
+    Returns:
+        pd.DataFrame: Колонки PARSED_COLUMNS с индексом values
+    """
+    result = parse_values(values)
+    result.insert(0, "unit", parse_units(names).to_numpy())
+    return result[list(PARSED_COLUMNS)]
@@ -13,6 +13,7 @@ from machine_tools.app.services.scripts import (
     FinderContainer,
     find_names,
     get_machine_info_by_name,
+    get_machines_info_by_names,
     update,
 )
 
@@ -26,5 +27,6 @@ __all__ = [
     "get_finder_with_indexed_info",
     "find_names",
     "get_machine_info_by_name",
+    "get_machines_info_by_names",
     "update",
 ]
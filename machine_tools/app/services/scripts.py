@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 # ---------------------------------------------------------------------------------------------------------------------
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 from machine_tools.app.containers import FinderContainer
 from machine_tools.app.schemas import MachineInfo, MachineUpdate
@@ -38,6 +38,25 @@ def get_machine_info_by_name(name: str) -> Optional[MachineInfo]:
         return None
 
 
+def get_machines_info_by_names(names: Iterable[str]) -> Dict[str, Optional[MachineInfo]]:
+    """Запрашивает из БД информацию о нескольких станках по их именам
+    Все станки выбираются одним запросом `lower(name) IN (...)`, технические требования берутся из колонки spec
+    тех же строк, поэтому количество обращений к БД не зависит от длины списка.
+    Args:
+        names: имена станков (точное совпадение без учета регистра, как в get_machine_info_by_name)
+    Returns:
+        словарь {имя в написании запроса: информация о станке} в порядке запроса;
+        для ненайденных станков значение None
+    """
+    names = list(dict.fromkeys(names))
+    if not names:
+        return {}
+    container = FinderContainer()
+    finder = container.finder_with_dict_info()
+    found = {name.lower(): info for name, info in finder.find_by_names(names).items()}
+    return {name: found.get(name.lower()) for name in names}
+
+
 def _dict_to_machine_update(machine_info: dict) -> MachineUpdate:
     """
     Преобразует словарь в объект MachineUpdate.
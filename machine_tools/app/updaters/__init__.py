@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 # ---------------------------------------------------------------------------------------------------------------------
+from machine_tools.app.updaters.async_updater import AsyncMachineUpdater
 from machine_tools.app.updaters.updater import MachineUpdater
 
-__all__ = ["MachineUpdater"]
+__all__ = ["AsyncMachineUpdater", "MachineUpdater"]
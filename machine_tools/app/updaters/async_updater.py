@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+from typing import Any, Dict, Optional, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from machine_tools.app.db.async_session_manager import async_session_manager
+from machine_tools.app.db.query_builder import QueryBuilder
+from machine_tools.app.db.query_cache import invalidate_caches
+from machine_tools.app.schemas.machine import MachineUpdate
+
+
+class AsyncMachineUpdater:
+    """
+    Асинхронный класс для обновления данных станков в базе данных.
+
+    Повторяет API MachineUpdater, методы update_by_* - корутины. Запросы обновления строит QueryBuilder.
+    """
+
+    def __init__(self, session: Optional[AsyncSession] = None):
+        """
+        Инициализация обновлятора.
+
+        Args:
+            session (AsyncSession, optional): Асинхронная сессия БД. Если не указана, будет создана новая
+                и закрыта при выходе из контекстного менеджера.
+        """
+        self._owns_session: bool = session is None
+        self.session: AsyncSession = session or async_session_manager.get_session()
+
+    def _new_builder(self) -> QueryBuilder:
+        """Построитель запросов. Сессию он не использует: запросы выполняет AsyncSession"""
+        return QueryBuilder(self.session)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self) -> None:
+        """Закрывает сессию, если она была создана обновлятором"""
+        if self._owns_session:
+            await self.session.close()
+
+    async def _update(self, builder: QueryBuilder, update_data: Dict[str, Any]) -> int:
+        """
+        Выполняет запросы обновления построителя.
+
+        Args:
+            builder (QueryBuilder): Построитель с фильтрами
+            update_data (Dict[str, Any]): Данные для обновления
+
+        Returns:
+            int: Количество обновленных записей
+        """
+        stmt, requirement_statements = builder.update_statements(update_data)
+
+        result = await self.session.execute(stmt)
+        await self.session.commit()
+
+        if requirement_statements:
+            for requirement_statement in requirement_statements:
+                await self.session.execute(requirement_statement)
+            await self.session.commit()
+
+        # Данные изменились, закэшированные результаты поиска устарели
+        invalidate_caches()
+        return result.rowcount
+
+    async def update_by_id(self, machine_id: int, update_data: Union[MachineUpdate, Dict[str, Any]]) -> bool:
+        """
+        Обновляет данные станка по его ID.
+
+        Args:
+            machine_id (int): ID станка для обновления
+            update_data (Union[MachineUpdate, Dict[str, Any]]): Данные для обновления
+
+        Returns:
+            bool: True если обновление прошло успешно, False если станок не найден
+        """
+        if isinstance(update_data, dict):
+            update_data = MachineUpdate(**update_data)
+
+        builder = self._new_builder().filter_by_id(machine_id)
+        result = await self._update(builder, update_data.get_flat_dict())
+        return result > 0
+
+    async def update_by_name(
+        self,
+        name: str,
+        update_data: Dict[str, Any],
+        case_sensitive: bool = True,
+        exact_match: bool = True,
+    ) -> int:
+        """
+        Обновляет данные станков по имени.
+
+        Args:
+            name (str): Имя станка для поиска
+            update_data Dict[str, Any]: Данные для обновления
+            case_sensitive (bool, optional): Учитывать регистр. По умолчанию True
+            exact_match (bool, optional): Точное совпадение. По умолчанию True
+
+        Returns:
+            int: Количество обновленных станков
+        """
+        builder = self._new_builder().filter_by_name(name, case_sensitive=case_sensitive, exact_match=exact_match)
+        return await self._update(builder, update_data)
+
+    async def update_by_power(
+        self,
+        update_data: Union[MachineUpdate, Dict[str, Any]],
+        min_power: float = None,
+        max_power: float = None,
+    ) -> int:
+        """
+        Обновляет данные станков по диапазону мощности.
+
+        Args:
+            update_data (Union[MachineUpdate, Dict[str, Any]]): Данные для обновления
+            min_power (float, optional): Минимальная мощность
+            max_power (float, optional): Максимальная мощность
+
+        Returns:
+            int: Количество обновленных станков
+        """
+        if isinstance(update_data, dict):
+            update_data = MachineUpdate(**update_data)
+
+        builder = self._new_builder().filter_by_power(min_power=min_power, max_power=max_power)
+        return await self._update(builder, update_data.model_dump(exclude_unset=True))
+
+    async def update_by_efficiency(
+        self,
+        update_data: Union[MachineUpdate, Dict[str, Any]],
+        min_efficiency: float = None,
+        max_efficiency: float = None,
+    ) -> int:
+        """
+        Обновляет данные станков по диапазону КПД.
+
+        Args:
+            update_data (Union[MachineUpdate, Dict[str, Any]]): Данные для обновления
+            min_efficiency (float, optional): Минимальный КПД
+            max_efficiency (float, optional): Максимальный КПД
+
+        Returns:
+            int: Количество обновленных станков
+        """
+        if isinstance(update_data, dict):
+            update_data = MachineUpdate(**update_data)
+
+        builder = self._new_builder().filter_by_efficiency(min_efficiency=min_efficiency, max_efficiency=max_efficiency)
+        return await self._update(builder, update_data.model_dump(exclude_unset=True))
+
+    async def update_by_accuracy(self, update_data: Union[MachineUpdate, Dict[str, Any]], accuracy: str) -> int:
+        """
+        Обновляет данные станков по классу точности.
+
+        Args:
+            update_data (Union[MachineUpdate, Dict[str, Any]]): Данные для обновления
+            accuracy (str): Класс точности
+
+        Returns:
+            int: Количество обновленных станков
+        """
+        if isinstance(update_data, dict):
+            update_data = MachineUpdate(**update_data)
+
+        builder = self._new_builder().filter_by_accuracy(accuracy)
+        return await self._update(builder, update_data.get_flat_dict())
+
+    async def update_by_automation(self, update_data: Union[MachineUpdate, Dict[str, Any]], automation: str) -> int:
+        """
+        Обновляет данные станков по уровню автоматизации.
+
+        Args:
+            update_data (Union[MachineUpdate, Dict[str, Any]]): Данные для обновления
+            automation (str): Уровень автоматизации
+
+        Returns:
+            int: Количество обновленных станков
+        """
+        if isinstance(update_data, dict):
+            update_data = MachineUpdate(**update_data)
+
+        builder = self._new_builder().filter_by_automation(automation)
+        return await self._update(builder, update_data.get_flat_dict())
+
+    async def update_by_specialization(
+        self, update_data: Union[MachineUpdate, Dict[str, Any]], specialization: str
+    ) -> int:
+        """
+        Обновляет данные станков по специализации.
+
+        Args:
+            update_data (Union[MachineUpdate, Dict[str, Any]]): Данные для обновления
+            specialization (str): Специализация
+
+        Returns:
+            int: Количество обновленных станков
+        """
+        if isinstance(update_data, dict):
+            update_data = MachineUpdate(**update_data)
+
+        builder = self._new_builder().filter_by_specialization(specialization)
+        return await self._update(builder, update_data.get_flat_dict())
+
+    async def update_by_software_control(
+        self, update_data: Union[MachineUpdate, Dict[str, Any]], software_control: str
+    ) -> int:
+        """
+        Обновляет данные станков по наличию системы управления.
+
+        Args:
+            update_data (Union[MachineUpdate, Dict[str, Any]]): Данные для обновления
+            software_control (str): Тип программного управления
+
+        Returns:
+            int: Количество обновленных станков
+        """
+        if isinstance(update_data, dict):
+            update_data = MachineUpdate(**update_data)
+
+        builder = self._new_builder().filter_by_software_control(software_control)
+        return await self._update(builder, update_data.get_flat_dict())
@@ -3,7 +3,13 @@
 # ---------------------------------------------------------------------------------------------------------------------
 import click
 
+from machine_tools.app.db.csv_sync import get_csv_dir
+from machine_tools.app.db.export import EXPORT_FORMATS, EXPORT_METHODS, EXPORT_TABLES, export_tables
 from machine_tools.app.db.init_db import init_db_from_csv
+from machine_tools.app.db.machine_infos import refresh_infos
+from machine_tools.app.db.requirements_importer import normalize_encodings, reparse_requirements
+from machine_tools.app.db.restore import restore_backup
+from machine_tools.app.db.session_manager import session_manager
 
 
 @click.group()
@@ -13,9 +19,78 @@ def main():
 
 
 @main.command()
-def init():
+@click.option("--workers", type=int, default=None, help="Количество процессов разбора CSV (по умолчанию - число ядер)")
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Загрузить только CSV, изменившиеся с прошлого импорта (по манифесту хешей), с построчной разницей",
+)
+def init(workers, incremental):
     """Инициализирует базу данных"""
-    init_db_from_csv()
+    init_db_from_csv(workers=workers, incremental=incremental)
+
+
+@main.command("normalize-encodings")
+@click.option("--csv-dir", type=click.Path(exists=True, file_okay=False), default=None, help="Папка с CSV")
+def normalize_encodings_command(csv_dir):
+    """Перекодирует CSV-файлы требований в UTF-8, чтобы импорт не определял кодировку"""
+    with session_manager.engine.begin() as connection:
+        converted = normalize_encodings(csv_dir or get_csv_dir(), connection)
+    for filename, encoding in converted:
+        click.echo(f"{filename}: {encoding} -> utf-8")
+    click.echo(f"Перекодировано файлов: {len(converted)}")
+
+
+@main.command("reparse-requirements")
+@click.option("--missing", is_flag=True, help="Только требования без результата разбора")
+def reparse_requirements_command(missing):
+    """Заново разбирает значения технических требований в типизированные колонки"""
+    with session_manager.engine.begin() as connection:
+        click.echo(f"Разобрано требований: {reparse_requirements(connection, only_missing=missing)}")
+
+
+@main.command("refresh-infos")
+@click.option("--all", "rebuild_all", is_flag=True, help="Все станки, а не только без актуального представления")
+def refresh_infos_command(rebuild_all):
+    """Сохраняет представления MachineInfo станков в БД для форматтеров с кэшем"""
+    with session_manager.engine.begin() as connection:
+        click.echo(f"Собрано представлений: {refresh_infos(connection, only_stale=not rebuild_all)}")
+
+
+@main.command()
+@click.option(
+    "--output-dir", type=click.Path(file_okay=False), default=None, help="Папка (по умолчанию database_backups)"
+)
+@click.option("--format", "fmt", type=click.Choice(EXPORT_FORMATS), default="csv", help="Формат файлов")
+@click.option("--gzip", "compress", is_flag=True, help="Сжимать файлы gzip")
+@click.option(
+    "--table", "tables", type=click.Choice(list(EXPORT_TABLES)), multiple=True, help="Таблица (по умолчанию все)"
+)
+@click.option("--method", type=click.Choice(EXPORT_METHODS), default="auto", help="COPY TO STDOUT или серверный курсор")
+def export(output_dir, fmt, compress, tables, method):
+    """Потоково выгружает таблицы в резервную копию"""
+    for stats in export_tables(output_dir=output_dir, tables=tables or None, fmt=fmt, compress=compress, method=method):
+        click.echo(stats)
+
+
+@main.command()
+@click.option(
+    "--backup-dir",
+    type=click.Path(exists=True, file_okay=False),
+    default=None,
+    help="Папка (по умолчанию database_backups)",
+)
+@click.option(
+    "--table",
+    "tables",
+    type=click.Choice(list(EXPORT_TABLES)),
+    multiple=True,
+    help="Таблица (по умолчанию все, файлы которых есть в папке)",
+)
+@click.option("--no-verify", is_flag=True, help="Не сверять количество строк и контрольные суммы")
+def restore(backup_dir, tables, no_verify):
+    """Восстанавливает таблицы из резервной копии в одной транзакции"""
+    click.echo(restore_backup(backup_dir=backup_dir, tables=tables or None, verify=not no_verify))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import unittest
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, select
+
+from machine_tools.app.db.bulk_loader import bulk_load, copy_buffer, frame_to_rows, load_frame
+from machine_tools.app.models import Base, Machine, TechnicalRequirement
+
+
+class TestBulkLoader(unittest.TestCase):
+    """Тесты для массовой загрузки"""
+
+    def setUp(self):
+        """Подготовка тестовой БД"""
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.frame = pd.DataFrame(
+            {
+                "name": ["16К20", "2Н135", 1283],
+                "group": [1.0, np.nan, 6.0],
+                "length": ["2505", "1030.7", "нет"],
+                "power": [10, None, 7.5],
+                "manufacturer": ["Красный пролетарий", np.nan, ""],
+            }
+        )
+
+    def tearDown(self):
+        """Очистка БД"""
+        self.engine.dispose()
+
+    def test_01_frame_to_rows(self):
+        """Тест приведения типов по колонкам таблицы"""
+        columns = ["name", "group", "length", "power", "manufacturer", "city"]
+        rows = frame_to_rows(self.frame, Machine.__table__, columns)
+        self.assertEqual(
+            rows,
+            [
+                ("16К20", 1, 2505, 10.0, "Красный пролетарий", None),
+                ("2Н135", None, 1030, None, None, None),
+                ("1283", 6, None, 7.5, "", None),
+            ],
+        )
+        self.assertIsInstance(rows[0][1], int)
+        self.assertIsInstance(rows[0][3], float)
+
+    def test_02_copy_buffer(self):
+        """Тест формата CSV для COPY: NULL и пустая строка различаются"""
+        rows = [("a\"b", None, 1, 0.1, ""), ("x,y", 2.5, None, datetime(2025, 1, 2, 3, 4, 5), "\n")]
+        self.assertEqual(
+            copy_buffer(rows).getvalue(),
+            '"a""b",,1,0.1,""\n"x,y",2.5,,2025-01-02T03:04:05,"\n"\n',
+        )
+
+    def test_03_executemany(self):
+        """Тест загрузки через executemany"""
+        with self.engine.begin() as connection:
+            stats = load_frame(connection, Machine.__table__, self.frame)
+        self.assertEqual((stats.table, stats.rows, stats.method), ("machine_tools", 3, "executemany"))
+        self.assertGreater(stats.rows_per_second, 0)
+        self.assertIn("строк/с", str(stats))
+
+        with self.engine.connect() as connection:
+            rows = connection.execute(select(Machine.name, Machine.length, Machine.manufacturer).order_by(Machine.id))
+            self.assertEqual(
+                [tuple(row) for row in rows],
+                [("16К20", 2505, "Красный пролетарий"), ("2Н135", 1030, None), ("1283", None, "")],
+            )
+
+    def test_04_methods(self):
+        """Тест выбора метода загрузки"""
+        with self.engine.begin() as connection:
+            with self.assertRaises(ValueError):
+                bulk_load(connection, TechnicalRequirement.__table__, ["requirement"], [("a",)], method="copy")
+            with self.assertRaises(ValueError):
+                bulk_load(connection, TechnicalRequirement.__table__, ["requirement"], [("a",)], method="unknown")
+            stats = bulk_load(connection, TechnicalRequirement.__table__, ["machine_id", "requirement"], [])
+        self.assertEqual(stats.rows, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import unittest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from machine_tools.app.db.catalog import MachineCatalog
+from machine_tools.app.db.catalog_query_builder import CatalogQueryBuilder
+from machine_tools.app.db.query_builder import QueryBuilder
+from machine_tools.app.db.session import MachineToolsSession
+from machine_tools.app.finders.finder import MachineFinder
+from machine_tools.app.formatters import (
+    DictNameFormatter,
+    IndexedNameFormatter,
+    ListMachineInfoFormatter,
+    ListNameFormatter,
+)
+from machine_tools.app.models import Base, Machine, TechnicalRequirement
+
+
+class TestMachineCatalog(unittest.TestCase):
+    """Тесты для MachineCatalog и CatalogQueryBuilder"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Подготовка тестовой БД и каталога"""
+        cls.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(cls.engine)
+        cls.Session = sessionmaker(bind=cls.engine, class_=MachineToolsSession)
+
+        session = cls.Session()
+        session.add_all(
+            [
+                Machine(
+                    name="16К20",
+                    group=1,
+                    type=6,
+                    power=10.0,
+                    efficiency=0.75,
+                    accuracy="Н",
+                    automation="Ручной",
+                    software_control="Нет",
+                    specialization="Универсальный",
+                    weight_class="Средний",
+                ),
+                Machine(
+                    name="16К20Ф3",
+                    group=1,
+                    type=6,
+                    power=11.0,
+                    efficiency=0.8,
+                    accuracy="П",
+                    automation="Полуавтомат",
+                    software_control="ЧПУ",
+                    specialization="Универсальный",
+                    weight_class="Средний",
+                ),
+                Machine(
+                    name="2Н135",
+                    group=2,
+                    type=1,
+                    power=4.0,
+                    efficiency=None,
+                    accuracy="Н",
+                    automation="Ручной",
+                    software_control="Нет",
+                    specialization="Универсальный",
+                    weight_class="Лёгкий",
+                ),
+                Machine(
+                    name="6Р13",
+                    group=6,
+                    type=1,
+                    power=None,
+                    efficiency=0.8,
+                    accuracy="Н",
+                    automation="Ручной",
+                    software_control="Нет",
+                    specialization="Специализированный",
+                    weight_class="Тяжёлый",
+                ),
+            ]
+        )
+        session.add_all(
+            [
+                TechnicalRequirement(
+                    machine_id=1,
+                    requirement="Наибольший диаметр, мм",
+                    value="400",
+                    value_number=400.0,
+                    value_min=400.0,
+                    value_max=400.0,
+                ),
+                TechnicalRequirement(
+                    machine_id=1,
+                    requirement="Мощность, кВт",
+                    value="10",
+                    value_number=10.0,
+                    value_min=10.0,
+                    value_max=10.0,
+                ),
+                TechnicalRequirement(machine_id=3, requirement="Конус шпинделя", value="Морзе 4"),
+                TechnicalRequirement(
+                    machine_id=3, requirement="Наибольший диаметр, мм", value="35..50", value_min=35.0, value_max=50.0
+                ),
+            ]
+        )
+        session.commit()
+        cls.session = session
+        cls.catalog = MachineCatalog.from_session(session)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Очистка БД после всех тестов"""
+        cls.session.close()
+        Base.metadata.drop_all(cls.engine)
+
+    def _names(self, build):
+        """Имена станков из каталога"""
+        return [machine.name for machine in build(CatalogQueryBuilder(self.catalog)).execute()]
+
+    def _assert_same(self, build):
+        """Проверяет, что каталог и БД возвращают одинаковые станки в одинаковом порядке"""
+        expected = [machine.name for machine in build(QueryBuilder(self.session)).execute()]
+        actual = [machine.name for machine in build(CatalogQueryBuilder(self.catalog)).execute()]
+        self.assertEqual(actual, expected)
+        return actual
+
+    def test_01_load(self):
+        """Тест загрузки каталога"""
+        self.assertEqual(len(self.catalog), 4)
+        self.assertEqual(self.catalog.rows[0].name, "16К20")
+        self.assertEqual(len(self.catalog.rows[0].technical_requirements), 2)
+        self.assertEqual(self.catalog.rows[1].technical_requirements, ())
+        self.assertEqual(self.catalog.codes["accuracy"].tolist(), [0, 1, 0, 0])
+
+    def test_02_filters(self):
+        """Тест совпадения фильтров с QueryBuilder"""
+        self._assert_same(lambda b: b.filter_by_group(1))
+        self._assert_same(lambda b: b.filter_by_group([1, 2]))
+        self._assert_same(lambda b: b.filter_by_type("1"))
+        self._assert_same(lambda b: b.filter_by_power(min_power=5.0))
+        self._assert_same(lambda b: b.filter_by_power(max_power=10.0))
+        self._assert_same(lambda b: b.filter_by_efficiency(min_efficiency=0.8))
+        self._assert_same(lambda b: b.filter_by_accuracy("Н"))
+        self._assert_same(lambda b: b.filter_by_accuracy(["П", "В"]))
+        self._assert_same(lambda b: b.filter_by_automation("Ручной"))
+        self._assert_same(lambda b: b.filter_by_specialization("Специализированный"))
+        self._assert_same(lambda b: b.filter_by_software_control("ЧПУ"))
+        self._assert_same(lambda b: b.filter_by_accuracy("Несуществующий"))
+
+    def test_03_filter_by_name(self):
+        """Тест фильтрации по имени"""
+        # lower() в SQLite работает только с ASCII, поэтому регистронезависимый поиск кириллицы проверяется явно
+        self.assertEqual(self._names(lambda b: b.filter_by_name("16к20")), ["16К20", "16К20Ф3"])
+        self.assertEqual(self._names(lambda b: b.filter_by_name("16к20ф3", exact_match=True)), ["16К20Ф3"])
+        self.assertEqual(self._assert_same(lambda b: b.filter_by_name("16К20", exact_match=True)), ["16К20"])
+        self._assert_same(lambda b: b.filter_by_name("16к20", case_sensitive=True, exact_match=True))
+        self._assert_same(lambda b: b.filter_by_name("Ф3", case_sensitive=True))
+        self._assert_same(lambda b: b.filter_by_name("1_К", exact_match=False))
+        self.assertEqual(self._names(lambda b: b.filter_by_names(["16к20ф3", "2Н135"])), ["16К20Ф3", "2Н135"])
+        self._assert_same(lambda b: b.filter_by_names(["16К20", "2Н135"]))
+        self._assert_same(lambda b: b.filter_by_names(["16К20", "16к20ф3"], case_sensitive=True))
+
+    def test_04_order_limit_offset(self):
+        """Тест сортировки, лимита и смещения"""
+        # NULL сортируется как в PostgreSQL: в начале по убыванию и в конце по возрастанию
+        self.assertEqual(
+            self._names(lambda b: b.order_by("power", descending=True)), ["6Р13", "16К20Ф3", "16К20", "2Н135"]
+        )
+        self.assertEqual(self._names(lambda b: b.order_by("power")), ["2Н135", "16К20", "16К20Ф3", "6Р13"])
+        self._assert_same(lambda b: b.order_by("name", descending=True))
+        self._assert_same(lambda b: b.order_by("group").order_by("power", descending=True))
+        self._assert_same(lambda b: b.filter_by_power(min_power=0).order_by("power").offset(1).limit(2))
+
+    def test_05_get_unique_values(self):
+        """Тест получения уникальных значений"""
+        builder = CatalogQueryBuilder(self.catalog).filter_by_group(1)
+        self.assertEqual(builder.get_unique_values("accuracy"), ["Н", "П"])
+        self.assertEqual(builder.get_unique_values("unknown"), [])
+
+    def test_06_finder_with_catalog(self):
+        """Тест поисковика с каталогом: тот же результат форматтеров, что и с БД"""
+        with MachineFinder(session=self.session, formatter=ListMachineInfoFormatter()) as finder:
+            expected = finder.find_by_group(1)
+        finder = MachineFinder(catalog=self.catalog, formatter=ListMachineInfoFormatter())
+        self.assertIsNone(finder.session)
+        self.assertEqual(finder.find_by_group(1), expected)
+        self.assertEqual(expected[0].technical_requirements, {"Наибольший диаметр, мм": "400", "Мощность, кВт": "10"})
+
+        finder.set_formatter(DictNameFormatter())
+        self.assertEqual(finder.find_by_power(min_power=5.0, limit=1), {1: "16К20"})
+
+    def test_07_stream(self):
+        """Тест потоковой выдачи: сквозная нумерация и совпадение с БД"""
+        finder = MachineFinder(catalog=self.catalog, formatter=IndexedNameFormatter())
+        self.assertEqual(list(finder.stream(batch_size=3)), [{1: "16К20", 2: "16К20Ф3", 3: "2Н135"}, {4: "6Р13"}])
+        self.assertEqual(list(finder.iter_by_group(1, batch_size=1)), [(1, "16К20"), (2, "16К20Ф3")])
+
+        with MachineFinder(session=self.session, formatter=ListNameFormatter()) as db_finder:
+            self.assertEqual(list(db_finder.iter_all(batch_size=3)), ["16К20", "16К20Ф3", "2Н135", "6Р13"])
+            self.assertEqual(list(db_finder.iter_by_type([1], batch_size=1)), ["2Н135", "6Р13"])
+
+    def test_08_filter_by_requirement(self):
+        """Тест фильтра по требованиям: каталог разбирает значения так же, как импорт в БД"""
+        name = "Наибольший диаметр, мм"
+        self.assertEqual(self._assert_same(lambda b: b.filter_by_requirement(name, ">=", 100)), ["16К20"])
+        self.assertEqual(self._assert_same(lambda b: b.filter_by_requirement(name, "<=", 40)), ["2Н135"])
+        self.assertEqual(self._assert_same(lambda b: b.filter_by_requirement(name, "covers", 45)), ["2Н135"])
+        self.assertEqual(self._assert_same(lambda b: b.filter_by_requirement(name, "==", 400.0)), ["16К20"])
+        self.assertEqual(
+            self._assert_same(lambda b: b.filter_by_requirement("Конус шпинделя", "==", "Морзе 4").filter_by_group(2)),
+            ["2Н135"],
+        )
+        self.assertEqual(self._assert_same(lambda b: b.filter_by_requirement("Нет такого", ">", 0)), [])
+        with self.assertRaises(ValueError):
+            CatalogQueryBuilder(self.catalog).filter_by_requirement(name, "covers", "400")
+
+    def test_09_finder_by_requirements(self):
+        """Тест поиска по нескольким требованиям через поисковик с БД и с каталогом"""
+        requirements = [("Наибольший диаметр, мм", ">=", 40), ("Конус шпинделя", "==", "Морзе 4")]
+        with MachineFinder(session=self.session) as finder:
+            self.assertEqual(finder.find_by_requirements(requirements), ["2Н135"])
+            self.assertEqual(finder.find_by_requirements(requirements[:1]), ["16К20", "2Н135"])
+        finder = MachineFinder(catalog=self.catalog)
+        self.assertEqual(finder.find_by_requirements(requirements[:1], limit=1), ["16К20"])
+
+    def test_10_filter_by_spec(self):
+        """Тест фильтра по спецификации: каталог и БД, поиск по спецификации"""
+        spec = {"Конус шпинделя": "Морзе 4"}
+        self.assertEqual(self._assert_same(lambda b: b.filter_by_spec(spec)), ["2Н135"])
+        self.assertEqual(self._assert_same(lambda b: b.filter_by_spec({**spec, "Мощность, кВт": 10})), [])
+        self._assert_same(lambda b: b.filter_by_spec({}))
+        with MachineFinder(session=self.session, formatter=ListMachineInfoFormatter()) as finder:
+            expected = finder.find_by_spec({"Мощность, кВт": 10})
+        finder = MachineFinder(catalog=self.catalog, formatter=ListMachineInfoFormatter())
+        self.assertEqual(finder.find_by_spec({"Мощность, кВт": 10}), expected)
+        self.assertEqual([machine.name for machine in expected], ["16К20"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from sqlalchemy import create_engine, select
+
+from machine_tools.app.db.csv_sync import diff_requirements, load_machines, record_import, sync_from_csv
+from machine_tools.app.db.requirements_importer import import_requirements, normalize_encodings
+from machine_tools.app.models import Base, ImportManifest, Machine, TechnicalRequirement
+
+
+class TestCsvSync(unittest.TestCase):
+    """Тесты для инкрементальной синхронизации CSV с БД по манифесту хешей"""
+
+    def setUp(self):
+        """Подготовка CSV-файлов и БД после полного импорта"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_dir = Path(self.tmp.name)
+        self._write("machine_tools.csv", "name,group,type,power\n16К20,1,6,10\n2Н135,2,1,4\n")
+        self._write("16К20.csv", 'index,Наименование параметра,16К20\n0,"Диаметр, мм",400\n1,Конус,Морзе 6\n')
+        self._write("2Н135.csv", "index,Наименование параметра,2Н135\n0,Конус шпинделя,Морзе 4\n")
+
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        with self.engine.begin() as connection:
+            load_machines(connection, str(self.csv_dir / "machine_tools.csv"))
+            machine_ids = dict(connection.execute(select(Machine.name, Machine.id)).all())
+            report = import_requirements(connection, str(self.csv_dir), machine_ids, workers=1)
+            record_import(connection, str(self.csv_dir), report.imported)
+
+    def tearDown(self):
+        """Очистка"""
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    def _write(self, filename, content, encoding="utf-8"):
+        """Записывает CSV-файл, сдвигая время изменения, чтобы его заметила проверка размера и mtime"""
+        path = self.csv_dir / filename
+        mtime = path.stat().st_mtime_ns + 10**9 if path.exists() else None
+        path.write_text(content, encoding=encoding)
+        if mtime is not None:
+            os.utime(path, ns=(mtime, mtime))
+
+    def _sync(self):
+        """Синхронизация в отдельной транзакции"""
+        with self.engine.begin() as connection:
+            return sync_from_csv(connection, str(self.csv_dir), workers=1)
+
+    def _requirements(self):
+        """Строки таблицы технических требований: (id, станок, параметр, значение)"""
+        with self.engine.connect() as connection:
+            query = select(
+                TechnicalRequirement.id,
+                TechnicalRequirement.machine_name,
+                TechnicalRequirement.requirement,
+                TechnicalRequirement.value,
+            ).order_by(TechnicalRequirement.id)
+            return [tuple(row) for row in connection.execute(query)]
+
+    def _manifest(self):
+        """Записи манифеста по именам файлов"""
+        with self.engine.connect() as connection:
+            return {row.filename: row for row in connection.execute(select(ImportManifest.__table__))}
+
+    def test_01_diff_requirements(self):
+        """Тест построчной разницы: совпадения остаются, замена значения - обновление"""
+        existing = [(1, "А", "1"), (2, "Б", "2"), (3, "В", "3"), (4, "А", "1")]
+        deletes, updates, inserts = diff_requirements(existing, [("А", "1"), ("Б", "20"), ("Г", "4"), ("А", "1")])
+        self.assertEqual(deletes, [3])
+        self.assertEqual(updates, [(2, "20")])
+        self.assertEqual(inserts, [("Г", "4")])
+
+    def test_02_record_import(self):
+        """Тест манифеста после полного импорта"""
+        manifest = self._manifest()
+        self.assertEqual(set(manifest), {"machine_tools.csv", "16К20.csv", "2Н135.csv"})
+        self.assertEqual(manifest["16К20.csv"].machine_name, "16К20")
+        self.assertEqual(manifest["16К20.csv"].rows, 2)
+        self.assertEqual(manifest["16К20.csv"].encoding, "utf-8")
+        self.assertEqual(len(manifest["2Н135.csv"].sha256), 64)
+
+    def test_03_nothing_changed(self):
+        """Тест повторной синхронизации без изменений: файлы не разбираются, БД не меняется"""
+        before = self._requirements()
+        report = self._sync()
+        self.assertEqual(report.changed, [])
+        self.assertEqual(report.unchanged, 3)
+        self.assertEqual(self._requirements(), before)
+
+    def test_04_touched_file(self):
+        """Тест файла с новым временем изменения, но прежним содержимым: обновляется только манифест"""
+        path = self.csv_dir / "2Н135.csv"
+        self._write("2Н135.csv", path.read_text(encoding="utf-8"))
+        report = self._sync()
+        self.assertEqual(report.changed, [])
+        self.assertEqual(self._manifest()["2Н135.csv"].mtime_ns, path.stat().st_mtime_ns)
+
+    def test_05_changed_file(self):
+        """Тест измененного файла: применяется построчная разница, остальные строки сохраняют id, spec пересобирается"""
+        before = self._requirements()
+        self._write("16К20.csv", 'index,Наименование параметра,16К20\n0,"Диаметр, мм",500\n1,Масса,3000\n')
+        report = self._sync()
+        self.assertEqual(report.changed, ["16К20.csv"])
+        self.assertEqual(
+            (report.requirements_inserted, report.requirements_updated, report.requirements_deleted), (1, 1, 1)
+        )
+
+        after = self._requirements()
+        self.assertEqual(after[0], (before[0][0], "16К20", "Диаметр, мм", "500"))
+        self.assertIn(before[2], after)
+        self.assertEqual([row[2:] for row in after if row[1] == "16К20"], [("Диаметр, мм", "500"), ("Масса", "3000")])
+        self.assertEqual(self._manifest()["16К20.csv"].rows, 2)
+        with self.engine.connect() as connection:
+            query = select(TechnicalRequirement.value_number, TechnicalRequirement.unit).where(
+                TechnicalRequirement.id == before[0][0]
+            )
+            self.assertEqual(tuple(connection.execute(query).one()), (500.0, "мм"))
+            specs = dict(connection.execute(select(Machine.name, Machine.spec)).all())
+        self.assertEqual(
+            specs, {"16К20": {"Диаметр, мм": "500", "Масса": "3000"}, "2Н135": {"Конус шпинделя": "Морзе 4"}}
+        )
+        self.assertEqual(self._sync().changed, [])
+
+    def test_06_machines_and_removed_files(self):
+        """Тест изменения machine_tools.csv, нового файла и удаленного файла"""
+        self._write("machine_tools.csv", "name,group,type,power\n16К20,1,6,11\n2Н135,2,1,4\n6Р13,6,1,7.5\n")
+        self._write("6Р13.csv", "index,Наименование параметра,6Р13\n0,Стол,320\n")
+        self._write("9999.csv", "index,Наименование параметра,9999\n0,Параметр,1\n")
+        os.remove(self.csv_dir / "2Н135.csv")
+
+        report = self._sync()
+        self.assertEqual((report.machines_inserted, report.machines_updated), (1, 1))
+        self.assertEqual(report.removed, ["2Н135.csv"])
+        self.assertEqual(report.skipped, ["9999.csv"])
+
+        with self.engine.connect() as connection:
+            self.assertEqual(connection.execute(select(Machine.power).where(Machine.name == "16К20")).scalar(), 11)
+        machines = {row[1] for row in self._requirements()}
+        self.assertEqual(machines, {"16К20", "6Р13"})
+        with self.engine.connect() as connection:
+            query = select(TechnicalRequirement.machine_id).where(TechnicalRequirement.machine_name == "6Р13")
+            self.assertEqual(connection.execute(query).scalar(), 3)
+        self.assertEqual(set(self._manifest()), {"machine_tools.csv", "16К20.csv", "6Р13.csv"})
+
+    def test_07_normalize_encodings(self):
+        """Тест перекодирования файла в UTF-8 между синхронизациями: текст требований не искажается"""
+        content = (
+            "index,Наименование параметра,16К20\n"
+            '0,"Наибольший диаметр обрабатываемой заготовки над станиной, мм",400\n'
+            "1,Конус шпинделя,Морзе 6\n"
+            "2,Частота вращения шпинделя,12.5..1600\n"
+        )
+        self._write("16К20.csv", content, encoding="cp1251")
+        self._sync()
+        before = self._requirements()
+        self.assertIn("Конус шпинделя", [row[2] for row in before])
+        self.assertEqual(self._manifest()["16К20.csv"].encoding.lower(), "windows-1251")
+
+        # Манифест обновляется вместе с файлом: неизменный текст не разбирается заново
+        with self.engine.begin() as connection:
+            self.assertEqual([row[0] for row in normalize_encodings(str(self.csv_dir), connection)], ["16К20.csv"])
+        self.assertEqual(self._manifest()["16К20.csv"].encoding, "utf-8")
+        self.assertEqual(self._sync().changed, [])
+        self.assertEqual(self._requirements(), before)
+
+        # Без соединения в манифесте остается прежняя кодировка, но UTF-8 проверяется раньше подсказки
+        self._write("16К20.csv", content, encoding="cp1251")
+        self._sync()
+        self.assertEqual([row[0] for row in normalize_encodings(str(self.csv_dir))], ["16К20.csv"])
+        report = self._sync()
+        self.assertEqual(report.changed, ["16К20.csv"])
+        self.assertEqual(report.requirements_updated + report.requirements_inserted, 0)
+        self.assertEqual(self._requirements(), before)
+        self.assertEqual(self._manifest()["16К20.csv"].encoding, "utf-8")
+
+    def test_08_machine_with_several_files(self):
+        """Тест станка, описанного несколькими файлами: новый и удаленный файл не затрагивают строки другого файла"""
+        before = self._requirements()
+        self._write("16К20_доп.csv", "index,Наименование параметра,16К20\n0,Масса,3000\n")
+        report = self._sync()
+        self.assertEqual((report.requirements_inserted, report.requirements_deleted), (1, 0))
+        rows = [row[2:] for row in self._requirements() if row[1] == "16К20"]
+        self.assertEqual(rows, [("Диаметр, мм", "400"), ("Конус", "Морзе 6"), ("Масса", "3000")])
+        self.assertEqual(self._manifest()["16К20_доп.csv"].machine_name, "16К20")
+
+        os.remove(self.csv_dir / "16К20_доп.csv")
+        report = self._sync()
+        self.assertEqual(report.removed, ["16К20_доп.csv"])
+        self.assertEqual((report.requirements_inserted, report.requirements_deleted), (0, 1))
+        self.assertEqual(self._requirements(), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
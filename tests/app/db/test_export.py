@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import csv
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from sqlalchemy import create_engine, event
+
+from machine_tools.app.db.export import export_table, export_tables
+from machine_tools.app.db.session import MachineToolsSession
+from machine_tools.app.models import Base, Machine, TechnicalRequirement
+
+
+class TestExport(unittest.TestCase):
+    """Тесты для потоковой выгрузки таблиц"""
+
+    def setUp(self):
+        """Подготовка БД в файле"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.tmp.name, 'test.db')}")
+        Base.metadata.create_all(self.engine)
+        created = datetime(2025, 5, 23, 6, 57, 11)
+        with MachineToolsSession(self.engine) as session:
+            session.add_all(
+                [
+                    Machine(name="16К20", group=1, type=6, power=10.0, created_at=created, updated_at=created),
+                    Machine(name="2Н135", group=2, type=1, city="", created_at=created, updated_at=created),
+                    TechnicalRequirement(machine_id=2, requirement="Конус шпинделя", value="Морзе 4"),
+                    TechnicalRequirement(machine_id=1, requirement='Диаметр, "мм"', value=None),
+                    TechnicalRequirement(machine_id=1, requirement="Мощность, кВт", value="10"),
+                ]
+            )
+            session.commit()
+        self.output_dir = os.path.join(self.tmp.name, "backups")
+
+    def tearDown(self):
+        """Очистка"""
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    def test_01_csv(self):
+        """Тест выгрузки в CSV: заголовок, порядок строк, NULL отличается от пустой строки"""
+        stats = export_table(self.engine, "technical_requirements", self.output_dir, batch_size=1)
+        self.assertEqual((stats.rows, stats.method), (3, "cursor"))
+        with open(stats.path, encoding="utf-8-sig", newline="") as file:
+            rows = list(csv.reader(file))
+        self.assertEqual(rows[0][:4], ["id", "machine_id", "requirement", "value"])
+        self.assertEqual([row[1:4] for row in rows[1:]][0], ["1", 'Диаметр, "мм"', ""])
+        self.assertEqual([row[0] for row in rows[1:]], ["2", "3", "1"])
+
+        with open(stats.path, encoding="utf-8-sig") as file:
+            lines = file.read().splitlines()
+        self.assertIn(',"Диаметр, ""мм""",,', lines[1])
+        self.assertFalse(os.path.exists(stats.path + ".tmp"))
+
+    def test_02_jsonl_gzip(self):
+        """Тест выгрузки в JSON Lines со сжатием"""
+        stats = export_table(self.engine, "machine_tools", self.output_dir, fmt="jsonl", compress=True)
+        self.assertTrue(stats.path.endswith("machine_tools.jsonl.gz"))
+        with gzip.open(stats.path, "rt", encoding="utf-8") as file:
+            rows = [json.loads(line) for line in file]
+        self.assertEqual([row["name"] for row in rows], ["16К20", "2Н135"])
+        self.assertEqual(rows[0]["created_at"], "2025-05-23T06:57:11")
+        self.assertIsNone(rows[0]["city"])
+        self.assertEqual(rows[1]["city"], "")
+        # Спецификация собирается из требований при восстановлении и не выгружается
+        self.assertNotIn("spec", rows[0])
+
+    def test_03_export_tables(self):
+        """Тест выгрузки всех таблиц: без экспорта снимков (SQLite) - по очереди в одной транзакции"""
+        checkouts = []
+        event.listen(self.engine, "checkout", lambda *args: checkouts.append(args))
+        results = export_tables(self.engine, self.output_dir, compress=True)
+        self.assertEqual(len(checkouts), 1)
+        self.assertEqual(
+            [stats.table for stats in results], ["machine_tools", "requirement_names", "technical_requirements"]
+        )
+        self.assertEqual([stats.rows for stats in results], [2, 3, 3])
+        self.assertEqual(
+            sorted(os.listdir(self.output_dir)),
+            ["machine_tools.csv.gz", "requirement_names.csv.gz", "technical_requirements.csv.gz"],
+        )
+
+    def test_04_invalid_arguments(self):
+        """Тест недопустимых аргументов: COPY недоступен для SQLite"""
+        with self.assertRaises(ValueError):
+            export_table(self.engine, "machine_tools", self.output_dir, method="copy")
+        with self.assertRaises(ValueError):
+            export_table(self.engine, "machine_tools", self.output_dir, fmt="xml")
+        with self.assertRaises(ValueError):
+            export_table(self.engine, "unknown", self.output_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
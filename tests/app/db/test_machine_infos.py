@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import unittest
+from datetime import datetime
+
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import Session
+
+from machine_tools.app.db.machine_infos import MachineInfoCache, refresh_infos
+from machine_tools.app.db.query_builder import QueryBuilder
+from machine_tools.app.enumerations import Accuracy, Automation, SoftwareControl, Specialization, WeightClass
+from machine_tools.app.formatters import DictMachineInfoFormatter, ListMachineInfoFormatter
+from machine_tools.app.models import Base, Machine
+
+
+def machine(**values):
+    """Станок с заполненными перечислениями"""
+    enumerations = {
+        "accuracy": Accuracy.P.value,
+        "automation": Automation.MANUAL.value,
+        "software_control": SoftwareControl.NO.value,
+        "specialization": Specialization.UNIVERSAL.value,
+        "weight_class": WeightClass.LIGHT.value,
+    }
+    return Machine(**enumerations, **values)
+
+
+class TestMachineInfos(unittest.TestCase):
+    """Тесты для кэша представлений MachineInfo и колонки machine_tools.info"""
+
+    def setUp(self):
+        """Подготовка тестовой БД"""
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        self.stamp = datetime(2024, 1, 1)
+        self.session.add_all(
+            [
+                machine(id=1, name="16К20", power=10.0, city="Москва", updated_at=self.stamp),
+                machine(id=2, name="2Н135", power=4.0, updated_at=self.stamp),
+            ]
+        )
+        self.session.commit()
+
+    def tearDown(self):
+        """Очистка"""
+        self.session.close()
+        self.engine.dispose()
+
+    def _machines(self):
+        """Станки, заново прочитанные из БД"""
+        self.session.expire_all()
+        return self.session.scalars(select(Machine).order_by(Machine.id)).all()
+
+    def test_01_cache_by_updated_at(self):
+        """Тест кэша процесса: повторное представление без сборки, новое после изменения updated_at"""
+        cache = MachineInfoCache()
+        formatter = ListMachineInfoFormatter(cache=cache)
+        first = formatter.format(self._machines())
+        second = formatter.format(self._machines())
+        self.assertIs(second[0], first[0])
+        self.assertIs(DictMachineInfoFormatter(cache=cache).format(self._machines())["2Н135"], first[1])
+        self.assertEqual(cache.stats()["hits"], 4)
+
+        QueryBuilder(self.session).filter_by_names(["16К20"]).update({"power": 12.5})
+        self.session.commit()
+        third = formatter.format(self._machines())
+        self.assertEqual(third[0].power, 12.5)
+        self.assertIs(third[1], first[1])
+        self.assertEqual(len(cache), 2)
+
+        # Станок без updated_at (еще не сохранен) не кэшируется
+        formatter.format([machine(id=3, name="6Р13")])
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(ListMachineInfoFormatter().format(self._machines()), third)
+
+    def test_02_refresh_infos(self):
+        """Тест сохраненных представлений: updated_at не меняется, чтение без сборки, устаревание"""
+        with self.engine.begin() as connection:
+            self.assertEqual(refresh_infos(connection, batch_size=1), 2)
+            self.assertEqual(refresh_infos(connection), 0)
+            self.assertEqual(refresh_infos(connection, [1], only_stale=False), 1)
+            stamps = connection.execute(select(Machine.updated_at, Machine.info_updated_at)).all()
+        self.assertEqual(stamps, [(self.stamp, self.stamp), (self.stamp, self.stamp)])
+
+        cache = MachineInfoCache()
+        infos = ListMachineInfoFormatter(cache=cache).format(self._machines())
+        self.assertEqual(cache.stats()["loads"], 2)
+        self.assertEqual(infos, ListMachineInfoFormatter().format(self._machines()))
+        self.assertEqual(infos[0].location.city, "Москва")
+
+        with self.engine.begin() as connection:
+            connection.execute(update(Machine.__table__).where(Machine.id == 2).values(power=5.0))
+        cache = MachineInfoCache()
+        infos = ListMachineInfoFormatter(cache=cache).format(self._machines())
+        self.assertEqual(cache.stats()["loads"], 1)
+        self.assertEqual(infos[1].power, 5.0)
+        with self.engine.begin() as connection:
+            self.assertEqual(refresh_infos(connection), 1)
+
+    def test_03_eviction(self):
+        """Тест вытеснения LRU и размера кэша"""
+        with self.assertRaises(ValueError):
+            MachineInfoCache(maxsize=0)
+        cache = MachineInfoCache(maxsize=1)
+        machines = self._machines()
+        ListMachineInfoFormatter(cache=cache).format(machines)
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertIsNone(cache.get(machines[0]))
+        self.assertIsNotNone(cache.get(machines[1]))
+        cache.invalidate()
+        self.assertEqual(len(cache), 0)
+
+    def test_04_trusted_rows(self):
+        """Тест доверенного режима: ORM-объекты, в том числе с истекшими атрибутами, и строки запроса"""
+        machines = self._machines()
+        strict = ListMachineInfoFormatter().format(machines)
+        self.assertEqual(ListMachineInfoFormatter(trusted=True).format(machines), strict)
+        self.session.expire(machines[0])
+        self.assertEqual(ListMachineInfoFormatter(trusted=True).format(machines), strict)
+        rows = self.session.execute(select(Machine.__table__).order_by(Machine.id)).all()
+        self.assertEqual(ListMachineInfoFormatter(trusted=True).format(rows), strict)
+
+
+if __name__ == "__main__":
+    unittest.main()
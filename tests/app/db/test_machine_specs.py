@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import unittest
+from datetime import datetime
+
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.dialects import postgresql
+
+from machine_tools.app.db.machine_specs import refresh_specs, spec_condition
+from machine_tools.app.db.session import MachineToolsSession
+from machine_tools.app.models import Base, Machine, TechnicalRequirement
+
+
+class TestMachineSpecs(unittest.TestCase):
+    """Тесты для спецификаций станков machine_tools.spec"""
+
+    def setUp(self):
+        """Подготовка тестовой БД: требования добавляются через ORM"""
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.session = MachineToolsSession(self.engine)
+        self.machines = [Machine(id=1, name="16К20"), Machine(id=2, name="2Н135"), Machine(id=3, name="6Р13")]
+        self.session.add_all(self.machines)
+        self.session.add_all(
+            [
+                TechnicalRequirement(machine=self.machines[0], requirement="Наибольший диаметр, мм", value="400"),
+                TechnicalRequirement(machine=self.machines[0], requirement="Конус шпинделя", value="Морзе 6"),
+                TechnicalRequirement(machine=self.machines[1], requirement="Конус шпинделя", value="Морзе 4"),
+            ]
+        )
+        self.session.commit()
+
+    def tearDown(self):
+        """Очистка"""
+        self.session.close()
+        self.engine.dispose()
+
+    def _specs(self):
+        """Спецификации станков по ID, прочитанные из БД"""
+        with self.engine.connect() as connection:
+            return dict(connection.execute(select(Machine.id, Machine.spec)).all())
+
+    def test_01_orm_flush(self):
+        """Тест сброса сессии: вставка, изменение, перенос на другой станок и удаление требований"""
+        self.assertEqual(
+            self._specs(),
+            {
+                1: {"Наибольший диаметр, мм": "400", "Конус шпинделя": "Морзе 6"},
+                2: {"Конус шпинделя": "Морзе 4"},
+                3: None,
+            },
+        )
+
+        query = select(TechnicalRequirement).where(TechnicalRequirement.machine_id == 2)
+        requirement = self.session.scalars(query).one()
+        requirement.value = "Морзе 5"
+        requirement.machine = self.machines[2]
+        self.session.commit()
+        self.assertEqual(self.machines[1].spec, None)
+        self.assertEqual(self.machines[2].spec, {"Конус шпинделя": "Морзе 5"})
+
+        self.session.delete(requirement)
+        self.session.commit()
+        self.assertEqual(self._specs()[3], None)
+
+    def test_02_refresh_specs(self):
+        """Тест пересборки спецификаций: порции, выбранные станки, updated_at"""
+        stamp = datetime(2024, 1, 1)
+        with self.engine.begin() as connection:
+            connection.execute(update(Machine.__table__).values(spec=None, updated_at=stamp))
+            self.assertEqual(refresh_specs(connection, [2, 2]), 1)
+        self.assertEqual(self._specs(), {1: None, 2: {"Конус шпинделя": "Морзе 4"}, 3: None})
+
+        with self.engine.begin() as connection:
+            self.assertEqual(refresh_specs(connection, batch_size=2, touch=False), 3)
+            updated = connection.execute(select(Machine.updated_at).where(Machine.id != 2)).scalars().all()
+        self.assertEqual(self._specs()[1], {"Наибольший диаметр, мм": "400", "Конус шпинделя": "Морзе 6"})
+        self.assertEqual(updated, [stamp, stamp])
+
+    def test_03_spec_condition(self):
+        """Тест условия вхождения пар: SQLite и запрос PostgreSQL с оператором @>"""
+
+        def names(spec):
+            query = select(Machine.name).where(spec_condition(spec)).order_by(Machine.id)
+            return self.session.execute(query).scalars().all()
+
+        self.assertEqual(names({"Конус шпинделя": "Морзе 6"}), ["16К20"])
+        self.assertEqual(names({"Конус шпинделя": "Морзе 6", "Наибольший диаметр, мм": 400}), ["16К20"])
+        self.assertEqual(names({"Конус шпинделя": "Морзе 6", "Наибольший диаметр, мм": 500}), [])
+        self.assertEqual(names({"конус шпинделя": "Морзе 4"}), [])
+        self.assertEqual(names({}), ["16К20", "2Н135", "6Р13"])
+        with self.assertRaises(ValueError):
+            spec_condition({"Конус шпинделя": None})
+
+        compiled = select(Machine.id).where(spec_condition({"Конус шпинделя": "Морзе 4"})).compile(
+            dialect=postgresql.dialect()
+        )
+        self.assertIn("machine_tools.spec @> %(param_1)s::JSONB", str(compiled))
+        self.assertEqual(compiled.params["param_1"], {"Конус шпинделя": "Морзе 4"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import json
+import unittest
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect, text
+
+from machine_tools.app.db.migrations import current_revision, get_alembic_config, stamp_head, upgrade_head
+from machine_tools.app.models import Base
+
+
+class TestMigrations(unittest.TestCase):
+    """Тесты для цепочки миграций Alembic"""
+
+    def setUp(self):
+        """Подготовка пустой БД"""
+        self.engine = create_engine("sqlite:///:memory:")
+        self.connection = self.engine.connect()
+
+    def tearDown(self):
+        """Очистка"""
+        self.connection.close()
+        self.engine.dispose()
+
+    def _head(self):
+        """Последняя ревизия цепочки"""
+        return ScriptDirectory.from_config(get_alembic_config()).get_current_head()
+
+    def test_01_upgrade_matches_models(self):
+        """Тест цепочки миграций: схема совпадает с моделями, кроме индексов только для PostgreSQL"""
+        upgrade_head(self.connection)
+        self.assertEqual(current_revision(self.connection), self._head())
+        diff = compare_metadata(MigrationContext.configure(self.connection), Base.metadata)
+        self.assertEqual([entry[1].name for entry in diff], ["ix_machine_tools_name_trgm", "ix_machine_tools_spec"])
+        self.assertEqual(inspect(self.connection).get_view_names(), ["technical_requirements_compat"])
+
+    def test_02_downgrade_and_upgrade(self):
+        """Тест отката всей цепочки и повторного применения"""
+        upgrade_head(self.connection)
+        command.downgrade(get_alembic_config(self.connection), "base")
+        self.assertNotIn("machine_tools", inspect(self.connection).get_table_names())
+        upgrade_head(self.connection)
+        self.assertEqual(current_revision(self.connection), self._head())
+
+    def test_03_machine_id_backfill(self):
+        """Тест данных, записанных до последних ревизий: machine_id по имени станка, разбор значений, словарь, spec"""
+        command.upgrade(get_alembic_config(self.connection), "d2a7e4b9c813")
+        self.connection.execute(text("INSERT INTO machine_tools (id, name) VALUES (5, '16К20')"))
+        self.connection.execute(
+            text(
+                "INSERT INTO technical_requirements (machine_name, requirement, value) "
+                "VALUES ('16К20', 'Диаметр, мм', '0..400'), ('16К20', 'ДИАМЕТР , мм', '500')"
+            )
+        )
+        upgrade_head(self.connection)
+        query = text("SELECT DISTINCT machine_id, machine_name FROM technical_requirements_compat")
+        row = self.connection.execute(query).one()
+        self.assertEqual(tuple(row), (5, "16К20"))
+        rows = self.connection.execute(
+            text("SELECT unit, value_min, value_max, requirement_id FROM technical_requirements ORDER BY id")
+        ).all()
+        self.assertEqual([tuple(row) for row in rows], [("мм", 0.0, 400.0, 1), ("мм", 500.0, 500.0, 1)])
+        rows = self.connection.execute(text("SELECT id, key, name FROM requirement_names")).all()
+        self.assertEqual([tuple(row) for row in rows], [(1, "диаметр, мм", "Диаметр, мм")])
+        spec = self.connection.execute(text("SELECT spec FROM machine_tools")).scalar()
+        self.assertEqual(json.loads(spec), {"Диаметр, мм": "0..400", "ДИАМЕТР , мм": "500"})
+
+    def test_04_stamp_head(self):
+        """Тест отметки схемы, созданной create_all: повторная отметка не выполняется"""
+        Base.metadata.create_all(self.connection)
+        self.assertTrue(stamp_head(self.connection))
+        self.assertEqual(current_revision(self.connection), self._head())
+        self.assertFalse(stamp_head(self.connection))
+
+
+if __name__ == "__main__":
+    unittest.main()
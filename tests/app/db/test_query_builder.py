@@ -3,11 +3,12 @@
 # ---------------------------------------------------------------------------------------------------------------------
 import unittest
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from machine_tools.app.db.query_builder import QueryBuilder
-from machine_tools.app.models import Base, Machine
+from machine_tools.app.db.session import MachineToolsSession
+from machine_tools.app.models import Base, Machine, TechnicalRequirement
 
 
 class TestQueryBuilder(unittest.TestCase):
@@ -18,7 +19,7 @@ class TestQueryBuilder(unittest.TestCase):
         """Подготовка тестовой БД"""
         cls.engine = create_engine("sqlite:///:memory:")
         Base.metadata.create_all(cls.engine)
-        cls.Session = sessionmaker(bind=cls.engine)
+        cls.Session = sessionmaker(bind=cls.engine, class_=MachineToolsSession)
 
     def setUp(self):
         """Подготовка тестовых данных перед каждым тестом"""
@@ -60,7 +61,16 @@ class TestQueryBuilder(unittest.TestCase):
             ),
         ]
         self.session.add_all(self.machines)
+        self.session.add_all(
+            [
+                TechnicalRequirement(machine=machine, requirement=f"Параметр {i}", value=str(i))
+                for machine in self.machines
+                for i in range(2)
+            ]
+        )
         self.session.commit()
+        # Сбрасываем identity map, чтобы связи загружались из БД
+        self.session.expire_all()
 
     def tearDown(self):
         """Очистка после каждого теста"""
@@ -178,6 +188,151 @@ class TestQueryBuilder(unittest.TestCase):
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0].name, "Станок2")
 
+    def _count_queries(self, func):
+        """Выполняет func и возвращает (результат, количество SELECT-запросов)"""
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            result = func()
+        finally:
+            event.remove(self.engine, "before_cursor_execute", before_cursor_execute)
+        return result, len(statements)
+
+    def test_15_load_technical_requirements_selectin(self):
+        """Тест пакетной загрузки требований стратегией selectin"""
+
+        def run():
+            machines = QueryBuilder(self.session).load_technical_requirements("selectin").execute()
+            return {machine.name: len(machine.technical_requirements) for machine in machines}
+
+        result, queries = self._count_queries(run)
+        self.assertEqual(result, {"Станок1": 2, "Станок2": 2, "Станок3": 2})
+        self.assertEqual(queries, 2)
+
+    def test_16_load_technical_requirements_joined(self):
+        """Тест загрузки требований стратегией joined"""
+
+        def run():
+            machines = QueryBuilder(self.session).load_technical_requirements("joined").limit(2).execute()
+            return {machine.name: len(machine.technical_requirements) for machine in machines}
+
+        result, queries = self._count_queries(run)
+        self.assertEqual(result, {"Станок1": 2, "Станок2": 2})
+        self.assertEqual(queries, 1)
+
+    def test_17_load_technical_requirements_invalid_strategy(self):
+        """Тест недопустимой стратегии загрузки"""
+        with self.assertRaises(ValueError):
+            QueryBuilder(self.session).load_technical_requirements("lazy")
+
+    def test_18_select_columns(self):
+        """Тест проекции запроса на колонки"""
+        result = QueryBuilder(self.session).select_columns("id", "name").filter_by_group(1).execute()
+        self.assertEqual([tuple(row) for row in result], [(1, "Станок1"), (2, "Станок2")])
+        self.assertEqual(result[0].name, "Станок1")
+        self.assertNotIsInstance(result[0], Machine)
+
+    def test_19_select_columns_invalid(self):
+        """Тест проекции на несуществующую колонку"""
+        with self.assertRaises(ValueError):
+            QueryBuilder(self.session).select_columns("id", "technical_requirements")
+
+    def test_20_iter_batches_keyset(self):
+        """Тест keyset-пагинации порциями"""
+        builder = QueryBuilder(self.session)
+        batches, queries = self._count_queries(lambda: list(builder.iter_batches(batch_size=2)))
+        names = [[machine.name for machine in batch] for batch in batches]
+        self.assertEqual(names, [["Станок1", "Станок2"], ["Станок3"]])
+        self.assertEqual(queries, 2)
+
+    def test_21_iter_batches_limit_offset(self):
+        """Тест порций с лимитом, смещением и проекцией"""
+        builder = QueryBuilder(self.session).select_columns("id", "name").offset(1).limit(2)
+        batches = list(builder.iter_batches(batch_size=1))
+        self.assertEqual([[row.name for row in batch] for batch in batches], [["Станок2"], ["Станок3"]])
+
+        with self.assertRaises(ValueError):
+            list(QueryBuilder(self.session).select_columns("name").iter_batches())
+        with self.assertRaises(ValueError):
+            list(QueryBuilder(self.session).iter_batches(batch_size=0))
+
+    def test_22_iter_batches_ordered(self):
+        """Тест порций при явной сортировке (серверный курсор)"""
+        builder = QueryBuilder(self.session).filter_by_group(1).order_by("power", descending=True)
+        batches = list(builder.load_technical_requirements().iter_batches(batch_size=1))
+        self.assertEqual([[machine.name for machine in batch] for batch in batches], [["Станок2"], ["Станок1"]])
+        self.assertEqual(len(batches[0][0].technical_requirements), 2)
+
+    def test_23_filter_by_names(self):
+        """Тест выборки по списку имен одним запросом"""
+
+        def run():
+            builder = QueryBuilder(self.session).filter_by_names(["Станок3", "Станок1", "Станок9"])
+            machines = builder.load_technical_requirements("joined").execute()
+            return {machine.name: len(machine.technical_requirements) for machine in machines}
+
+        result, queries = self._count_queries(run)
+        self.assertEqual(result, {"Станок1": 2, "Станок3": 2})
+        self.assertEqual(queries, 1)
+
+        # Регистр по умолчанию не учитывается, как в filter_by_name(exact_match=True).
+        # lower() в SQLite работает только с ASCII, поэтому проверяется латиница
+        self.session.add(Machine(name="DMU 50", group=3, type=1, power=25.0))
+        self.session.commit()
+        machines = QueryBuilder(self.session).filter_by_names(["dmu 50", "Станок2"]).execute()
+        self.assertEqual(sorted(machine.name for machine in machines), ["DMU 50", "Станок2"])
+        machines = QueryBuilder(self.session).filter_by_names(["dmu 50", "Станок2"], case_sensitive=True).execute()
+        self.assertEqual([machine.name for machine in machines], ["Станок2"])
+
+    def test_24_filter_by_requirement(self):
+        """Тест фильтра по требованиям: один запрос EXISTS вместе с фильтрами по колонкам, написания наименования"""
+        self.session.add_all(
+            [
+                TechnicalRequirement(
+                    machine=self.machines[0], requirement="Диаметр, мм", value="0..400", value_min=0.0, value_max=400.0
+                ),
+                TechnicalRequirement(
+                    machine=self.machines[2],
+                    requirement="диаметр , мм.",
+                    value="25",
+                    value_number=25.0,
+                    value_min=25.0,
+                    value_max=25.0,
+                ),
+            ]
+        )
+        self.session.commit()
+
+        def names(builder):
+            return [row.name for row in builder.select_columns("id", "name").execute()]
+
+        builder = QueryBuilder(self.session).filter_by_requirement("Диаметр, мм", ">=", 100)
+        self.assertEqual(names(builder), ["Станок1"])
+        builder = QueryBuilder(self.session).filter_by_requirement("Диаметр, мм", "covers", 25).filter_by_group(1)
+        self.assertEqual(names(builder), ["Станок1"])
+        builder = QueryBuilder(self.session).filter_by_requirement("ДИАМЕТР, мм", "==", 25).filter_by_group(2)
+        self.assertEqual(names(builder), ["Станок3"])
+        builder = QueryBuilder(self.session).filter_by_requirement("Параметр 1", "==", "1")
+        builder = builder.filter_by_power(max_power=15)
+        self.assertEqual(names(builder), ["Станок1", "Станок2"])
+
+        result, queries = self._count_queries(
+            lambda: names(QueryBuilder(self.session).filter_by_requirement("Диаметр, мм", "<", 10))
+        )
+        self.assertEqual((result, queries), (["Станок1"], 1))
+
+    def test_25_filter_by_requirement_invalid_operator(self):
+        """Тест недопустимого оператора для типа значения"""
+        with self.assertRaises(ValueError):
+            QueryBuilder(self.session).filter_by_requirement("Диаметр, мм", ">=", "100")
+        with self.assertRaises(ValueError):
+            QueryBuilder(self.session).filter_by_requirement("Диаметр, мм", "~", 100)
+
 
 if __name__ == "__main__":
     unittest.main()
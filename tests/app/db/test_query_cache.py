@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from machine_tools.app.db.bulk_loader import bulk_load
+from machine_tools.app.db.query_builder import QueryBuilder
+from machine_tools.app.db.query_cache import QueryCache, invalidate_caches
+from machine_tools.app.enumerations import Accuracy, Automation, SoftwareControl, Specialization, WeightClass
+from machine_tools.app.finders.finder import MachineFinder
+from machine_tools.app.formatters import DictMachineInfoFormatter, ListNameFormatter
+from machine_tools.app.models import Base, Machine
+
+
+class TestQueryCache(unittest.TestCase):
+    """Тесты для QueryCache"""
+
+    def test_01_get_set(self):
+        """Тест сохранения и получения значений"""
+        cache = QueryCache(maxsize=2)
+        self.assertEqual(cache.get("a"), (False, None))
+        cache.set("a", [1])
+        self.assertEqual(cache.get("a"), (True, [1]))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_02_lru_eviction(self):
+        """Тест вытеснения давно использованных записей"""
+        cache = QueryCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(cache.get("b"), (False, None))
+        self.assertEqual(cache.get("a"), (True, 1))
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertEqual(len(cache), 2)
+
+    def test_03_ttl(self):
+        """Тест истечения времени жизни записей"""
+        cache = QueryCache(ttl=10)
+        with patch("machine_tools.app.db.query_cache.monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with patch("machine_tools.app.db.query_cache.monotonic", return_value=105.0):
+            self.assertEqual(cache.get("a"), (True, 1))
+        with patch("machine_tools.app.db.query_cache.monotonic", return_value=111.0):
+            self.assertEqual(cache.get("a"), (False, None))
+        self.assertEqual(cache.stats()["expirations"], 1)
+
+    def test_04_invalidate_caches(self):
+        """Тест сброса всех кэшей"""
+        first, second = QueryCache(), QueryCache()
+        first.set("a", 1)
+        second.set("b", 2)
+        invalidate_caches()
+        self.assertEqual(len(first), 0)
+        self.assertEqual(len(second), 0)
+
+    def test_05_invalid_size(self):
+        """Тест недопустимого размера"""
+        with self.assertRaises(ValueError):
+            QueryCache(maxsize=0)
+
+    def test_06_generation(self):
+        """Тест поколения: результат запроса, начатого до сброса, не сохраняется"""
+        cache = QueryCache()
+        generation = cache.generation
+        invalidate_caches()
+        cache.set("a", 1, generation)
+        self.assertEqual(cache.get("a"), (False, None))
+        cache.set("a", 1, cache.generation)
+        self.assertEqual(cache.get("a"), (True, 1))
+
+
+class TestFinderWithCache(unittest.TestCase):
+    """Тесты кэширования в MachineFinder"""
+
+    def setUp(self):
+        """Подготовка тестовой БД"""
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+        enumerations = {
+            "accuracy": Accuracy.P.value,
+            "automation": Automation.MANUAL.value,
+            "software_control": SoftwareControl.NO.value,
+            "specialization": Specialization.UNIVERSAL.value,
+            "weight_class": WeightClass.LIGHT.value,
+        }
+        self.session.add_all(
+            [
+                Machine(name="16К20", group=1, power=10.0, **enumerations),
+                Machine(name="2Н135", group=2, power=4.0, **enumerations),
+            ]
+        )
+        self.session.commit()
+        self.queries = []
+        event.listen(self.engine, "before_cursor_execute", self._count)
+
+    def tearDown(self):
+        """Очистка после теста"""
+        self.session.close()
+        self.engine.dispose()
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            self.queries.append(statement)
+
+    def test_01_cache_hit(self):
+        """Тест повторного запроса из кэша"""
+        cache = QueryCache()
+        finder = MachineFinder(session=self.session, cache=cache)
+        self.assertEqual(finder.find_by_group(1), ["16К20"])
+        self.assertEqual(finder.find_by_group(1), ["16К20"])
+        self.assertEqual(len(self.queries), 1)
+        self.assertEqual(finder.find_by_group(2), ["2Н135"])
+        self.assertEqual(len(self.queries), 2)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_02_result_copy(self):
+        """Тест защиты закэшированного результата и его элементов от изменения"""
+        finder = MachineFinder(session=self.session, cache=QueryCache(), formatter=ListNameFormatter())
+        finder.find_all().append("лишний")
+        self.assertEqual(finder.find_all(), ["16К20", "2Н135"])
+
+        finder = MachineFinder(session=self.session, cache=QueryCache(), formatter=DictMachineInfoFormatter())
+        finder.find_all()["16К20"].power = 99.0
+        self.assertEqual(finder.find_all()["16К20"].power, 10.0)
+
+    def test_03_update_invalidates(self):
+        """Тест сброса кэша при обновлении данных"""
+        cache = QueryCache()
+        finder = MachineFinder(session=self.session, cache=cache)
+        self.assertEqual(finder.find_by_power(min_power=5.0), ["16К20"])
+        QueryBuilder(self.session).filter_by_name("2Н135", exact_match=True).update({"power": 7.5})
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(finder.find_by_power(min_power=5.0), ["16К20", "2Н135"])
+
+    def test_04_bulk_load_invalidates(self):
+        """Тест сброса кэша при массовой загрузке"""
+        cache = QueryCache()
+        finder = MachineFinder(session=self.session, cache=cache)
+        self.assertEqual(finder.find_all(), ["16К20", "2Н135"])
+        with self.engine.begin() as connection:
+            bulk_load(connection, Machine.__table__, ("name", "group", "power"), [("6Р13", 6, 7.5)])
+        self.assertEqual(len(cache), 0)
+        self.session.expire_all()
+        self.assertEqual(finder.find_all(), ["16К20", "2Н135", "6Р13"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import unittest
+
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from machine_tools.app.db.requirement_names import add_names_statement, requirement_id_query, requirement_ids
+from machine_tools.app.db.session import MachineToolsSession
+from machine_tools.app.models import Base, Machine, RequirementName, TechnicalRequirement
+
+
+class TestRequirementNames(unittest.TestCase):
+    """Тесты для словаря наименований параметров"""
+
+    def setUp(self):
+        """Подготовка тестовой БД"""
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+
+    def tearDown(self):
+        """Очистка"""
+        self.engine.dispose()
+
+    def _names(self, connection):
+        """Записи словаря: (id, ключ, основное написание)"""
+        query = select(RequirementName.__table__).order_by(RequirementName.id)
+        return [tuple(row) for row in connection.execute(query)]
+
+    def test_01_requirement_ids(self):
+        """Тест ID наименований: написания одного параметра получают один ID, новые ключи добавляются"""
+        with self.engine.begin() as connection:
+            ids = requirement_ids(connection, ["Масса станка , кг", "Конус", "Масса станка, кг", "Конус"])
+            self.assertEqual(ids, {"Масса станка , кг": 1, "Конус": 2, "Масса станка, кг": 1})
+            self.assertEqual(
+                requirement_ids(connection, ["масса станка, кг.", "Мощность, кВт"]),
+                {"масса станка, кг.": 1, "Мощность, кВт": 3},
+            )
+            self.assertEqual(requirement_ids(connection, []), {})
+            self.assertEqual(
+                self._names(connection),
+                [
+                    (1, "масса станка, кг", "Масса станка , кг"),
+                    (2, "конус", "Конус"),
+                    (3, "мощность, квт", "Мощность, кВт"),
+                ],
+            )
+
+    def test_02_statements(self):
+        """Тест запросов для другого исполнителя: добавление отсутствующих ключей и подзапрос ID"""
+        with self.engine.begin() as connection:
+            requirement_ids(connection, ["Конус"])
+            connection.execute(add_names_statement(["Конус", "КОНУС", "Масса, кг"]))
+            connection.execute(add_names_statement(["Масса , кг"]))
+            self.assertEqual(self._names(connection), [(1, "конус", "Конус"), (2, "масса, кг", "Масса, кг")])
+            self.assertEqual(connection.execute(select(requirement_id_query("Масса, кг."))).scalar(), 2)
+
+    def test_03_orm_default(self):
+        """Тест вставки через сессию пакета без requirement_id: ID всех строк сброса определяются разом"""
+        statements = []
+        event.listen(self.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        with MachineToolsSession(self.engine) as session:
+            machine = Machine(name="16К20")
+            session.add_all(
+                [
+                    TechnicalRequirement(machine=machine, requirement=f"Параметр {number}", value=str(number))
+                    for number in range(10)
+                ]
+                + [
+                    TechnicalRequirement(machine=machine, requirement="Конус шпинделя", value="Морзе 6"),
+                    TechnicalRequirement(machine=machine, requirement="конус шпинделя.", value="Морзе 5"),
+                ]
+            )
+            session.commit()
+            # Ключи ищутся, добавляются и перечитываются по одному разу на сброс, а не на строку
+            self.assertEqual(len([statement for statement in statements if "requirement_names" in statement]), 3)
+            requirements = session.scalars(select(TechnicalRequirement).order_by(TechnicalRequirement.id)).all()
+            self.assertEqual([requirement.requirement_id for requirement in requirements[-2:]], [11, 11])
+            self.assertEqual(requirements[-1].requirement_name.name, "Конус шпинделя")
+
+        # Обработчики сброса зарегистрированы только на сессии пакета
+        with Session(self.engine) as session:
+            session.add(TechnicalRequirement(machine_id=1, requirement="Масса", value="3000"))
+            with self.assertRaises(IntegrityError):
+                session.commit()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import codecs
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, select, update
+
+from machine_tools.app.db.requirements_importer import (
+    detect_encoding,
+    import_requirements,
+    normalize_encodings,
+    parse_requirements_file,
+    reparse_requirements,
+)
+from machine_tools.app.db.session import MachineToolsSession
+from machine_tools.app.models import Base, Machine, RequirementName, TechnicalRequirement
+
+
+class TestRequirementsImporter(unittest.TestCase):
+    """Тесты для параллельного импорта технических требований"""
+
+    def setUp(self):
+        """Подготовка CSV-файлов в разных кодировках и тестовой БД"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_dir = Path(self.tmp.name)
+        files = {
+            "16К20.csv": (
+                "cp1251",
+                "index,Наименование параметра,16К20\n"
+                '0,Основные параметры станка,\n1,"Наибольший диаметр, мм",400\n2,,\n',
+            ),
+            "2Н135.csv": (
+                "utf-8",
+                'index,Наименование параметра,2Н135\n0,Конус шпинделя,Морзе 4\n1,"Масса, кг",1200\n',
+            ),
+            "9999.csv": ("utf-8", "index,Наименование параметра,9999\n0,Параметр,1\n"),
+            "machine_tools.csv": ("utf-8", "id,name\n1,16К20\n"),
+        }
+        for filename, (encoding, content) in files.items():
+            (self.csv_dir / filename).write_bytes(content.encode(encoding))
+
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        with MachineToolsSession(self.engine) as session:
+            session.add_all([Machine(id=1, name="16К20"), Machine(id=2, name="2Н135")])
+            session.commit()
+
+    def tearDown(self):
+        """Очистка"""
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    def _requirements(self):
+        """Строки таблицы технических требований"""
+        with self.engine.connect() as connection:
+            query = select(
+                TechnicalRequirement.machine_name, TechnicalRequirement.requirement, TechnicalRequirement.value
+            ).order_by(TechnicalRequirement.id)
+            return [tuple(row) for row in connection.execute(query)]
+
+    def test_01_parse_file(self):
+        """Тест разбора файла в кодировке cp1251"""
+        parsed = parse_requirements_file(str(self.csv_dir / "16К20.csv"))
+        self.assertEqual(parsed.machine_name, "16К20")
+        self.assertEqual(
+            parsed.rows, [("16К20", "Основные параметры станка", None), ("16К20", "Наибольший диаметр, мм", "400.0")]
+        )
+
+    def test_02_import_single_process(self):
+        """Тест импорта без пула: неизвестные станки пропускаются, порции записываются по мере накопления"""
+        with self.engine.begin() as connection:
+            report = import_requirements(
+                connection, str(self.csv_dir), {"16К20": 1, "2Н135": 2}, workers=1, batch_rows=2
+            )
+        self.assertEqual((report.files, report.rows, report.skipped), (3, 4, ["9999.csv"]))
+        self.assertEqual(len(report.loads), 2)
+        self.assertEqual(list(report.stages), ["поиск файлов", "разбор", "запись", "спецификации", "всего"])
+        self.assertEqual(len(self._requirements()), 4)
+        with self.engine.connect() as connection:
+            query = select(TechnicalRequirement.machine_name, TechnicalRequirement.machine_id).distinct()
+            self.assertEqual(sorted(connection.execute(query).all()), [("16К20", 1), ("2Н135", 2)])
+            specs = dict(connection.execute(select(Machine.name, Machine.spec)).all())
+        self.assertEqual(
+            specs,
+            {
+                "16К20": {"Основные параметры станка": None, "Наибольший диаметр, мм": "400.0"},
+                "2Н135": {"Конус шпинделя": "Морзе 4", "Масса, кг": "1200"},
+            },
+        )
+
+    def test_03_import_process_pool(self):
+        """Тест импорта в пуле процессов: тот же результат, что и без пула"""
+        with self.engine.begin() as connection:
+            report = import_requirements(connection, str(self.csv_dir), {"16К20": 1, "2Н135": 2}, workers=2)
+        self.assertEqual(report.workers, 2)
+        self.assertEqual(
+            self._requirements(),
+            [
+                ("16К20", "Основные параметры станка", None),
+                ("16К20", "Наибольший диаметр, мм", "400.0"),
+                ("2Н135", "Конус шпинделя", "Морзе 4"),
+                ("2Н135", "Масса, кг", "1200"),
+            ],
+        )
+
+    def test_04_detect_encoding(self):
+        """Тест определения кодировки: UTF-8 раньше подсказки, обе без chardet, BOM, chardet для остальных"""
+        text = "Наименование параметра,16К20\nКонус,Морзе 6\n"
+        with patch("machine_tools.app.db.requirements_importer.chardet.detect") as detect:
+            self.assertEqual(detect_encoding(text.encode("utf-8")), ("utf-8", text))
+            self.assertEqual(detect_encoding(text.encode("cp1251"), "cp1251"), ("cp1251", text))
+            self.assertEqual(detect_encoding(codecs.BOM_UTF8 + text.encode("utf-8")), ("utf-8-sig", text))
+            # Устаревшая подсказка для файла, уже перекодированного в UTF-8
+            self.assertEqual(detect_encoding(text.encode("utf-8"), hint="windows-1251"), ("utf-8", text))
+            detect.assert_not_called()
+
+        with patch("machine_tools.app.db.requirements_importer.DETECT_PREFIX_SIZE", 16):
+            encoding, decoded = detect_encoding((text * 20).encode("cp1251"), hint="utf-8")
+        self.assertEqual(decoded, text * 20)
+        self.assertEqual(encoding.lower(), "windows-1251")
+
+    def test_05_normalize_encodings(self):
+        """Тест перекодирования файлов в UTF-8: содержимое то же, повторный запуск ничего не меняет"""
+        before = parse_requirements_file(str(self.csv_dir / "16К20.csv"))
+        converted = normalize_encodings(str(self.csv_dir))
+        self.assertEqual([filename for filename, _ in converted], ["16К20.csv"])
+        after = parse_requirements_file(str(self.csv_dir / "16К20.csv"))
+        self.assertEqual(after.encoding, "utf-8")
+        self.assertEqual(after.rows, before.rows)
+        self.assertEqual(normalize_encodings(str(self.csv_dir)), [])
+
+    def test_06_parsed_values(self):
+        """Тест разбора значений при импорте и повторного разбора уже загруженных строк"""
+        with self.engine.begin() as connection:
+            import_requirements(connection, str(self.csv_dir), {"16К20": 1, "2Н135": 2}, workers=1)
+        query = select(
+            TechnicalRequirement.unit, TechnicalRequirement.value_number, TechnicalRequirement.parse_status
+        ).order_by(TechnicalRequirement.id)
+        with self.engine.connect() as connection:
+            parsed = [tuple(row) for row in connection.execute(query)]
+        self.assertEqual(parsed[1], ("мм", 400.0, "Число"))
+        self.assertEqual(parsed[2], (None, None, "Текст"))
+
+        with self.engine.begin() as connection:
+            connection.execute(update(TechnicalRequirement).values(parse_status=None, value_number=None))
+            connection.execute(
+                update(TechnicalRequirement).where(TechnicalRequirement.id == 1).values(parse_status="Пусто")
+            )
+            self.assertEqual(reparse_requirements(connection, only_missing=True, batch_size=2), 3)
+            self.assertEqual(reparse_requirements(connection, batch_size=3), 4)
+        with self.engine.connect() as connection:
+            self.assertEqual([tuple(row) for row in connection.execute(query)], parsed)
+
+    def test_07_requirement_ids(self):
+        """Тест словаря наименований при импорте: ID по ключу, повторный импорт не дублирует словарь"""
+        (self.csv_dir / "2Н135.csv").write_text(
+            'index,Наименование параметра,2Н135\n0,Конус шпинделя,Морзе 4\n1,"наибольший диаметр , мм.",35\n',
+            encoding="utf-8",
+        )
+        for _ in range(2):
+            with self.engine.begin() as connection:
+                import_requirements(connection, str(self.csv_dir), {"16К20": 1, "2Н135": 2}, workers=1)
+        query = select(TechnicalRequirement.requirement, TechnicalRequirement.requirement_id).order_by(
+            TechnicalRequirement.id
+        )
+        with self.engine.connect() as connection:
+            rows = {tuple(row) for row in connection.execute(query)}
+            names = connection.execute(select(RequirementName.key).order_by(RequirementName.key)).scalars().all()
+        ids = dict(rows)
+        self.assertEqual(ids["Наибольший диаметр, мм"], ids["наибольший диаметр , мм."])
+        self.assertEqual(len(set(ids.values())), 3)
+        self.assertEqual(names, ["конус шпинделя", "наибольший диаметр, мм", "основные параметры станка"])
+
+
+if __name__ == "__main__":
+    unittest.main()
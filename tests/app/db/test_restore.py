@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, func, inspect, select
+
+from machine_tools.app.db.export import export_tables
+from machine_tools.app.db.restore import checksum, restore_backup
+from machine_tools.app.db.session import MachineToolsSession
+from machine_tools.app.models import (
+    Base,
+    ImportManifest,
+    Machine,
+    RequirementName,
+    TechnicalRequirement,
+    technical_requirements_compat,
+)
+
+
+class TestRestore(unittest.TestCase):
+    """Тесты для восстановления таблиц из резервной копии"""
+
+    def setUp(self):
+        """Выгрузка резервной копии из исходной БД"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = create_engine(f"sqlite:///{os.path.join(self.tmp.name, 'source.db')}")
+        Base.metadata.create_all(self.source)
+        created = datetime(2025, 5, 23, 6, 57, 11, 143307)
+        with MachineToolsSession(self.source) as session:
+            session.add_all(
+                [
+                    Machine(id=7, name="16К20", group=1, power=10.5, created_at=created, updated_at=created),
+                    Machine(id=3, name="2Н135", group=2, city="Москва", created_at=created, updated_at=created),
+                    TechnicalRequirement(id=10, machine_id=7, requirement='Диаметр, "мм"', value="400"),
+                    TechnicalRequirement(id=11, machine_id=3, requirement="Конус", value=None),
+                ]
+            )
+            session.commit()
+        self.backup_dir = os.path.join(self.tmp.name, "backups")
+        export_tables(self.source, self.backup_dir, compress=True)
+
+        self.target = create_engine(f"sqlite:///{os.path.join(self.tmp.name, 'target.db')}")
+        Base.metadata.create_all(self.target)
+        with MachineToolsSession(self.target) as session:
+            session.add_all([Machine(name="Старый"), ImportManifest(filename="a.csv", sha256="0", size=1, mtime_ns=1)])
+            session.commit()
+
+    def tearDown(self):
+        """Очистка"""
+        self.source.dispose()
+        self.target.dispose()
+        self.tmp.cleanup()
+
+    def _rows(self, engine, model):
+        """Все строки таблицы в порядке id"""
+        with engine.connect() as connection:
+            return [tuple(row) for row in connection.execute(select(model.__table__).order_by(model.id))]
+
+    def test_01_checksum(self):
+        """Тест контрольной суммы: не зависит от порядка, различает значения"""
+        rows = [(1, "a", None), (2, "b", 1.5)]
+        self.assertEqual(checksum(iter(rows)), checksum(iter(reversed(rows))))
+        self.assertEqual(checksum(iter(rows))[0], 2)
+        self.assertNotEqual(checksum(iter(rows))[1], checksum(iter([(1, "a", None), (2, "b", 2.5)]))[1])
+
+    def test_02_restore(self):
+        """Тест восстановления: id и метки времени сохраняются, прежние данные и манифест удаляются"""
+        report = restore_backup(self.target, self.backup_dir)
+        rows = [(stats.table, stats.rows) for stats in report.tables]
+        self.assertEqual(rows, [("machine_tools", 2), ("requirement_names", 2), ("technical_requirements", 2)])
+        self.assertTrue(all(stats.checksum is not None for stats in report.tables))
+        self.assertIn("проверка", report.stages)
+
+        self.assertEqual(self._rows(self.target, Machine), self._rows(self.source, Machine))
+        self.assertEqual(self._rows(self.target, TechnicalRequirement), self._rows(self.source, TechnicalRequirement))
+        with self.target.connect() as connection:
+            self.assertEqual(connection.execute(select(func.count()).select_from(ImportManifest)).scalar(), 0)
+        indexes = [index["name"] for index in inspect(self.target).get_indexes("machine_tools")]
+        self.assertIn("ix_machine_tools_id", indexes)
+
+    def test_03_verify_failure_rolls_back(self):
+        """Тест расхождения контрольной суммы: транзакция откатывается"""
+        before = self._rows(self.target, Machine)
+        with patch("machine_tools.app.db.restore.table_checksum", return_value=(0, 0)):
+            with self.assertRaises(ValueError):
+                restore_backup(self.target, self.backup_dir)
+        self.assertEqual(self._rows(self.target, Machine), before)
+
+    def test_04_missing_file(self):
+        """Тест папки без резервной копии таблицы: пропуск по умолчанию, ошибка для явно указанной таблицы"""
+        with self.assertRaises(ValueError):
+            restore_backup(self.target, self.tmp.name)
+
+        os.remove(os.path.join(self.backup_dir, "requirement_names.csv.gz"))
+        os.remove(os.path.join(self.backup_dir, "technical_requirements.csv.gz"))
+        with self.assertRaises(ValueError):
+            restore_backup(self.target, self.backup_dir, tables=["technical_requirements"])
+        report = restore_backup(self.target, self.backup_dir)
+        self.assertEqual([stats.table for stats in report.tables], ["machine_tools"])
+        self.assertEqual(report.skipped, ["requirement_names", "technical_requirements"])
+        self.assertIn("пропущена", str(report))
+        with self.target.connect() as connection:
+            names = connection.execute(select(Machine.id, Machine.name).order_by(Machine.id)).all()
+        self.assertEqual(names, [(3, "2Н135"), (7, "16К20")])
+
+    def test_05_backup_with_machine_name(self):
+        """Тест копии прежнего формата: требования связываются со станками по имени, наименования - со словарем"""
+        os.remove(os.path.join(self.backup_dir, "requirement_names.csv.gz"))
+        os.remove(os.path.join(self.backup_dir, "technical_requirements.csv.gz"))
+        with open(os.path.join(self.backup_dir, "technical_requirements.csv"), "w", encoding="utf-8") as file:
+            file.write("id,machine_name,requirement,value\n10,16К20,Диаметр,400\n11,2Н135,Конус,\n12,2Н135,конус.,\n")
+        restore_backup(self.target, self.backup_dir)
+        with self.target.connect() as connection:
+            query = select(
+                TechnicalRequirement.id, TechnicalRequirement.machine_id, TechnicalRequirement.requirement_id
+            ).order_by(TechnicalRequirement.id)
+            self.assertEqual(connection.execute(query).all(), [(10, 7, 1), (11, 3, 2), (12, 3, 2)])
+            query = select(RequirementName.key, RequirementName.name).order_by(RequirementName.id)
+            self.assertEqual(connection.execute(query).all(), [("диаметр", "Диаметр"), ("конус", "Конус")])
+            query = select(TechnicalRequirement.value_number, TechnicalRequirement.parse_status).order_by(
+                TechnicalRequirement.id
+            )
+            self.assertEqual(connection.execute(query).all(), [(400.0, "Число"), (None, "Пусто"), (None, "Пусто")])
+            query = select(technical_requirements_compat.c.machine_name).order_by(technical_requirements_compat.c.id)
+            self.assertEqual(connection.execute(query).scalars().all(), ["16К20", "2Н135", "2Н135"])
+
+        with open(os.path.join(self.backup_dir, "technical_requirements.csv"), "a", encoding="utf-8") as file:
+            file.write("13,9999,Конус,\n")
+        with self.assertRaises(ValueError):
+            restore_backup(self.target, self.backup_dir)
+
+    def test_06_fresh_database(self):
+        """Тест восстановления одной таблицы в пустую БД: остальные таблицы создаются пустыми"""
+        fresh = create_engine(f"sqlite:///{os.path.join(self.tmp.name, 'fresh.db')}")
+        try:
+            report = restore_backup(fresh, self.backup_dir, tables=["machine_tools"])
+            self.assertEqual([stats.table for stats in report.tables], ["machine_tools"])
+            self.assertIn("спецификации", report.stages)
+            with fresh.connect() as connection:
+                self.assertEqual(connection.execute(select(func.count()).select_from(Machine)).scalar(), 2)
+                count = select(func.count()).select_from(TechnicalRequirement)
+                self.assertEqual(connection.execute(count).scalar(), 0)
+        finally:
+            fresh.dispose()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import tempfile
+import unittest
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from machine_tools.app.config import get_settings
+from machine_tools.app.db.session_manager import get_engine_options, session_manager
+
+
+class TestSessionPool(unittest.TestCase):
+    """Тесты настроек пула соединений и прогрева"""
+
+    def setUp(self):
+        """Подменяем движок на временную БД SQLite с пулом QueuePool"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = create_engine(
+            f"sqlite:///{Path(self.tmp.name) / 'pool.db'}", poolclass=QueuePool, pool_size=3, max_overflow=5
+        )
+        self.original_engine = session_manager.engine
+        session_manager.engine = self.engine
+
+    def tearDown(self):
+        """Восстанавливаем движок"""
+        session_manager.engine = self.original_engine
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    def test_01_engine_options(self):
+        """Тест параметров create_engine из настроек"""
+        settings = get_settings().model_copy(
+            update={"DB_POOL_SIZE": 20, "DB_MAX_OVERFLOW": 0, "DB_POOL_RECYCLE": -1, "DB_POOL_PRE_PING": False}
+        )
+        options = get_engine_options(settings)
+        self.assertEqual(options["pool_size"], 20)
+        self.assertEqual(options["max_overflow"], 0)
+        self.assertEqual(options["pool_recycle"], -1)
+        self.assertFalse(options["pool_pre_ping"])
+        self.assertNotIn("connect_args", options)
+
+        options = get_engine_options(settings.model_copy(update={"DB_STATEMENT_TIMEOUT": 5000}))
+        self.assertEqual(options["connect_args"], {"options": "-c statement_timeout=5000"})
+
+    def test_02_warm_up(self):
+        """Тест прогрева: соединения открыты и возвращены в пул"""
+        self.assertEqual(session_manager.warm_up(2), 2)
+        self.assertEqual(self.engine.pool.checkedin(), 2)
+        self.assertEqual(self.engine.pool.checkedout(), 0)
+
+    def test_03_warm_up_limited_by_pool_size(self):
+        """Тест прогрева: не больше размера пула"""
+        self.assertEqual(session_manager.warm_up(10), 3)
+        self.assertEqual(self.engine.pool.checkedin(), 3)
+        self.assertEqual(session_manager.warm_up(0), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
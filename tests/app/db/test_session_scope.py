@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from machine_tools.app.db.session_manager import session_manager
+
+
+class TestSessionScope(unittest.TestCase):
+    """Тесты областей видимости сессии SessionManager (без подключения к БД)"""
+
+    def setUp(self):
+        """Сохраняем режим, чтобы восстановить его после теста"""
+        self.scope = session_manager.get_scope()
+
+    def tearDown(self):
+        """Восстанавливаем режим и закрываем сессии"""
+        session_manager.set_scope(self.scope)
+
+    def _sessions_from_threads(self, count: int = 4) -> list:
+        """Сессии по умолчанию, полученные из разных потоков"""
+        barrier = threading.Barrier(count)
+
+        def worker(_):
+            barrier.wait()
+            session = session_manager.get_session()
+            # Повторный вызов в том же потоке возвращает ту же сессию
+            assert session is session_manager.get_session()
+            return session
+
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            return list(executor.map(worker, range(count)))
+
+    def test_01_invalid_scope(self):
+        """Тест недопустимого режима"""
+        with self.assertRaises(ValueError):
+            session_manager.set_scope("process")
+        self.assertEqual(session_manager.get_scope(), self.scope)
+
+    def test_02_global_scope(self):
+        """Тест режима global: одна сессия на все потоки"""
+        session_manager.set_scope("global")
+        sessions = self._sessions_from_threads()
+        self.assertEqual(len({id(session) for session in sessions}), 1)
+        self.assertIs(sessions[0], session_manager._default_session)
+
+    def test_03_thread_scope(self):
+        """Тест режима thread: своя сессия в каждом потоке"""
+        session_manager.set_scope("thread")
+        main_session = session_manager.get_session()
+        sessions = self._sessions_from_threads()
+        self.assertEqual(len({id(session) for session in sessions}), len(sessions))
+        self.assertNotIn(main_session, sessions)
+        self.assertIs(session_manager.get_session(), main_session)
+        self.assertIsNone(session_manager._default_session)
+
+        # close_session закрывает только сессию текущего потока
+        session_manager.close_session()
+        self.assertIsNot(session_manager.get_session(), main_session)
+
+    def test_04_task_scope(self):
+        """Тест режима task: своя сессия в каждой задаче asyncio"""
+        session_manager.set_scope("task")
+
+        async def worker():
+            session = session_manager.get_session()
+            await asyncio.sleep(0)
+            self.assertIs(session_manager.get_session(), session)
+            session_manager.close_session()
+            return session
+
+        async def main():
+            return await asyncio.gather(*(worker() for _ in range(3)))
+
+        sessions = asyncio.run(main())
+        self.assertEqual(len({id(session) for session in sessions}), 3)
+        # Вне задачи сессия привязана к потоку
+        self.assertIs(session_manager.get_session(), session_manager.get_session())
+
+    def test_05_finished_tasks(self):
+        """Тест режима task: сессии завершенных задач без close_session закрываются и удаляются из реестра"""
+        session_manager.set_scope("task")
+
+        async def worker():
+            return session_manager.get_session()
+
+        async def main():
+            return await asyncio.gather(*(worker() for _ in range(200)))
+
+        sessions = asyncio.run(main())
+        self.assertEqual(len({id(session) for session in sessions}), 200)
+        self.assertEqual(session_manager._registry.registry.registry, {})
+
+    def test_06_named_sessions(self):
+        """Тест именованных сессий: общие для всех потоков и режимов"""
+        session_manager.set_scope("thread")
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            sessions = list(executor.map(lambda _: session_manager.get_session("shared"), range(8)))
+        self.assertEqual(len({id(session) for session in sessions}), 1)
+        session_manager.close_session("shared")
+        self.assertNotIn("shared", session_manager._sessions)
+
+
+if __name__ == "__main__":
+    unittest.main()
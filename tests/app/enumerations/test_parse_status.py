@@ -0,0 +1,26 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import unittest
+
+from machine_tools.app.enumerations.parse_status import ParseStatus
+
+
+class TestParseStatus(unittest.TestCase):
+    """Тесты для перечисления ParseStatus"""
+
+    def test_01_values(self):
+        """Тест проверки значений перечисления"""
+        self.assertEqual(
+            ParseStatus.get_values(), ["Пусто", "Число", "Диапазон", "Список", "Габариты", "Текст"]
+        )
+
+    def test_02_from_str(self):
+        """Тест преобразования строкового значения"""
+        self.assertEqual(ParseStatus.from_str(" Диапазон "), ParseStatus.RANGE)
+        with self.assertRaises(ValueError):
+            ParseStatus.from_str("диапазон")
+
+
+if __name__ == "__main__":
+    unittest.main()
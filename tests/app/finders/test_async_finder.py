@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from machine_tools.app.db.async_session_manager import async_session_manager
+from machine_tools.app.db.query_cache import QueryCache
+from machine_tools.app.db.session import MachineToolsSession
+from machine_tools.app.finders.async_finder import AsyncMachineFinder
+from machine_tools.app.finders.finder import MachineFinder
+from machine_tools.app.formatters import (
+    DictMachineInfoFormatter,
+    IndexedNameFormatter,
+    ListMachineInfoFormatter,
+    ListNameFormatter,
+)
+from machine_tools.app.models import Base, Machine, TechnicalRequirement
+
+
+def _machine(name: str, group: int, type: int, power: float) -> Machine:
+    """Станок с заполненными обязательными для MachineInfo полями"""
+    return Machine(
+        name=name,
+        group=group,
+        type=type,
+        power=power,
+        efficiency=0.8,
+        accuracy="Н",
+        automation="Ручной",
+        software_control="Нет",
+        specialization="Универсальный",
+        weight_class="Средний",
+    )
+
+
+class TestAsyncMachineFinder(unittest.IsolatedAsyncioTestCase):
+    """Тесты для AsyncMachineFinder"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Подготовка тестовой БД SQLite в файле, общей для синхронного и асинхронного движков"""
+        cls.tmp = tempfile.TemporaryDirectory()
+        path = Path(cls.tmp.name) / "machines.db"
+        cls.engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(cls.engine)
+        cls.Session = sessionmaker(bind=cls.engine, class_=MachineToolsSession)
+        with cls.Session() as session:
+            session.add_all(
+                [
+                    _machine("16К20", 1, 6, 10.0),
+                    _machine("16К20Ф3", 1, 6, 11.0),
+                    _machine("2Н135", 2, 1, 4.0),
+                    _machine("6Р13", 6, 1, 7.5),
+                ]
+            )
+            session.add_all(
+                [
+                    TechnicalRequirement(machine_id=1, requirement="Наибольший диаметр, мм", value="400"),
+                    TechnicalRequirement(machine_id=1, requirement="Мощность, кВт", value="10"),
+                    TechnicalRequirement(machine_id=3, requirement="Конус шпинделя", value="Морзе 4"),
+                ]
+            )
+            session.commit()
+        cls.async_url = f"sqlite+aiosqlite:///{path}"
+
+    @classmethod
+    def tearDownClass(cls):
+        """Удаление тестовой БД"""
+        cls.engine.dispose()
+        cls.tmp.cleanup()
+
+    async def asyncSetUp(self):
+        """Асинхронный движок создается в цикле событий теста"""
+        self.original_engine = async_session_manager._engine
+        self.async_engine = create_async_engine(self.async_url)
+        async_session_manager.engine = self.async_engine
+
+    async def asyncTearDown(self):
+        """Восстановление движка"""
+        await self.async_engine.dispose()
+        async_session_manager.engine = self.original_engine
+
+    def _sync_result(self, formatter, find):
+        """Результат синхронного поисковика для сравнения"""
+        with self.Session() as session:
+            return find(MachineFinder(session=session, formatter=formatter))
+
+    async def test_01_find_matches_sync(self):
+        """Тест совпадения результатов с MachineFinder"""
+        finder = AsyncMachineFinder(formatter=ListMachineInfoFormatter())
+        self.assertIsNone(finder.session)
+
+        expected = self._sync_result(ListMachineInfoFormatter(), lambda f: f.find_by_group(1))
+        self.assertEqual(await finder.find_by_group(1), expected)
+        self.assertEqual(expected[0].technical_requirements["Мощность, кВт"], "10")
+
+        finder.set_formatter(ListNameFormatter())
+        machines = await finder.find_by_power(min_power=5.0, order_by_power=True, descending=True)
+        self.assertEqual(machines, ["16К20Ф3", "16К20", "6Р13"])
+        self.assertEqual(await finder.find_by_name("2Н135", case_sensitive=True), ["2Н135"])
+        self.assertEqual(await finder.find_all(limit=2), ["16К20", "16К20Ф3"])
+
+    async def test_02_concurrent_lookups(self):
+        """Тест одновременных запросов одного поисковика: построитель не смешивает фильтры"""
+        finder = AsyncMachineFinder(formatter=DictMachineInfoFormatter())
+        results = await asyncio.gather(*(finder.find_by_names([name]) for name in ["16К20", "2Н135", "6Р13"] * 20))
+        self.assertEqual([list(result) for result in results[:3]], [["16К20"], ["2Н135"], ["6Р13"]])
+        self.assertEqual(len(results[0]["16К20"].technical_requirements), 2)
+
+    async def test_03_explicit_session_and_cache(self):
+        """Тест переданной сессии и кэша"""
+        cache = QueryCache()
+        async with async_sessionmaker(self.async_engine, sync_session_class=MachineToolsSession)() as session:
+            async with AsyncMachineFinder(session=session, cache=cache) as finder:
+                self.assertEqual(await finder.find_by_type(1), ["2Н135", "6Р13"])
+                result = await finder.find_by_type(1)
+                result.append("изменено")
+                self.assertEqual(await finder.find_by_type(1), ["2Н135", "6Р13"])
+        self.assertEqual(cache.stats()["hits"], 2)
+
+        with self.assertRaises(TypeError):
+            with AsyncMachineFinder():
+                pass
+
+    async def test_04_stream(self):
+        """Тест потоковой выдачи: сквозная нумерация"""
+        finder = AsyncMachineFinder(formatter=IndexedNameFormatter())
+        batches = [batch async for batch in finder.stream(batch_size=3)]
+        self.assertEqual(batches, [{1: "16К20", 2: "16К20Ф3", 3: "2Н135"}, {4: "6Р13"}])
+
+        finder.set_formatter(ListMachineInfoFormatter())
+        finder.set_limit(None)
+        machines = [machine async for machine in finder.iter_by_group([1, 2], batch_size=2)]
+        self.assertEqual([machine.name for machine in machines], ["16К20", "16К20Ф3", "2Н135"])
+        self.assertEqual(machines[2].technical_requirements, {"Конус шпинделя": "Морзе 4"})
+
+        with self.assertRaises(ValueError):
+            finder.stream(batch_size=0)
+
+        finder._builder.load_technical_requirements("joined")
+        with self.assertRaises(ValueError):
+            finder.stream()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -44,8 +44,8 @@ class TestMachineFinder(unittest.TestCase):
                 created_at=datetime(2024, 1, 1),
                 updated_at=datetime(2024, 1, 1),
                 technical_requirements=[
-                    TechnicalRequirement(id=1, machine_name="16К20", requirement="max_diameter", value=400),
-                    TechnicalRequirement(id=2, machine_name="16К20", requirement="max_length", value=1000),
+                    TechnicalRequirement(id=1, requirement="max_diameter", value=400),
+                    TechnicalRequirement(id=2, requirement="max_length", value=1000),
                 ],
             ),
             Machine(
@@ -70,8 +70,8 @@ class TestMachineFinder(unittest.TestCase):
                 created_at=datetime(2024, 1, 1),
                 updated_at=datetime(2024, 1, 1),
                 technical_requirements=[
-                    TechnicalRequirement(id=3, machine_name="6Р13Ф3", requirement="table_size", value="400x1600"),
-                    TechnicalRequirement(id=4, machine_name="6Р13Ф3", requirement="max_travel", value=800),
+                    TechnicalRequirement(id=3, requirement="table_size", value="400x1600"),
+                    TechnicalRequirement(id=4, requirement="max_travel", value=800),
                 ],
             ),
             Machine(
@@ -96,8 +96,8 @@ class TestMachineFinder(unittest.TestCase):
                 created_at=datetime(2024, 1, 1),
                 updated_at=datetime(2024, 1, 1),
                 technical_requirements=[
-                    TechnicalRequirement(id=5, machine_name="2А135", requirement="max_drill_diameter", value=35),
-                    TechnicalRequirement(id=6, machine_name="2А135", requirement="max_depth", value=300),
+                    TechnicalRequirement(id=5, requirement="max_drill_diameter", value=35),
+                    TechnicalRequirement(id=6, requirement="max_depth", value=300),
                 ],
             ),
         ]
@@ -112,8 +112,8 @@ class TestMachineFinder(unittest.TestCase):
         self.mock_session.limit.return_value = self.mock_session
         self.mock_session.all.return_value = self.machines
 
-        # Создаем мок для форматтера
-        self.mock_formatter = Mock()
+        # Создаем мок для форматтера (полные ORM-объекты без требований)
+        self.mock_formatter = Mock(columns=None)
 
         # Создаем мок для builder
         self.mock_builder = Mock()
@@ -276,6 +276,23 @@ class TestMachineFinder(unittest.TestCase):
         self.mock_builder.limit.assert_called_once_with(5)
         self.mock_builder.execute.assert_called()
 
+    def test_10_full_objects(self):
+        """Тест форматтеров с полной информацией: выбираются ORM-объекты без загрузки требований"""
+        self.finder.find_all()
+        self.mock_builder.select_columns.assert_not_called()
+        self.mock_builder.load_technical_requirements.assert_not_called()
+        self.mock_formatter.format.assert_called_with(self.machines)
+
+    def test_11_columns_projection(self):
+        """Тест проекции колонок для форматтеров имен"""
+        self.finder.set_formatter(ListNameFormatter())
+        self.mock_builder.execute.return_value = [Mock(id=1, name="16К20")]
+        self.mock_builder.execute.return_value[0].name = "16К20"
+        result = self.finder.find_all()
+        self.mock_builder.select_columns.assert_called_once_with("id", "name")
+        self.mock_builder.load_technical_requirements.assert_not_called()
+        self.assertEqual(result, ["16К20"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -5,6 +5,8 @@ import unittest
 from datetime import datetime
 from typing import List
 
+from pydantic import ValidationError
+
 from machine_tools.app.enumerations import Accuracy, Automation, SoftwareControl, Specialization, WeightClass
 from machine_tools.app.formatters import (
     DictMachineInfoFormatter,
@@ -48,9 +50,9 @@ class TestMachineFormatters(unittest.TestCase):
                 created_at=datetime(2024, 1, 1),
                 updated_at=datetime(2024, 1, 1),
                 technical_requirements=[
-                    TechnicalRequirement(id=1, machine_name="16К20", requirement="max_diameter", value=400),
-                    TechnicalRequirement(id=2, machine_name="16К20", requirement="max_length", value=1000),
-                    TechnicalRequirement(id=3, machine_name="16К20", requirement="spindle_speed", value=2000),
+                    TechnicalRequirement(id=1, requirement="max_diameter", value=400),
+                    TechnicalRequirement(id=2, requirement="max_length", value=1000),
+                    TechnicalRequirement(id=3, requirement="spindle_speed", value=2000),
                 ],
             ),
             Machine(
@@ -76,9 +78,9 @@ class TestMachineFormatters(unittest.TestCase):
                 created_at=datetime(2024, 1, 1),
                 updated_at=datetime(2024, 1, 1),
                 technical_requirements=[
-                    TechnicalRequirement(id=4, machine_name="6Р13Ф3", requirement="table_size", value="400x1600"),
-                    TechnicalRequirement(id=5, machine_name="6Р13Ф3", requirement="max_travel", value=800),
-                    TechnicalRequirement(id=6, machine_name="6Р13Ф3", requirement="spindle_speed", value=1500),
+                    TechnicalRequirement(id=4, requirement="table_size", value="400x1600"),
+                    TechnicalRequirement(id=5, requirement="max_travel", value=800),
+                    TechnicalRequirement(id=6, requirement="spindle_speed", value=1500),
                 ],
             ),
         ]
@@ -160,6 +162,23 @@ class TestMachineFormatters(unittest.TestCase):
             elif isinstance(result, dict):
                 self.assertEqual(len(result), 0)
 
+    def test_08_trusted_mode(self):
+        """Тест доверенного режима: те же представления, что и при строгой проверке, ошибки данных не пропускаются"""
+        for machine in self.machines[1:]:
+            machine.spec = {"table_size": "400x1600"}
+        for formatter_class in (ListMachineInfoFormatter, DictMachineInfoFormatter, IndexedMachineInfoFormatter):
+            strict = formatter_class().format(self.machines)
+            self.assertEqual(formatter_class(trusted=True).format(self.machines), strict)
+        self.assertEqual(strict[2].technical_requirements, {"table_size": "400x1600"})
+        self.assertIsNone(strict[1].technical_requirements)
+        # Требования копируются: изменение представления не затрагивает состояние ORM-объекта
+        trusted = ListMachineInfoFormatter(trusted=True).format(self.machines)
+        self.assertIsNot(trusted[1].technical_requirements, self.machines[1].spec)
+
+        self.machines[0].efficiency = 1.5
+        with self.assertRaises(ValidationError):
+            ListMachineInfoFormatter(trusted=True).format(self.machines)
+
 
 if __name__ == "__main__":
     unittest.main()
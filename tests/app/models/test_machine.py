@@ -4,8 +4,10 @@
 import unittest
 from datetime import datetime
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateIndex
 
 from machine_tools.app.models.machine import Base, Machine
 
@@ -149,6 +151,18 @@ class TestMachine(unittest.TestCase):
         self.assertEqual(machine.created_at, created_at)
         self.assertGreater(machine.updated_at, updated_at)
 
+    def test_07_indexes(self):
+        """Тест индексов колонок фильтров: триграммный индекс создается только в PostgreSQL"""
+        indexes = {index["name"]: index["column_names"] for index in inspect(self.engine).get_indexes("machine_tools")}
+        self.assertEqual(indexes["ix_machine_tools_group_type"], ["group", "type"])
+        self.assertIn("ix_machine_tools_power", indexes)
+        self.assertIn("ix_machine_tools_software_control", indexes)
+        self.assertNotIn("ix_machine_tools_name_trgm", indexes)
+
+        trigram = next(index for index in Machine.__table__.indexes if index.name == "ix_machine_tools_name_trgm")
+        ddl = str(CreateIndex(trigram).compile(dialect=postgresql.dialect()))
+        self.assertEqual(ddl, "CREATE INDEX ix_machine_tools_name_trgm ON machine_tools USING gin (name gin_trgm_ops)")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import unittest
+
+from machine_tools.app.parsers import requirement_key
+
+
+class TestRequirementNames(unittest.TestCase):
+    """Тесты для нормализации наименований параметров"""
+
+    def test_01_spelling(self):
+        """Тест написаний одного параметра: регистр, пробелы, ё, точка в конце"""
+        key = requirement_key("Масса станка, кг")
+        self.assertEqual(key, "масса станка, кг")
+        self.assertEqual(requirement_key("Масса  станка , кг."), key)
+        self.assertEqual(requirement_key(" масса станка,кг "), key)
+        self.assertEqual(requirement_key("Резцовые салазки ( Верхний суппорт )"), "резцовые салазки (верхний суппорт)")
+        self.assertEqual(requirement_key("Ёмкость бака, л"), "емкость бака, л")
+
+    def test_02_units(self):
+        """Тест написаний единиц измерения: заменяются только в окончании после последней запятой"""
+        key = requirement_key("Наибольший крутящий момент, Н*м")
+        for unit in ("Нм", "Н.м", "н·м", "Н * м"):
+            self.assertEqual(requirement_key(f"Наибольший крутящий момент, {unit}"), key)
+        self.assertEqual(requirement_key("Частота, об./мин"), "частота, об/мин")
+        self.assertEqual(requirement_key("Скорость, м/сек"), "скорость, м/с")
+        self.assertEqual(requirement_key("Угол поворота, °"), "угол поворота, град")
+        # Без запятой единицы нет, а в середине наименования замены не выполняются
+        self.assertEqual(requirement_key("Нм"), "нм")
+        self.assertEqual(requirement_key("Время, сек, не более"), "время, сек, не более")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import math
+import unittest
+
+import pandas as pd
+
+from machine_tools.app.enumerations import ParseStatus
+from machine_tools.app.parsers import PARSED_COLUMNS, parse_requirements, parse_units, parse_values
+
+
+class TestRequirementValues(unittest.TestCase):
+    """Тесты для разбора значений технических требований"""
+
+    def _parse(self, value):
+        """Разбор одного значения: (статус, число, нижняя граница, верхняя граница, список)"""
+        row = parse_values(pd.Series([value])).iloc[0]
+        columns = ("value_number", "value_min", "value_max", "value_list")
+        return (row["parse_status"], *(None if pd.isna(row[column]) else row[column] for column in columns))
+
+    def test_01_number(self):
+        """Тест числа: десятичная запятая, пояснение в скобках, потерянная запятая в "055\""""
+        self.assertEqual(self._parse("400"), ("Число", 400.0, 400.0, 400.0, None))
+        self.assertEqual(self._parse("1,5 (15)"), ("Число", 1.5, 1.5, 1.5, None))
+        self.assertEqual(self._parse("45°"), ("Число", 45.0, 45.0, 45.0, None))
+        self.assertEqual(self._parse("055"), ("Число", 0.55, 0.55, 0.55, None))
+
+    def test_02_range(self):
+        """Тест диапазона: "..", многоточие, дефис, ±"""
+        self.assertEqual(self._parse("0..400"), ("Диапазон", None, 0.0, 400.0, None))
+        self.assertEqual(self._parse("410…28"), ("Диапазон", None, 28.0, 410.0, None))
+        self.assertEqual(self._parse("40-60"), ("Диапазон", None, 40.0, 60.0, None))
+        self.assertEqual(self._parse("±45°"), ("Диапазон", None, -45.0, 45.0, None))
+
+    def test_03_list_and_dimensions(self):
+        """Тест списка значений и габаритов: у габаритов нет границ"""
+        self.assertEqual(
+            self._parse("450, 800, 1400, 2500, 4500"), ("Список", None, 450.0, 4500.0, "450;800;1400;2500;4500")
+        )
+        self.assertEqual(self._parse("1,5/ 2,5"), ("Список", None, 1.5, 2.5, "1.5;2.5"))
+        self.assertEqual(self._parse("795 х 370 х 950"), ("Габариты", None, None, None, "795;370;950"))
+        self.assertEqual(self._parse("3,5x4"), ("Габариты", None, None, None, "3.5;4"))
+
+    def test_04_empty_and_text(self):
+        """Тест пустых и нечисловых значений"""
+        self.assertEqual(self._parse(None)[0], ParseStatus.EMPTY.value)
+        self.assertEqual(self._parse("-")[0], ParseStatus.EMPTY.value)
+        self.assertEqual(self._parse("Морзе 4"), ("Текст", None, None, None, None))
+
+    def test_05_units(self):
+        """Тест единиц измерения из окончания наименования"""
+        names = pd.Series(
+            [
+                "Наибольший диаметр, мм",
+                "Мощность, кВт (об/мин)",
+                "Количество шпинделей",
+                "Ход (вертикальный, горизонтальный)",
+            ]
+        )
+        units = parse_units(names)
+        self.assertEqual(units[:2].tolist(), ["мм", "кВт (об/мин)"])
+        self.assertTrue(units[2:].isna().all())
+
+    def test_06_parse_requirements(self):
+        """Тест разбора порции: колонки в порядке PARSED_COLUMNS, индекс исходных строк"""
+        names = pd.Series(["Диаметр, мм", "Конус"], index=[10, 20])
+        values = pd.Series(["400", "Морзе 4"], index=[10, 20])
+        result = parse_requirements(names, values)
+        self.assertEqual(tuple(result.columns), PARSED_COLUMNS)
+        self.assertEqual(result.index.tolist(), [10, 20])
+        self.assertEqual(result.loc[10, "unit"], "мм")
+        self.assertTrue(math.isnan(result.loc[20, "value_min"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
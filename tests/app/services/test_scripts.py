@@ -4,12 +4,20 @@
 import unittest
 from unittest.mock import MagicMock, patch
 
+from dependency_injector import providers
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from machine_tools.app.containers import FinderContainer
+from machine_tools.app.db.session import MachineToolsSession
 from machine_tools.app.enumerations import Accuracy, Automation, SoftwareControl, Specialization, WeightClass
+from machine_tools.app.models import Base, Machine
 from machine_tools.app.schemas.machine import Dimensions, Location, MachineInfo, MachineUpdate
 from machine_tools.app.services.scripts import (
     _dict_to_machine_update,
     find_names,
     get_machine_info_by_name,
+    get_machines_info_by_names,
     update,
 )
 
@@ -180,6 +188,68 @@ class TestScripts(unittest.TestCase):
         # Проверяем сообщение об ошибке
         self.assertIn("info должен быть экземпляром MachineInfo или MachineUpdate", str(context.exception))
 
+    @patch('machine_tools.app.services.scripts.FinderContainer')
+    def test_10_get_machines_info_by_names(self, mock_container):
+        """Тест пакетного получения информации о станках"""
+        # Настраиваем мок
+        machine_info = MachineInfo(**self.test_machine_info)
+        mock_finder = MagicMock()
+        mock_finder.find_by_names.return_value = {"16К20": machine_info}
+        mock_container.return_value.finder_with_dict_info.return_value = mock_finder
+
+        # Вызываем функцию (дубликаты схлопываются, порядок сохраняется)
+        result = get_machines_info_by_names(["НесуществующийСтанок", "16К20", "НесуществующийСтанок"])
+
+        # Проверяем результат
+        self.assertEqual(result, {"НесуществующийСтанок": None, "16К20": machine_info})
+        self.assertEqual(list(result), ["НесуществующийСтанок", "16К20"])
+        mock_finder.find_by_names.assert_called_once_with(["НесуществующийСтанок", "16К20"])
+        mock_container.return_value.finder_with_dict_info.assert_called_once_with()
+
+    @patch('machine_tools.app.services.scripts.FinderContainer')
+    def test_11_get_machines_info_by_names_empty(self, mock_container):
+        """Тест пакетного получения информации для пустого списка"""
+        self.assertEqual(get_machines_info_by_names([]), {})
+        mock_container.assert_not_called()
+
+    @patch('machine_tools.app.services.scripts.FinderContainer')
+    def test_12_get_machines_info_by_names_case_insensitive(self, mock_container):
+        """Тест пакетного получения информации из SQLite: регистр не учитывается, ключи в написании запроса"""
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        with sessionmaker(bind=engine, class_=MachineToolsSession)() as session:
+            session.add_all(
+                [
+                    Machine(
+                        name=name,
+                        group=1,
+                        type=1,
+                        power=10.0,
+                        efficiency=0.8,
+                        accuracy="Н",
+                        automation="Ручной",
+                        software_control="Нет",
+                        specialization="Универсальный",
+                        weight_class="Средний",
+                    )
+                    for name in ["DMU 50", "16К20"]
+                ]
+            )
+            session.commit()
+            container = FinderContainer()
+            container.session.override(providers.Object(session))
+            mock_container.return_value = container
+
+            # lower() в SQLite работает только с ASCII, поэтому регистр проверяется на латинице
+            result = get_machines_info_by_names(["dmu 50", "16К20", "16К20Ф3"])
+
+        self.assertEqual(list(result), ["dmu 50", "16К20", "16К20Ф3"])
+        self.assertEqual(result["dmu 50"].name, "DMU 50")
+        self.assertEqual(result["16К20"].name, "16К20")
+        self.assertIsNone(result["16К20Ф3"])
+        self.assertEqual(get_machine_info_by_name("dmu 50"), result["dmu 50"])
+        engine.dispose()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import tempfile
+import unittest
+from pathlib import Path
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from machine_tools.app.db.query_cache import QueryCache
+from machine_tools.app.db.session import MachineToolsSession
+from machine_tools.app.models import Base, Machine, TechnicalRequirement
+from machine_tools.app.updaters.async_updater import AsyncMachineUpdater
+
+
+class TestAsyncMachineUpdater(unittest.IsolatedAsyncioTestCase):
+    """Тесты для AsyncMachineUpdater"""
+
+    def setUp(self):
+        """Подготовка тестовой БД SQLite в файле"""
+        self.tmp = tempfile.TemporaryDirectory()
+        path = Path(self.tmp.name) / "machines.db"
+        self.engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine, class_=MachineToolsSession)
+        with self.Session() as session:
+            session.add_all(
+                [
+                    Machine(name="16К20", group=1, type=6, power=10.0, accuracy="Н"),
+                    Machine(name="2Н135", group=2, type=1, power=4.0, accuracy="Н"),
+                ]
+            )
+            session.add(TechnicalRequirement(machine_id=1, requirement="Мощность, кВт", value="10"))
+            session.commit()
+        self.async_url = f"sqlite+aiosqlite:///{path}"
+
+    def tearDown(self):
+        """Удаление тестовой БД"""
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    async def asyncSetUp(self):
+        """Асинхронная сессия"""
+        self.async_engine = create_async_engine(self.async_url)
+        self.session = async_sessionmaker(self.async_engine, sync_session_class=MachineToolsSession)()
+
+    async def asyncTearDown(self):
+        """Закрытие сессии и движка"""
+        await self.session.close()
+        await self.async_engine.dispose()
+
+    def _machine(self, name: str) -> Machine:
+        """Станок из БД через синхронную сессию"""
+        with self.Session() as session:
+            return session.execute(select(Machine).where(Machine.name == name)).scalar_one()
+
+    async def test_01_update_by_power(self):
+        """Тест обновления по диапазону мощности и сброса кэша"""
+        cache = QueryCache()
+        cache.set("key", "value")
+        async with AsyncMachineUpdater(session=self.session) as updater:
+            count = await updater.update_by_power({"name": "16К20", "efficiency": 0.9}, min_power=5.0)
+        self.assertEqual(count, 1)
+        self.assertEqual(self._machine("16К20").efficiency, 0.9)
+        self.assertIsNone(self._machine("2Н135").efficiency)
+        self.assertEqual(len(cache), 0)
+
+    async def test_02_update_by_name_with_requirements(self):
+        """Тест обновления по имени с заменой технических требований"""
+        updater = AsyncMachineUpdater(session=self.session)
+        count = await updater.update_by_name(
+            "16К20", {"name": "16К20", "power": 11.0, "technical_requirements": {"Наибольший диаметр, мм": 400}}
+        )
+        self.assertEqual(count, 1)
+        self.assertEqual(self._machine("16К20").power, 11.0)
+        with self.Session() as session:
+            requirements = session.execute(select(TechnicalRequirement.requirement, TechnicalRequirement.value)).all()
+        self.assertEqual([tuple(row) for row in requirements], [("Наибольший диаметр, мм", "400")])
+        self.assertEqual(self._machine("16К20").spec, {"Наибольший диаметр, мм": "400"})
+
+    async def test_03_update_not_found(self):
+        """Тест обновления несуществующего станка"""
+        updater = AsyncMachineUpdater(session=self.session)
+        self.assertEqual(await updater.update_by_accuracy({"name": "16К20"}, accuracy="В"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+import subprocess
+import sys
+import unittest
+
+import machine_tools
+
+
+class TestPackageImport(unittest.TestCase):
+    """Тесты ленивого импорта пакета"""
+
+    def _run(self, code: str) -> str:
+        """Выполняет код в новом интерпретаторе и возвращает вывод"""
+        return subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout.strip()
+
+    def test_01_import_is_lightweight(self):
+        """Тест: импорт пакета не загружает SQLAlchemy, pydantic и настройки"""
+        output = self._run(
+            "import sys, machine_tools; "
+            "print(sorted(m for m in ('sqlalchemy', 'pydantic', 'dependency_injector', 'machine_tools.app.config') "
+            "if m in sys.modules))"
+        )
+        self.assertEqual(output, "[]")
+
+    def test_02_engine_is_created_on_first_use(self):
+        """Тест: движок БД не создается при импорте поисковика"""
+        output = self._run(
+            "from machine_tools import Finder; "
+            "from machine_tools.app.db.session_manager import session_manager; "
+            "print(session_manager._engine is None)"
+        )
+        self.assertEqual(output, "True")
+
+    def test_03_lazy_attributes(self):
+        """Тест доступа к публичным именам"""
+        from machine_tools.app.finders.finder import MachineFinder
+        from machine_tools.app.services.scripts import get_machines_info_by_names
+
+        self.assertIs(machine_tools.Finder, MachineFinder)
+        self.assertIs(machine_tools.info_by_names, get_machines_info_by_names)
+        self.assertIn("Finder", dir(machine_tools))
+        for name in machine_tools.__all__:
+            self.assertIsNotNone(getattr(machine_tools, name))
+        with self.assertRaises(AttributeError):
+            machine_tools.Unknown
+
+
+if __name__ == "__main__":
+    unittest.main()